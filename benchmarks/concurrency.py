@@ -0,0 +1,51 @@
+"""
+Compare AsyncRestApiClient.gather with fixed concurrency limits and with an adaptive concurrency limiter
+
+Runs against a local server that handles a fixed number of requests at once and sheds the rest with a 503, and
+reports throughput, how many calls succeeded, the server's peak load and the limit the adaptive limiter settled on.
+
+Usage: python -m benchmarks.concurrency [--requests N] [--capacity N] [--latency-ms MS]
+"""
+import argparse
+import asyncio
+import time
+from typing import Union
+
+from benchmarks.server import StubServer
+from easyclient import AdaptiveConcurrencyLimiter, ApiAuthNone, AsyncRestApiClient, ConnectionPoolConfig
+
+
+async def _run(label: str, server: StubServer, requests: int, concurrency: Union[int, None],
+               limiter: Union[AdaptiveConcurrencyLimiter, None]) -> None:
+    server.peak_in_flight = 0
+    pool_config = ConnectionPoolConfig(max_connections=200, max_connections_per_host=200, max_keepalive_connections=200)
+    async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone(), pool_config=pool_config,
+                                  concurrency_limiter=limiter) as client:
+        start = time.perf_counter()
+        results = await client.gather("get", [f"/item/{index}" for index in range(requests)],
+                                      concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+    succeeded = sum(1 for result in results if result.error is None and result.value.status_code == 200)
+    limit = limiter.limits()[server.base_url] if limiter else concurrency
+    print(f"{label:<24} {requests / elapsed:>8.0f} req/s {succeeded / elapsed:>8.0f} ok/s {succeeded:>8} "
+          f"{server.peak_in_flight:>6} {limit:>6}")
+
+
+async def main(requests: int, capacity: int, latency: float) -> None:
+    with StubServer(payload={"id": 1, "name": "item"}, latency=latency, capacity=capacity) as server:
+        print(f"{requests} GET requests, server handles {capacity} at a time, {latency * 1000:.0f}ms latency")
+        print(f"{'limit':<24} {'throughput':>14} {'goodput':>13} {'ok':>8} {'peak':>6} {'final':>6}")
+        for concurrency in (max(capacity // 4, 1), capacity * 5):
+            await _run(f"fixed, {concurrency}", server, requests, concurrency=concurrency, limiter=None)
+        for algorithm in ("aimd", "gradient"):
+            limiter = AdaptiveConcurrencyLimiter(algorithm=algorithm, max_limit=capacity * 5)
+            await _run(f"adaptive, {algorithm}", server, requests, concurrency=None, limiter=limiter)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Number of GET requests per scenario")
+    parser.add_argument("--capacity", type=int, default=20, help="Requests the server handles at once")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Server latency per request")
+    args = parser.parse_args()
+    asyncio.run(main(requests=args.requests, capacity=args.capacity, latency=args.latency_ms / 1000))
@@ -0,0 +1,90 @@
+"""
+Compare AsyncRestApiClient fanning out concurrent get_object calls to one host over HTTP/1.1 and HTTP/2
+
+Runs against a local HTTPS server that answers after a fixed latency, and reports throughput, latency percentiles
+and how many connections the server accepted. Requires the h2 package and the openssl command.
+
+Usage: python -m benchmarks.http2 [--requests N] [--concurrency N] [--latency-ms MS] [--max-concurrent-streams N]
+"""
+import argparse
+import asyncio
+import ssl
+import sys
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.server import TlsStubServer
+from easyclient import ApiAuthNone, AsyncRestApiClient, ConnectionPoolConfig, Transport
+
+
+class Item:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class _TrustingTransport(Transport):
+    # trusts the stub server's self-signed certificate
+    def __init__(self, context: ssl.SSLContext):
+        super().__init__()
+        self._context: ssl.SSLContext = context
+
+    def build_async_transport(self, pool_config: ConnectionPoolConfig, http2: bool = False) -> httpx.AsyncBaseTransport:
+        return httpx.AsyncHTTPTransport(limits=pool_config.build_limits(), http2=http2, verify=self._context)
+
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+
+async def _run(label: str, server: TlsStubServer, pool_config: ConnectionPoolConfig, http2: bool, requests: int,
+               concurrency: int) -> None:
+    server.reset()
+    latencies: List[float] = []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def call() -> None:
+        async with gate:
+            start = time.perf_counter()
+            await client.get_object(endpoint="/item", model=Item)
+            latencies.append(time.perf_counter() - start)
+
+    async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone(), pool_config=pool_config,
+                                  transport=_TrustingTransport(server.client_context()), http2=http2) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    ordered = sorted(latencies)
+    print(f"{label:<32} {requests / elapsed:>8.0f} req/s {_percentile(ordered, 50) * 1000:>8.1f}ms "
+          f"{_percentile(ordered, 99) * 1000:>8.1f}ms {server.connections:>6}")
+
+
+async def main(requests: int, concurrency: int, latency: float, max_concurrent_streams: int) -> None:
+    with TlsStubServer(payload={"id": 1, "name": "item"}, latency=latency) as server:
+        print(f"{requests} get_object calls, {concurrency} at a time, {latency * 1000:.0f}ms server latency")
+        print(f"{'transport':<32} {'throughput':>14} {'p50':>10} {'p99':>10} {'sockets':>6}")
+        await _run("HTTP/1.1, 10 connections/host", server, ConnectionPoolConfig(max_connections_per_host=10),
+                   http2=False, requests=requests, concurrency=concurrency)
+        await _run(f"HTTP/1.1, {concurrency} connections/host", server,
+                   ConnectionPoolConfig(max_connections=concurrency, max_connections_per_host=concurrency,
+                                        max_keepalive_connections=concurrency),
+                   http2=False, requests=requests, concurrency=concurrency)
+        await _run(f"HTTP/2, {max_concurrent_streams} streams", server,
+                   ConnectionPoolConfig(max_concurrent_streams=max_concurrent_streams),
+                   http2=True, requests=requests, concurrency=concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Number of get_object calls per transport")
+    parser.add_argument("--concurrency", type=int, default=200, help="Calls in flight at a time")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Server latency per request")
+    parser.add_argument("--max-concurrent-streams", type=int, default=100, help="HTTP/2 streams per connection")
+    args = parser.parse_args()
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        sys.exit("The HTTP/2 benchmark requires the h2 package (pip install easyclient[http2]).")
+    asyncio.run(main(requests=args.requests, concurrency=args.concurrency, latency=args.latency_ms / 1000,
+                     max_concurrent_streams=args.max_concurrent_streams))
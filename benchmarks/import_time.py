@@ -0,0 +1,62 @@
+"""
+Measure how long importing easyclient takes in a fresh interpreter, and which heavy dependencies it loads
+
+Every scenario lists the modules it must not load, so a regression is caught even on a machine too noisy to time
+Exits with status 1 if a scenario loads a module it should not, or takes longer than --max-ms
+
+Usage: python -m benchmarks.import_time [--rounds N] [--max-ms MS]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+SCENARIOS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("import easyclient", ("objectrest", "requests", "httpx", "pytz", "sqlite3")),
+    ("import easyclient.utils", ("objectrest", "pytz")),
+    ("from easyclient import RestApiClient", ("pytz", "sqlite3")),
+    ("from easyclient import AsyncRestApiClient", ("pytz", "sqlite3")),
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [name for name in {forbidden!r} if name in sys.modules]}}))
+"""
+
+
+def measure(statement: str, forbidden: Tuple[str, ...]) -> dict:
+    output = subprocess.run([sys.executable, "-c", _PROBE.format(statement=statement, forbidden=forbidden)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=7, help="Fresh interpreters per scenario (median is reported)")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if a scenario's median exceeds this")
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'scenario':<44} {'median':>10} {'min':>10}  unexpected modules")
+    for statement, forbidden in SCENARIOS:
+        runs = [measure(statement, forbidden) for _ in range(args.rounds)]
+        times = [run["seconds"] * 1000 for run in runs]
+        loaded = sorted({name for run in runs for name in run["loaded"]})
+        median = statistics.median(times)
+        print(f"{statement:<44} {median:>8.1f}ms {min(times):>8.1f}ms  {', '.join(loaded) or '-'}")
+        if loaded:
+            failures.append(f"{statement} loaded {', '.join(loaded)}")
+        if args.max_ms is not None and median > args.max_ms:
+            failures.append(f"{statement} took {median:.1f}ms (limit {args.max_ms:.1f}ms)")
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
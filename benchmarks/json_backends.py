@@ -0,0 +1,59 @@
+"""
+Compare JSON backends decoding multi-MB payloads, directly and through RestApiClient.get
+
+Usage: python -m benchmarks.json_backends [items] [rounds]
+"""
+import sys
+import time
+
+from benchmarks.server import StubServer
+from easyclient import ApiAuthNone, RestApiClient
+from easyclient.client.base.codec import _CODECS, get_codec
+
+
+def make_payload(items: int) -> dict:
+    return {
+        "results": [
+            {
+                "id": index,
+                "name": f"item-{index}",
+                "tags": ["alpha", "beta", "gamma"],
+                "score": index * 0.5,
+                "active": index % 2 == 0,
+                "owner": {"id": index % 97, "login": f"user{index % 97}"},
+            }
+            for index in range(items)
+        ]
+    }
+
+
+def _best_of(rounds: int, func) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(items: int, rounds: int) -> None:
+    payload = make_payload(items)
+    raw = get_codec("json").dumps(payload)
+    print(f"payload: {len(raw) / 1024 / 1024:.1f} MB, best of {rounds} rounds")
+    print(f"{'backend':<10} {'decode':>10} {'encode':>10} {'client.get':>12}")
+    with StubServer(payload=payload) as server:
+        for name in _CODECS:
+            codec = get_codec(name)
+            if codec.name != name:
+                print(f"{name:<10} {'not installed':>10}")
+                continue
+            decode = _best_of(rounds, lambda: codec.loads(raw))
+            encode = _best_of(rounds, lambda: codec.dumps(payload))
+            with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), json_backend=name) as client:
+                request = _best_of(rounds, lambda: client.get(endpoint="/items"))
+            print(f"{name:<10} {decode * 1000:>8.1f}ms {encode * 1000:>8.1f}ms {request * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main(items=int(sys.argv[1]) if len(sys.argv) > 1 else 50000,
+         rounds=int(sys.argv[2]) if len(sys.argv) > 2 else 5)
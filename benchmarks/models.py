@@ -0,0 +1,63 @@
+"""
+Compare building models from a large JSON list by calling the model per item against the cached model adapters
+
+Usage: python -m benchmarks.models [items] [rounds]
+"""
+import dataclasses
+import sys
+
+from benchmarks.json_backends import _best_of, make_payload
+from easyclient.client.base.parsing import create_object
+
+
+@dataclasses.dataclass
+class Item:
+    id: int
+    name: str
+    tags: list
+    score: float
+    active: bool
+    owner: dict
+
+
+class PlainItem:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def _models() -> list:
+    models = [("dataclass", Item), ("plain class", PlainItem)]
+    try:
+        import pydantic
+    except ImportError:
+        return models
+
+    class PydanticOwner(pydantic.BaseModel):
+        id: int
+        login: str
+
+    class PydanticItem(pydantic.BaseModel):
+        id: int
+        name: str
+        tags: list
+        score: float
+        active: bool
+        owner: PydanticOwner
+
+    return models + [(f"pydantic {pydantic.VERSION}", PydanticItem)]
+
+
+def main(items: int, rounds: int) -> None:
+    data = make_payload(items)["results"]
+    print(f"{items} items, best of {rounds} rounds")
+    print(f"{'model':<18} {'per item':>10} {'adapter':>10} {'trusted':>10}")
+    for label, model in _models():
+        per_item = _best_of(rounds, lambda: [model(**item) for item in data])
+        adapter = _best_of(rounds, lambda: create_object(data, model=model, extract_list=True))
+        trusted = _best_of(rounds, lambda: create_object(data, model=model, extract_list=True, trusted=True))
+        print(f"{label:<18} {per_item * 1000:>8.1f}ms {adapter * 1000:>8.1f}ms {trusted * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main(items=int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         rounds=int(sys.argv[2]) if len(sys.argv) > 2 else 5)
@@ -0,0 +1,54 @@
+"""
+Compare pooled keep-alive clients against a new connection per request
+
+Usage: python -m benchmarks.pooling [requests]
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+import objectrest
+
+from benchmarks.server import StubServer
+from easyclient import ApiAuthNone, AsyncRestApiClient, RestApiClient
+
+
+def _report(label: str, count: int, elapsed: float, connections: int) -> None:
+    print(f"{label:<28} {count / elapsed:>10.0f} req/s {connections:>6} connections")
+
+
+def bench_sync(count: int) -> None:
+    with StubServer() as server:
+        start = time.perf_counter()
+        for _ in range(count):
+            objectrest.get_json(url=f"{server.base_url}/item")
+        _report("sync, new connection", count, time.perf_counter() - start, server.connections)
+
+    with StubServer() as server, RestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+        start = time.perf_counter()
+        for _ in range(count):
+            client.get(endpoint="/item")
+        _report("sync, pooled", count, time.perf_counter() - start, server.connections)
+
+
+async def _bench_async(count: int) -> None:
+    with StubServer() as server:
+        start = time.perf_counter()
+        for _ in range(count):
+            async with httpx.AsyncClient() as client:
+                await client.get(f"{server.base_url}/item")
+        _report("async, new connection", count, time.perf_counter() - start, server.connections)
+
+    with StubServer() as server:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+            start = time.perf_counter()
+            for _ in range(count):
+                await client.get(endpoint="/item")
+            _report("async, pooled", count, time.perf_counter() - start, server.connections)
+
+
+if __name__ == "__main__":
+    requests_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    bench_sync(requests_count)
+    asyncio.run(_bench_async(requests_count))
@@ -0,0 +1,311 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    wbufsize = 64 * 1024
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.count_connection()
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        admitted = self.server.enter()
+        try:
+            # requests over capacity are shed straight away, like an overloaded upstream would
+            if admitted and self.server.latency:
+                time.sleep(self.server.latency)
+        finally:
+            self.server.leave()
+        status = 200
+        body = self.server.payload
+        if not admitted or (self.server.error_rate and random.random() < self.server.error_rate):
+            status = 503
+            body = b'{"error": "unavailable"}'
+        self.server.count_request(failed=status != 200)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+    do_PUT = _respond
+    do_PATCH = _respond
+    do_DELETE = _respond
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    handler_class: type = _StubHandler
+
+    def __init__(self,
+                 payload: object = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: float = 0.0,
+                 error_rate: float = 0.0,
+                 capacity: int = None):
+        """
+        A local keep-alive HTTP/1.1 server returning a fixed JSON payload
+
+        :param payload: JSON-serializable payload returned for every request
+        :type payload: object, optional
+        :param host: Interface to bind to
+        :type host: str, optional
+        :param port: Port to bind to (0 picks a free port)
+        :type port: int, optional
+        :param latency: Seconds to wait before answering each request
+        :type latency: float, optional
+        :param error_rate: Fraction of requests answered with a 503 instead of the payload
+        :type error_rate: float, optional
+        :param capacity: Number of requests handled at once, further ones are answered with a 503 (None for no limit)
+        :type capacity: int, optional
+        """
+        super().__init__((host, port), self.handler_class)
+        self.payload: bytes = json.dumps(payload if payload is not None else {"ok": True}).encode()
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.capacity: int = capacity
+        self.in_flight: int = 0
+        self.peak_in_flight: int = 0
+        self.connections: int = 0
+        self.requests: int = 0
+        self.errors: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._thread: threading.Thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def enter(self) -> bool:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            return self.capacity is None or self.in_flight <= self.capacity
+
+    def leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def count_request(self, failed: bool = False) -> None:
+        with self._lock:
+            self.requests += 1
+            if failed:
+                self.errors += 1
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def make_certificate(directory: str) -> tuple:
+    """
+    Create a self-signed certificate for 127.0.0.1 with the openssl command line tool
+
+    :param directory: Directory to write cert.pem and key.pem to
+    :type directory: str
+    :return: Paths of the certificate and its key
+    :rtype: tuple
+    """
+    certificate, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+                    "-addext", "subjectAltName=IP:127.0.0.1", "-keyout", key, "-out", certificate],
+                   check=True, capture_output=True)
+    return certificate, key
+
+
+class _TlsStubService:
+    def __init__(self, payload: bytes, latency: float, connections: Any, requests: Any):
+        self.payload: bytes = payload
+        self.latency: float = latency
+        self.connections: Any = connections
+        self.requests: Any = requests
+
+    def _count_request(self) -> None:
+        with self.requests.get_lock():
+            self.requests.value += 1
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        with self.connections.get_lock():
+            self.connections.value += 1
+        try:
+            if writer.get_extra_info("ssl_object").selected_alpn_protocol() == "h2":
+                await self._serve_http2(reader, writer)
+            else:
+                await self._serve_http1(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, ssl.SSLError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_http1(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n")[1:]:
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            if length:
+                await reader.readexactly(length)
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            self._count_request()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: "
+                         + str(len(self.payload)).encode() + b"\r\n\r\n" + self.payload)
+            await writer.drain()
+
+    async def _serve_http2(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        connection = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        connection.initiate_connection()
+        writer.write(connection.data_to_send())
+        pending = set()
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.StreamEnded):
+                    task = asyncio.ensure_future(self._respond_http2(connection, writer, event.stream_id))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(connection.data_to_send())
+            await writer.drain()
+
+    async def _respond_http2(self, connection: Any, writer: asyncio.StreamWriter, stream_id: int) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._count_request()
+        connection.send_headers(stream_id, [(":status", "200"), ("content-type", "application/json"),
+                                            ("content-length", str(len(self.payload)))])
+        size = connection.max_outbound_frame_size
+        for start in range(0, len(self.payload), size):
+            connection.send_data(stream_id, self.payload[start:start + size],
+                                 end_stream=start + size >= len(self.payload))
+        writer.write(connection.data_to_send())
+
+
+def _serve_tls(service: _TlsStubService, host: str, port: Any, certificate: str, key: str, ready: Any,
+               stop: Any) -> None:
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(certificate, key)
+    context.set_alpn_protocols(["h2", "http/1.1"])
+
+    async def serve() -> None:
+        server = await asyncio.start_server(service.handle, host, port.value, ssl=context)
+        port.value = server.sockets[0].getsockname()[1]
+        ready.set()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, stop.wait)
+        server.close()
+
+    asyncio.run(serve())
+
+
+class TlsStubServer:
+    def __init__(self, payload: object = None, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        """
+        A local HTTPS server returning a fixed JSON payload over HTTP/2 or HTTP/1.1, whichever the client negotiates
+        Runs in a separate process, so serving does not compete with the client for the GIL;
+        requires the h2 package and the openssl command
+
+        :param payload: JSON-serializable payload returned for every request
+        :type payload: object, optional
+        :param host: Interface to bind to
+        :type host: str, optional
+        :param port: Port to bind to (0 picks a free port)
+        :type port: int, optional
+        :param latency: Seconds to wait before answering each request
+        :type latency: float, optional
+        """
+        self.host: str = host
+        self._directory: str = tempfile.mkdtemp()
+        self.certificate, key = make_certificate(self._directory)
+        self._port: Any = multiprocessing.Value("i", port)
+        self._connections: Any = multiprocessing.Value("i", 0)
+        self._requests: Any = multiprocessing.Value("i", 0)
+        self._ready: Any = multiprocessing.Event()
+        self._stop: Any = multiprocessing.Event()
+        service = _TlsStubService(payload=json.dumps(payload if payload is not None else {"ok": True}).encode(),
+                                  latency=latency, connections=self._connections, requests=self._requests)
+        self._process: multiprocessing.Process = multiprocessing.Process(
+            target=_serve_tls, args=(service, host, self._port, self.certificate, key, self._ready, self._stop),
+            daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"https://{self.host}:{self._port.value}"
+
+    @property
+    def connections(self) -> int:
+        return self._connections.value
+
+    @property
+    def requests(self) -> int:
+        return self._requests.value
+
+    def reset(self) -> None:
+        """
+        Reset the connection and request counters
+        """
+        self._connections.value = 0
+        self._requests.value = 0
+
+    def client_context(self) -> ssl.SSLContext:
+        """
+        Build an SSL context trusting the server's self-signed certificate
+
+        :return: SSL context for clients
+        :rtype: ssl.SSLContext
+        """
+        return ssl.create_default_context(cafile=self.certificate)
+
+    def __enter__(self) -> "TlsStubServer":
+        self._process.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("TLS stub server did not start.")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._stop.set()
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        shutil.rmtree(self._directory, ignore_errors=True)
@@ -0,0 +1,262 @@
+"""
+Offline benchmark suite: throughput and latency of RestApiClient and AsyncRestApiClient against a local stub server
+
+Every scenario runs a client method (JSON, text, object or blind variant) at several concurrency levels, so results
+do not depend on network access or a third-party API. Results are written as JSON, and a previous run can be used as
+a baseline to fail on regressions (e.g. in CI).
+
+Usage:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.2
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List
+
+from benchmarks.json_backends import make_payload
+from benchmarks.server import StubServer
+from easyclient import ApiAuthNone, AsyncRestApiClient, RestApiClient
+
+VARIANTS = ("json", "text", "object", "blind")
+
+
+class Item:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+
+def _summarize(name: str, client: str, variant: str, concurrency: int, latencies: List[float], errors: int,
+               elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "name": name,
+        "client": client,
+        "variant": variant,
+        "concurrency": concurrency,
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 3),
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+    }
+
+
+def _sync_call(client: RestApiClient, variant: str) -> Callable[[], bool]:
+    # each call returns whether the request produced a usable result
+    if variant == "json":
+        return lambda: bool(client.get(endpoint="/items"))
+    if variant == "text":
+        return lambda: bool(client.get_text(endpoint="/items"))
+    if variant == "object":
+        return lambda: client.get_object(endpoint="/items", model=Item, sub_keys=["results"],
+                                         extract_list=True) is not None
+    return lambda: client.post_blind(endpoint="/items", body={"name": "item"})
+
+
+def _async_call(client: AsyncRestApiClient, variant: str) -> Callable[[], Awaitable[bool]]:
+    async def json_call() -> bool:
+        response = await client.get(endpoint="/items")
+        return bool(response) and bool(response.json())
+
+    async def text_call() -> bool:
+        response = await client.get(endpoint="/items")
+        return bool(response) and bool(response.text)
+
+    async def object_call() -> bool:
+        return await client.get_object(endpoint="/items", model=Item, sub_keys=["results"],
+                                       extract_list=True) is not None
+
+    async def blind_call() -> bool:
+        return await client.post_blind(endpoint="/items", body={"name": "item"})
+
+    return {"json": json_call, "text": text_call, "object": object_call, "blind": blind_call}[variant]
+
+
+def run_sync(base_url: str, variant: str, concurrency: int, requests: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = [0]
+    remaining = [requests]
+    lock = threading.Lock()
+    with RestApiClient(base_url=base_url, auth=ApiAuthNone()) as client:
+        call = _sync_call(client, variant)
+        call()  # warm up the connection pool
+
+        def worker() -> None:
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                start = time.perf_counter()
+                try:
+                    ok = call()
+                except Exception:
+                    ok = False
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    if not ok:
+                        errors[0] += 1
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [executor.submit(worker) for _ in range(concurrency)]:
+                future.result()
+        elapsed = time.perf_counter() - start
+    return _summarize(f"sync/{variant}/c{concurrency}", "sync", variant, concurrency, latencies, errors[0], elapsed)
+
+
+async def _run_async(base_url: str, variant: str, concurrency: int, requests: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+    async with AsyncRestApiClient(base_url=base_url, auth=ApiAuthNone()) as client:
+        call = _async_call(client, variant)
+        await call()
+
+        async def worker() -> None:
+            nonlocal errors, remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    ok = await call()
+                except Exception:
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                if not ok:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return _summarize(f"async/{variant}/c{concurrency}", "async", variant, concurrency, latencies, errors, elapsed)
+
+
+def run_async(base_url: str, variant: str, concurrency: int, requests: int) -> Dict[str, Any]:
+    return asyncio.run(_run_async(base_url, variant, concurrency, requests))
+
+
+def run_suite(concurrency_levels: List[int], requests: int, payload_items: int, latency_ms: float,
+              error_rate: float, clients: List[str], variants: List[str]) -> Dict[str, Any]:
+    runners = {"sync": run_sync, "async": run_async}
+    results = []
+    with StubServer(payload=make_payload(payload_items), latency=latency_ms / 1000, error_rate=error_rate) as server:
+        for client in clients:
+            for variant in variants:
+                for concurrency in concurrency_levels:
+                    result = runners[client](server.base_url, variant, concurrency, requests)
+                    results.append(result)
+                    print(f"{result['name']:<20} {result['throughput_rps']:>10.1f} req/s "
+                          f"p50 {result['p50_ms']:>8.2f}ms p99 {result['p99_ms']:>8.2f}ms "
+                          f"{result['errors']:>5} errors", file=sys.stderr)
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "config": {
+            "concurrency": concurrency_levels,
+            "requests": requests,
+            "payload_items": payload_items,
+            "latency_ms": latency_ms,
+            "error_rate": error_rate,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare a run against a baseline run
+
+    :param current: Results of this run
+    :type current: dict
+    :param baseline: Results of the baseline run
+    :type baseline: dict
+    :param threshold: Allowed relative change, e.g. 0.2 tolerates 20% lower throughput or 20% higher p99 latency
+    :type threshold: float
+    :return: Descriptions of the regressions found
+    :rtype: list
+    """
+    previous = {result["name"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+        if before["throughput_rps"] and result["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{result['name']}: throughput {before['throughput_rps']:.1f} -> "
+                               f"{result['throughput_rps']:.1f} req/s")
+        if before["p99_ms"] and result["p99_ms"] > before["p99_ms"] * (1 + threshold):
+            regressions.append(f"{result['name']}: p99 {before['p99_ms']:.2f} -> {result['p99_ms']:.2f}ms")
+    return regressions
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Write results to this JSON file (stdout if not set)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Fail if results regressed against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression (default 0.2)")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 8, 32], help="Comma-separated levels")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--payload-items", type=int, default=100, help="Items in the JSON payload")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Server latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 503")
+    parser.add_argument("--clients", default="sync,async", help="Comma-separated clients (sync, async)")
+    parser.add_argument("--variants", default=",".join(VARIANTS), help="Comma-separated variants")
+    parser.add_argument("--quick", action="store_true", help="Run a short smoke version of the suite")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.requests = min(args.requests, 200)
+        args.concurrency = args.concurrency[:2]
+    clients = [client for client in args.clients.split(",") if client]
+    variants = [variant for variant in args.variants.split(",") if variant]
+    unknown = [name for name in clients if name not in ("sync", "async")]
+    unknown += [name for name in variants if name not in VARIANTS]
+    if unknown:
+        parser.error(f"unknown clients or variants: {', '.join(unknown)}")
+
+    report = run_suite(concurrency_levels=args.concurrency, requests=args.requests,
+                       payload_items=args.payload_items, latency_ms=args.latency_ms, error_rate=args.error_rate,
+                       clients=clients, variants=variants)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(report, baseline, threshold=args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%} against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,115 @@
-import easyclient.parameters as parameters
-import easyclient.utils as utils
-from easyclient.client.base import (
-    ApiAuthNone,
-    ApiAuthKey,
-    ApiAuthOAuth2,
-)
-from easyclient.client.rest import (
-    RestApiClient,
-    AsyncRestApiClient,
-)
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# names are imported on first access, so importing easyclient stays cheap until a client is actually used
+_EXPORTS = {
+    "AdaptiveConcurrencyLimiter": "easyclient.client.base.concurrency",
+    "ApiAuthNone": "easyclient.client.base.auth",
+    "ApiAuthKey": "easyclient.client.base.auth",
+    "ApiAuthOAuth2": "easyclient.client.base.auth",
+    "BatchRequest": "easyclient.client.base.batch",
+    "BatchResult": "easyclient.client.base.batch",
+    "CacheBackend": "easyclient.client.base.cache",
+    "CircuitBreaker": "easyclient.client.base.circuit",
+    "CircuitOpenError": "easyclient.client.base.circuit",
+    "ConnectionPoolConfig": "easyclient.client.base.pool",
+    "ContentEncodingPolicy": "easyclient.client.base.encoding",
+    "CursorPagination": "easyclient.client.base.pagination",
+    "FileTokenStore": "easyclient.client.base.token",
+    "HedgePolicy": "easyclient.client.base.hedge",
+    "Instrumentation": "easyclient.client.base.metrics",
+    "JsonCodec": "easyclient.client.base.codec",
+    "JsonItemStream": "easyclient.client.base.streaming",
+    "LazyModelList": "easyclient.client.base.models",
+    "LinkHeaderPagination": "easyclient.client.base.pagination",
+    "LoggingPolicy": "easyclient.client.base.request_log",
+    "MemoryCache": "easyclient.client.base.cache",
+    "MultipartBody": "easyclient.client.base.body",
+    "OffsetPagination": "easyclient.client.base.pagination",
+    "PageNumberPagination": "easyclient.client.base.pagination",
+    "PaginationStrategy": "easyclient.client.base.pagination",
+    "RateLimiter": "easyclient.client.base.ratelimit",
+    "RecordingTransport": "easyclient.client.base.transport",
+    "ReplayMissError": "easyclient.client.base.transport",
+    "ReplayTransport": "easyclient.client.base.transport",
+    "ResponseCache": "easyclient.client.base.cache",
+    "RetryBudget": "easyclient.client.base.retry",
+    "RetryPolicy": "easyclient.client.base.retry",
+    "SlidingWindow": "easyclient.client.base.ratelimit",
+    "SQLiteCache": "easyclient.client.base.cache",
+    "StreamingBody": "easyclient.client.base.body",
+    "TokenBucket": "easyclient.client.base.ratelimit",
+    "TokenManager": "easyclient.client.base.token",
+    "Transport": "easyclient.client.base.transport",
+    "ValidatorStore": "easyclient.client.base.conditional",
+    "RestApiClient": "easyclient.client.rest.client",
+    "AsyncRestApiClient": "easyclient.client.rest.client",
+}
+_SUBMODULES = ("parameters", "utils")
+
+__all__ = [*_SUBMODULES, *_EXPORTS]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    import easyclient.parameters as parameters
+    import easyclient.utils as utils
+    from easyclient.client.base import (
+        AdaptiveConcurrencyLimiter,
+        ApiAuthNone,
+        ApiAuthKey,
+        ApiAuthOAuth2,
+        BatchRequest,
+        BatchResult,
+        CacheBackend,
+        CircuitBreaker,
+        CircuitOpenError,
+        ConnectionPoolConfig,
+        ContentEncodingPolicy,
+        CursorPagination,
+        FileTokenStore,
+        HedgePolicy,
+        Instrumentation,
+        JsonCodec,
+        JsonItemStream,
+        LazyModelList,
+        LinkHeaderPagination,
+        LoggingPolicy,
+        MemoryCache,
+        MultipartBody,
+        OffsetPagination,
+        PageNumberPagination,
+        PaginationStrategy,
+        RateLimiter,
+        RecordingTransport,
+        ReplayMissError,
+        ReplayTransport,
+        ResponseCache,
+        RetryBudget,
+        RetryPolicy,
+        SlidingWindow,
+        SQLiteCache,
+        StreamingBody,
+        TokenBucket,
+        TokenManager,
+        Transport,
+        ValidatorStore,
+    )
+    from easyclient.client.rest import (
+        RestApiClient,
+        AsyncRestApiClient,
+    )
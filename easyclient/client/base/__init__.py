@@ -1,9 +1,194 @@
-from easyclient.client.base.auth import (
-    ApiAuth,
-    ApiAuthKey,
-    ApiAuthNone,
-    ApiAuthOAuth2,
-)
-from easyclient.client.base.client import (
-    ApiClient,
-)
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# names are imported from their modules on first access, so using one module does not load every other one
+_EXPORTS = {
+    "ApiAuth": "easyclient.client.base.auth",
+    "ApiAuthKey": "easyclient.client.base.auth",
+    "ApiAuthNone": "easyclient.client.base.auth",
+    "ApiAuthOAuth2": "easyclient.client.base.auth",
+    "BatchRequest": "easyclient.client.base.batch",
+    "MultipartBody": "easyclient.client.base.body",
+    "StreamingBody": "easyclient.client.base.body",
+    "BatchResult": "easyclient.client.base.batch",
+    "CacheBackend": "easyclient.client.base.cache",
+    "CacheStats": "easyclient.client.base.cache",
+    "MemoryCache": "easyclient.client.base.cache",
+    "ResponseCache": "easyclient.client.base.cache",
+    "SQLiteCache": "easyclient.client.base.cache",
+    "Circuit": "easyclient.client.base.circuit",
+    "CircuitBreaker": "easyclient.client.base.circuit",
+    "CircuitOpenError": "easyclient.client.base.circuit",
+    "ApiClient": "easyclient.client.base.client",
+    "JsonCodec": "easyclient.client.base.codec",
+    "get_codec": "easyclient.client.base.codec",
+    "AdaptiveConcurrencyLimiter": "easyclient.client.base.concurrency",
+    "ConcurrencyLimit": "easyclient.client.base.concurrency",
+    "ValidatorRecord": "easyclient.client.base.conditional",
+    "ValidatorStore": "easyclient.client.base.conditional",
+    "ContentEncodingPolicy": "easyclient.client.base.encoding",
+    "EncodingStats": "easyclient.client.base.encoding",
+    "available_encodings": "easyclient.client.base.encoding",
+    "HedgePolicy": "easyclient.client.base.hedge",
+    "HedgeStats": "easyclient.client.base.hedge",
+    "EndpointMetrics": "easyclient.client.base.metrics",
+    "Instrumentation": "easyclient.client.base.metrics",
+    "LatencyHistogram": "easyclient.client.base.metrics",
+    "RequestEvent": "easyclient.client.base.metrics",
+    "LazyModelList": "easyclient.client.base.models",
+    "ModelAdapter": "easyclient.client.base.models",
+    "model_adapter": "easyclient.client.base.models",
+    "CursorPagination": "easyclient.client.base.pagination",
+    "LinkHeaderPagination": "easyclient.client.base.pagination",
+    "OffsetPagination": "easyclient.client.base.pagination",
+    "PageNumberPagination": "easyclient.client.base.pagination",
+    "PaginationStrategy": "easyclient.client.base.pagination",
+    "ConnectionPoolConfig": "easyclient.client.base.pool",
+    "RateLimit": "easyclient.client.base.ratelimit",
+    "RateLimiter": "easyclient.client.base.ratelimit",
+    "SlidingWindow": "easyclient.client.base.ratelimit",
+    "TokenBucket": "easyclient.client.base.ratelimit",
+    "JsonFormatter": "easyclient.client.base.request_log",
+    "LoggingPolicy": "easyclient.client.base.request_log",
+    "RetryBudget": "easyclient.client.base.retry",
+    "RetryPolicy": "easyclient.client.base.retry",
+    "RetryStats": "easyclient.client.base.retry",
+    "PooledSession": "easyclient.client.base.session",
+    "PooledAsyncSession": "easyclient.client.base.session",
+    "JsonItemStream": "easyclient.client.base.streaming",
+    "FileTokenStore": "easyclient.client.base.token",
+    "MemoryTokenStore": "easyclient.client.base.token",
+    "OAuth2Token": "easyclient.client.base.token",
+    "TokenManager": "easyclient.client.base.token",
+    "TokenStore": "easyclient.client.base.token",
+    "Recording": "easyclient.client.base.transport",
+    "RecordingTransport": "easyclient.client.base.transport",
+    "ReplayMissError": "easyclient.client.base.transport",
+    "ReplayTransport": "easyclient.client.base.transport",
+    "Transport": "easyclient.client.base.transport",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from easyclient.client.base.auth import (
+        ApiAuth,
+        ApiAuthKey,
+        ApiAuthNone,
+        ApiAuthOAuth2,
+    )
+    from easyclient.client.base.batch import (
+        BatchRequest,
+        BatchResult,
+    )
+    from easyclient.client.base.body import (
+        MultipartBody,
+        StreamingBody,
+    )
+    from easyclient.client.base.cache import (
+        CacheBackend,
+        CacheStats,
+        MemoryCache,
+        ResponseCache,
+        SQLiteCache,
+    )
+    from easyclient.client.base.circuit import (
+        Circuit,
+        CircuitBreaker,
+        CircuitOpenError,
+    )
+    from easyclient.client.base.client import (
+        ApiClient,
+    )
+    from easyclient.client.base.codec import (
+        JsonCodec,
+        get_codec,
+    )
+    from easyclient.client.base.concurrency import (
+        AdaptiveConcurrencyLimiter,
+        ConcurrencyLimit,
+    )
+    from easyclient.client.base.conditional import (
+        ValidatorRecord,
+        ValidatorStore,
+    )
+    from easyclient.client.base.encoding import (
+        ContentEncodingPolicy,
+        EncodingStats,
+        available_encodings,
+    )
+    from easyclient.client.base.hedge import (
+        HedgePolicy,
+        HedgeStats,
+    )
+    from easyclient.client.base.metrics import (
+        EndpointMetrics,
+        Instrumentation,
+        LatencyHistogram,
+        RequestEvent,
+    )
+    from easyclient.client.base.models import (
+        LazyModelList,
+        ModelAdapter,
+        model_adapter,
+    )
+    from easyclient.client.base.pagination import (
+        CursorPagination,
+        LinkHeaderPagination,
+        OffsetPagination,
+        PageNumberPagination,
+        PaginationStrategy,
+    )
+    from easyclient.client.base.pool import (
+        ConnectionPoolConfig,
+    )
+    from easyclient.client.base.ratelimit import (
+        RateLimit,
+        RateLimiter,
+        SlidingWindow,
+        TokenBucket,
+    )
+    from easyclient.client.base.request_log import (
+        JsonFormatter,
+        LoggingPolicy,
+    )
+    from easyclient.client.base.retry import (
+        RetryBudget,
+        RetryPolicy,
+        RetryStats,
+    )
+    from easyclient.client.base.session import (
+        PooledSession,
+        PooledAsyncSession,
+    )
+    from easyclient.client.base.streaming import (
+        JsonItemStream,
+    )
+    from easyclient.client.base.token import (
+        FileTokenStore,
+        MemoryTokenStore,
+        OAuth2Token,
+        TokenManager,
+        TokenStore,
+    )
+    from easyclient.client.base.transport import (
+        Recording,
+        RecordingTransport,
+        ReplayMissError,
+        ReplayTransport,
+        Transport,
+    )
@@ -1,13 +1,51 @@
+import hashlib
+from typing import Tuple, Union
+
 from objectrest import (
     RequestHandler,
     ApiTokenRequestHandler,
-    OAuth2RequestHandler
 )
 
+from easyclient.client.base.ratelimit import RateLimiter
+from easyclient.client.base.token import (
+    TokenManager,
+    TokenStore,
+)
+
+
+def _fingerprint(*parts: str) -> str:
+    return hashlib.sha256("\x00".join(parts).encode()).hexdigest()[:16]
+
 
 class ApiAuth:
-    def __init__(self):
-        pass
+    def __init__(self, rate_limiter: RateLimiter = None):
+        """
+        Credentials for an API
+
+        :param rate_limiter: Limiter shared by every client using these credentials
+        :type rate_limiter: RateLimiter, optional
+        """
+        self.rate_limiter: Union[RateLimiter, None] = rate_limiter
+        # sessions add the Authorization header from this manager's token to every request
+        self.token_manager: Union[TokenManager, None] = None
+
+    def _identity(self) -> str:
+        """
+        Identify the credentials without exposing them, e.g. to keep cache entries of different users apart
+
+        :return: An identifier of the credentials
+        :rtype: str
+        """
+        return self.__class__.__name__
+
+    def _secret_params(self) -> Tuple[str, ...]:
+        """
+        Name the URL parameters the credentials are sent in, so they can be redacted from logs
+
+        :return: Parameter names
+        :rtype: tuple
+        """
+        return ()
 
     def _construct_handler(self,
                            base_url: str,
@@ -18,8 +56,8 @@ class ApiAuth:
 
 
 class ApiAuthNone(ApiAuth):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rate_limiter: RateLimiter = None):
+        super().__init__(rate_limiter=rate_limiter)
 
     def _construct_handler(self,
                            base_url: str,
@@ -37,21 +75,30 @@ class ApiAuthOAuth2(ApiAuth):
     def __init__(self,
                  client_id: str,
                  client_secret: str,
-                 authorization_url: str):
-        super().__init__()
+                 authorization_url: str,
+                 rate_limiter: RateLimiter = None,
+                 token_store: TokenStore = None,
+                 refresh_margin: float = 60.0):
+        super().__init__(rate_limiter=rate_limiter)
         self._client_id: str = client_id
         self._client_secret: str = client_secret
         self._authorization_url: str = authorization_url
+        self.token_manager = TokenManager(client_id=client_id,
+                                          client_secret=client_secret,
+                                          authorization_url=authorization_url,
+                                          store=token_store,
+                                          refresh_margin=refresh_margin)
+
+    def _identity(self) -> str:
+        return f"oauth2:{self.token_manager.key}"
 
     def _construct_handler(self,
                            base_url: str,
                            universal_parameters: dict = None,
                            universal_headers: dict = None,
                            log_requests: bool = False) -> RequestHandler:
-        return OAuth2RequestHandler(
-            client_id=self._client_id,
-            client_secret=self._client_secret,
-            authorization_url=self._authorization_url,
+        # tokens are fetched lazily by the token manager rather than by the handler on every request
+        return RequestHandler(
             base_url=base_url,
             universal_parameters=universal_parameters,
             universal_headers=universal_headers,
@@ -59,11 +106,17 @@ class ApiAuthOAuth2(ApiAuth):
 
 
 class ApiAuthKey(ApiAuth):
-    def __init__(self, key: str, key_keyword: str = 'key'):
-        super().__init__()
+    def __init__(self, key: str, key_keyword: str = 'key', rate_limiter: RateLimiter = None):
+        super().__init__(rate_limiter=rate_limiter)
         self._key: str = key
         self._key_keyword: str = key_keyword
 
+    def _identity(self) -> str:
+        return f"key:{_fingerprint(self._key_keyword, self._key)}"
+
+    def _secret_params(self) -> Tuple[str, ...]:
+        return (self._key_keyword,)
+
     def _construct_handler(self,
                            base_url: str,
                            universal_parameters: dict = None,
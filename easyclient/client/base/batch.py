@@ -0,0 +1,117 @@
+from typing import Any, Callable, Iterable, List, Tuple, Union
+
+
+class BatchRequest:
+    def __init__(self, endpoint: str, params: dict = None, **kwargs):
+        """
+        A single request inside a batch
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param params: Dictionary of parameters to add to url
+        :type params: dict, optional
+        :param kwargs: Extra keyword arguments for the client method (e.g. model, sub_keys), overriding batch-wide ones
+        :type kwargs: dict, optional
+        """
+        self.endpoint: str = endpoint
+        self.params: dict = params
+        self.kwargs: dict = kwargs
+
+    @classmethod
+    def coerce(cls, item: Union["BatchRequest", str, Tuple]) -> "BatchRequest":
+        """
+        Build a BatchRequest from an endpoint string, an (endpoint, params) tuple or an existing BatchRequest
+
+        :param item: Item to convert
+        :type item: BatchRequest, str or tuple
+        :return: A batch request
+        :rtype: BatchRequest
+        """
+        if isinstance(item, cls):
+            return item
+        if isinstance(item, str):
+            return cls(endpoint=item)
+        if isinstance(item, (tuple, list)) and 1 <= len(item) <= 2:
+            return cls(*item)
+        raise TypeError(f"Cannot build a batch request from {item!r}")
+
+    def __repr__(self) -> str:
+        return f"BatchRequest(endpoint={self.endpoint!r}, params={self.params!r})"
+
+
+class BatchResult:
+    def __init__(self, index: int, request: BatchRequest, value: Any = None, error: BaseException = None):
+        """
+        The outcome of a single request inside a batch
+
+        :param index: Position of the request in the batch
+        :type index: int
+        :param request: The request that produced this result
+        :type request: BatchRequest
+        :param value: Value returned by the client method
+        :type value: object, optional
+        :param error: Exception raised by the client method
+        :type error: BaseException, optional
+        """
+        self.index: int = index
+        self.request: BatchRequest = request
+        self.value: Any = value
+        self.error: Union[BaseException, None] = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """
+        Get the value, re-raising the error if the request failed
+
+        :return: Value returned by the client method
+        :rtype: object
+        """
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"BatchResult(index={self.index}, value={self.value!r})"
+        return f"BatchResult(index={self.index}, error={self.error!r})"
+
+
+def prepare_batch(requests: Iterable) -> List[BatchRequest]:
+    """
+    Normalize the items of a batch into BatchRequest objects
+
+    :param requests: Endpoint strings, (endpoint, params) tuples or BatchRequest objects
+    :type requests: iterable
+    :return: List of batch requests
+    :rtype: list
+    """
+    return [BatchRequest.coerce(item) for item in requests]
+
+
+def resolve_batch_method(client: object, method: str, allowed: Iterable[str]) -> Callable:
+    """
+    Look up a client method that may be used in a batch
+
+    :param client: The client to look the method up on
+    :type client: object
+    :param method: Name of the client method (e.g. "get", "get_object", "post_blind")
+    :type method: str
+    :param allowed: Names of methods that may be batched
+    :type allowed: iterable
+    :return: The bound client method
+    :rtype: callable
+    """
+    if method not in allowed:
+        raise ValueError(f"{method} cannot be used in a batch. Choose from: {', '.join(sorted(allowed))}")
+    return getattr(client, method)
+
+
+def merge_batch_kwargs(request: BatchRequest, shared_kwargs: dict) -> dict:
+    kwargs = dict(shared_kwargs)
+    kwargs.update(request.kwargs)
+    kwargs["endpoint"] = request.endpoint
+    kwargs["params"] = request.params
+    return kwargs
@@ -0,0 +1,376 @@
+import asyncio
+import io
+import mimetypes
+import mmap
+import os
+import uuid
+import zlib
+from collections.abc import AsyncIterable, Iterator
+from typing import Any, AsyncIterator, Dict, List, Mapping, Tuple, Union
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+def _as_bytes(chunk: Union[bytes, str, memoryview]) -> Union[bytes, memoryview]:
+    return chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+
+def _file_length(source: Any, start: Union[int, None]) -> Union[int, None]:
+    if start is None:
+        return None
+    try:
+        return max(os.fstat(source.fileno()).st_size - start, 0)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+    try:
+        end = source.seek(0, io.SEEK_END)
+        source.seek(start)
+        return max(end - start, 0)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def _file_start(source: Any) -> Union[int, None]:
+    try:
+        return source.tell() if source.seekable() else None
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+class StreamingBody:
+    def __init__(self,
+                 source: Any,
+                 content_type: str = "application/octet-stream",
+                 length: int = None,
+                 gzip: bool = False,
+                 compress_level: int = 6,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        A request body sent in chunks as it is read, without holding all of it in memory
+
+        Bodies of known length are sent with a Content-Length header, others (and gzipped ones) with chunked
+        transfer encoding
+        Bytes, memory-mapped files and seekable file objects are rewound and sent again when a request is retried;
+        generators, iterators and async iterables can only be sent once, so requests sending them are not retried
+
+        :param source: Bytes, memory-mapped file, file object opened in binary mode, iterator of bytes
+            or async iterable of bytes (the last only with the async client)
+        :type source: object
+        :param content_type: Content-Type of the body
+        :type content_type: str, optional
+        :param length: Length of the body, if it cannot be worked out from the source
+        :type length: int, optional
+        :param gzip: Whether to compress the body with gzip while it is sent
+        :type gzip: bool, optional
+        :param compress_level: gzip compression level, from 1 (fastest) to 9 (smallest)
+        :type compress_level: int, optional
+        :param chunk_size: Number of bytes read from a file or memory-mapped file at a time
+        :type chunk_size: int, optional
+        """
+        self.content_type: str = content_type
+        self.gzip: bool = gzip
+        self.compress_level: int = compress_level
+        self.chunk_size: int = chunk_size
+        self._source: Any = source
+        self._start: Union[int, None] = None
+        self._sent: bool = False
+        if isinstance(source, _BUFFER_TYPES):
+            self._kind: str = "buffer"
+            self._length: Union[int, None] = len(memoryview(source).cast("B")) if length is None else length
+        elif hasattr(source, "read"):
+            self._kind = "file"
+            self._start = _file_start(source)
+            self._length = _file_length(source, self._start) if length is None else length
+        elif isinstance(source, Iterator):
+            self._kind = "iterator"
+            self._length = length
+        elif isinstance(source, AsyncIterable):
+            self._kind = "async"
+            self._length = length
+        else:
+            raise TypeError(f"Cannot stream a request body from {type(source).__name__}.")
+
+    @property
+    def length(self) -> Union[int, None]:
+        """
+        Number of bytes sent, or None if it is not known before sending (always None when gzipped)
+        """
+        return None if self.gzip else self._raw_length()
+
+    @property
+    def replayable(self) -> bool:
+        """
+        Whether the body can be sent again, by a retry or a redirect
+        """
+        return self._kind == "buffer" or self._start is not None
+
+    def _raw_length(self) -> Union[int, None]:
+        return self._length
+
+    def rewind(self) -> None:
+        """
+        Go back to the start of the body, so it can be sent again
+
+        :raises ValueError: If the body cannot be replayed
+        """
+        if not self.replayable:
+            raise ValueError("Request body streamed from an iterator can only be sent once.")
+        if self._start is not None:
+            self._source.seek(self._start)
+        self._sent = False
+
+    def _begin(self) -> None:
+        if self._sent:
+            self.rewind()
+        self._sent = True
+
+    def headers(self, content_length: bool = False) -> Dict[str, str]:
+        """
+        Get the headers describing the body
+
+        :param content_length: Whether to include a Content-Length header when the length is known
+        :type content_length: bool, optional
+        :return: Headers
+        :rtype: dict
+        """
+        headers = {"Content-Type": self.content_type}
+        if self.gzip:
+            headers["Content-Encoding"] = "gzip"
+        length = self.length
+        if content_length and length is not None:
+            headers["Content-Length"] = str(length)
+        return headers
+
+    def _raw_chunks(self) -> Iterator:
+        if self._kind == "buffer":
+            with memoryview(self._source) as view:
+                view = view.cast("B")
+                for position in range(0, len(view), self.chunk_size):
+                    yield view[position:position + self.chunk_size]
+        elif self._kind == "file":
+            read = self._source.read
+            chunk = read(self.chunk_size)
+            while chunk:
+                yield _as_bytes(chunk)
+                chunk = read(self.chunk_size)
+        elif self._kind == "iterator":
+            for chunk in self._source:
+                yield _as_bytes(chunk)
+        else:
+            raise TypeError("Request body streamed from an async iterable can only be sent by the async client.")
+
+    async def _async_raw_chunks(self) -> AsyncIterator:
+        if self._kind == "async":
+            async for chunk in self._source:
+                yield _as_bytes(chunk)
+        elif self._kind == "file":
+            # file reads can block, so they are kept off the event loop
+            loop = asyncio.get_running_loop()
+            read = self._source.read
+            chunk = await loop.run_in_executor(None, read, self.chunk_size)
+            while chunk:
+                yield _as_bytes(chunk)
+                chunk = await loop.run_in_executor(None, read, self.chunk_size)
+        else:
+            for chunk in self._raw_chunks():
+                yield chunk
+
+    def chunks(self) -> Iterator:
+        """
+        Iterate over the body, compressed if gzip is enabled
+        Iterating again starts over from the beginning of a replayable body
+
+        :return: Chunks of the body
+        :rtype: iterator
+        :raises ValueError: If a body that cannot be replayed was already sent
+        """
+        self._begin()
+        if not self.gzip:
+            return self._raw_chunks()
+        return _gzip_chunks(self._raw_chunks(), self.compress_level)
+
+    def async_chunks(self) -> AsyncIterator:
+        """
+        Iterate over the body asynchronously, compressed if gzip is enabled
+        Iterating again starts over from the beginning of a replayable body
+
+        :return: Chunks of the body
+        :rtype: async iterator
+        :raises ValueError: If a body that cannot be replayed was already sent
+        """
+        self._begin()
+        if not self.gzip:
+            return self._async_raw_chunks()
+        return _async_gzip_chunks(self._async_raw_chunks(), self.compress_level)
+
+    def request_kwargs(self, asynchronous: bool = False) -> dict:
+        """
+        Build the session keyword arguments sending the body
+
+        :param asynchronous: Whether the body is sent by the async session
+        :type asynchronous: bool, optional
+        :return: Keyword arguments for the session
+        :rtype: dict
+        """
+        if asynchronous:
+            # httpx only sets Content-Length itself for bodies it can measure
+            return {"content": _AsyncStream(self), "headers": self.headers(content_length=True)}
+        return {"data": _SyncStream(self), "headers": self.headers()}
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(kind={self._kind!r}, content_type={self.content_type!r}, "
+                f"length={self.length!r}, gzip={self.gzip!r})")
+
+
+def _gzip_chunks(chunks: Iterator, level: int) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def _async_gzip_chunks(chunks: AsyncIterator, level: int) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class _SyncStream:
+    # requests streams any iterable body, reading its length from a len attribute (0 means chunked)
+    def __init__(self, body: StreamingBody):
+        self.body: StreamingBody = body
+        self.len: int = body.length or 0
+
+    @property
+    def replayable(self) -> bool:
+        return self.body.replayable
+
+    def __iter__(self) -> Iterator:
+        return self.body.chunks()
+
+
+class _AsyncStream:
+    # httpx treats anything iterable as a sync body, so this only implements __aiter__
+    def __init__(self, body: StreamingBody):
+        self.body: StreamingBody = body
+
+    @property
+    def replayable(self) -> bool:
+        return self.body.replayable
+
+    def __aiter__(self) -> AsyncIterator:
+        return self.body.async_chunks()
+
+
+def _quote(value: str) -> str:
+    return value.replace("\"", "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+FileField = Union[Any, Tuple[str, Any], Tuple[str, Any, str]]
+
+
+class MultipartBody(StreamingBody):
+    def __init__(self,
+                 fields: Mapping[str, Union[str, bytes]] = None,
+                 files: Mapping[str, FileField] = None,
+                 boundary: str = None,
+                 gzip: bool = False,
+                 compress_level: int = 6,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        A multipart/form-data request body, streaming each file as it is sent
+
+        :param fields: Form fields, by name
+        :type fields: dict, optional
+        :param files: Files, by field name; each a source accepted by StreamingBody, a (filename, source) tuple
+            or a (filename, source, content_type) tuple
+        :type files: dict, optional
+        :param boundary: Boundary between parts, generated if not given
+        :type boundary: str, optional
+        :param gzip: Whether to compress the body with gzip while it is sent
+        :type gzip: bool, optional
+        :param compress_level: gzip compression level, from 1 (fastest) to 9 (smallest)
+        :type compress_level: int, optional
+        :param chunk_size: Number of bytes read from a file at a time
+        :type chunk_size: int, optional
+        """
+        self.boundary: str = boundary or uuid.uuid4().hex
+        self._parts: List[Tuple[bytes, StreamingBody]] = []
+        for name, value in (fields or {}).items():
+            header = f"--{self.boundary}\r\nContent-Disposition: form-data; name=\"{_quote(name)}\"\r\n\r\n"
+            self._parts.append((header.encode("utf-8"), StreamingBody(_as_bytes(value), chunk_size=chunk_size)))
+        for name, value in (files or {}).items():
+            self._parts.append(self._file_part(name, value, chunk_size))
+        self._closing: bytes = f"--{self.boundary}--\r\n".encode("utf-8")
+        super().__init__(b"", content_type=f"multipart/form-data; boundary={self.boundary}", gzip=gzip,
+                         compress_level=compress_level, chunk_size=chunk_size)
+        self._kind = "multipart"
+
+    def _file_part(self, name: str, value: FileField, chunk_size: int) -> Tuple[bytes, StreamingBody]:
+        if isinstance(value, tuple):
+            filename, source, content_type = value if len(value) == 3 else (value[0], value[1], None)
+        else:
+            filename = os.path.basename(str(getattr(value, "name", name)))
+            source, content_type = value, None
+        content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        header = (f"--{self.boundary}\r\n"
+                  f"Content-Disposition: form-data; name=\"{_quote(name)}\"; filename=\"{_quote(filename)}\"\r\n"
+                  f"Content-Type: {content_type}\r\n\r\n")
+        part = source if isinstance(source, StreamingBody) else StreamingBody(source, chunk_size=chunk_size)
+        return header.encode("utf-8"), part
+
+    def _raw_length(self) -> Union[int, None]:
+        total = len(self._closing)
+        for header, part in self._parts:
+            if part.length is None:
+                return None
+            total += len(header) + part.length + 2
+        return total
+
+    @property
+    def replayable(self) -> bool:
+        return all(part.replayable for _, part in self._parts)
+
+    def rewind(self) -> None:
+        if not self.replayable:
+            raise ValueError("Multipart body with a file streamed from an iterator can only be sent once.")
+        # every part rewinds itself when it is iterated again
+        self._sent = False
+
+    def _raw_chunks(self) -> Iterator:
+        for header, part in self._parts:
+            yield header
+            yield from part.chunks()
+            yield b"\r\n"
+        yield self._closing
+
+    async def _async_raw_chunks(self) -> AsyncIterator:
+        for header, part in self._parts:
+            yield header
+            async for chunk in part.async_chunks():
+                yield chunk
+            yield b"\r\n"
+        yield self._closing
+
+
+def streaming_body(body: Any) -> Union[StreamingBody, None]:
+    """
+    Get the streaming body to send a request body as, if it is not a JSON body
+
+    :param body: Request body
+    :type body: object
+    :return: The streaming body, or None if the body should be encoded as JSON
+    :rtype: StreamingBody
+    """
+    if isinstance(body, StreamingBody):
+        return body
+    if isinstance(body, mmap.mmap) or hasattr(body, "read") or isinstance(body, (Iterator, AsyncIterable)):
+        return StreamingBody(body)
+    return None
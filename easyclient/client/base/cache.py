@@ -0,0 +1,376 @@
+import copy
+import hashlib
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatch
+from typing import Any, Awaitable, Callable, Dict, Tuple, Union
+
+from easyclient.client.base.singleflight import (
+    AsyncSingleFlight,
+    SingleFlight,
+)
+
+
+class CacheStats:
+    def __init__(self):
+        """
+        Hit, miss and eviction counters for a cache
+        """
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hit_ratio,
+        }
+
+    def __repr__(self) -> str:
+        return f"CacheStats({self.snapshot()})"
+
+
+class CacheEntry:
+    def __init__(self, value: Any, expires_at: float):
+        self.value: Any = value
+        self.expires_at: float = expires_at
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class CacheBackend:
+    def __init__(self):
+        self.stats: CacheStats = CacheStats()
+
+    def get(self, key: str) -> Union[CacheEntry, None]:
+        """
+        Look up an unexpired entry
+
+        :param key: Cache key
+        :type key: str
+        :return: The cached entry, or None on a miss
+        :rtype: CacheEntry
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Store a value
+
+        :param key: Cache key
+        :type key: str
+        :param value: Value to store
+        :type value: object
+        :param ttl: Seconds until the value expires
+        :type ttl: float
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+# values that cannot be changed in place, so they are stored and handed out as they are
+_IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+class _StoredCopy:
+    __slots__ = ("blob", "value")
+
+    def __init__(self, value: Any):
+        # pickling is faster than deep-copying JSON data, values that cannot be pickled are deep-copied instead
+        try:
+            self.blob: Union[bytes, None] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            self.value: Any = None
+        except Exception:
+            self.blob = None
+            self.value = copy.deepcopy(value)
+
+    def copy(self) -> Any:
+        return pickle.loads(self.blob) if self.blob is not None else copy.deepcopy(self.value)
+
+
+class MemoryCache(CacheBackend):
+    def __init__(self, max_entries: int = 1024, copy_values: bool = True):
+        """
+        An in-memory LRU cache with per-entry expiration
+
+        :param max_entries: Maximum number of entries before the least recently used one is evicted
+        :type max_entries: int, optional
+        :param copy_values: Whether to store a copy of mutable values and return a new copy on every hit, so callers
+            may change what they get without changing the cache (if False, values are shared by reference and
+            must not be mutated)
+        :type copy_values: bool, optional
+        """
+        super().__init__()
+        self.max_entries: int = max_entries
+        self.copy_values: bool = copy_values
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: str) -> Union[CacheEntry, None]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            if entry.expired:
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+        if isinstance(entry.value, _StoredCopy):
+            return CacheEntry(value=entry.value.copy(), expires_at=entry.expires_at)
+        return entry
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if self.copy_values and not isinstance(value, _IMMUTABLE_TYPES):
+            value = _StoredCopy(value)
+        with self._lock:
+            self._entries[key] = CacheEntry(value=value, expires_at=time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(CacheBackend):
+    def __init__(self, path: str, max_entries: int = 10000):
+        """
+        An on-disk LRU cache with per-entry expiration, backed by SQLite
+        Values must be picklable
+
+        :param path: Path to the SQLite database file
+        :type path: str
+        :param max_entries: Maximum number of entries before the least recently used one is evicted
+        :type max_entries: int, optional
+        """
+        import sqlite3  # only loaded when an on-disk cache is used
+
+        super().__init__()
+        self.max_entries: int = max_entries
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS entries ("
+                                     "key TEXT PRIMARY KEY, value BLOB, expires_at REAL, accessed_at REAL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+    def get(self, key: str) -> Union[CacheEntry, None]:
+        with self._lock:
+            row = self._connection.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            entry = CacheEntry(value=row[0], expires_at=row[1])
+            with self._connection:
+                if entry.expired:
+                    self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self.stats.expirations += 1
+                    self.stats.misses += 1
+                    return None
+                self._connection.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.stats.hits += 1
+        entry.value = pickle.loads(entry.value)
+        return entry
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) "
+                                     "VALUES (?, ?, ?, ?)", (key, blob, now + ttl, now))
+            overflow = self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._connection.execute("DELETE FROM entries WHERE key IN "
+                                         "(SELECT key FROM entries ORDER BY accessed_at LIMIT ?)", (overflow,))
+                self.stats.evictions += overflow
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def make_cache_key(method: str,
+                   base_url: str,
+                   endpoint: str,
+                   params: dict = None,
+                   identity: str = None,
+                   variant: str = None) -> str:
+    """
+    Build a stable cache key for a request
+
+    :param method: HTTP method
+    :type method: str
+    :param base_url: Base URL of the client
+    :type base_url: str
+    :param endpoint: URL endpoint
+    :type endpoint: str
+    :param params: Dictionary of parameters added to url (order does not matter)
+    :type params: dict, optional
+    :param identity: Identity of the credentials used, so different users never share entries
+    :type identity: str, optional
+    :param variant: How the response is parsed (e.g. "json", "text" or a model name)
+    :type variant: str, optional
+    :return: A hex digest identifying the request
+    :rtype: str
+    """
+    normalized = json.dumps([method.upper(), base_url.rstrip("/"), f"/{endpoint.lstrip('/')}",
+                             sorted((str(key), value) for key, value in (params or {}).items()),
+                             identity, variant], default=str, separators=(",", ":"))
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def object_variant(model: type, sub_keys: list = None, extract_list: bool = False, lazy: bool = False) -> str:
+    """
+    Describe how a response is parsed into objects, for use as a cache key variant
+
+    :param model: Model the response is parsed into
+    :type model: type
+    :param sub_keys: A list of sub-keys searched (in order) to find JSON data for model.
+    :type sub_keys: list, optional
+    :param extract_list: Whether list items are converted into models
+    :type extract_list: bool, optional
+    :param lazy: Whether list items are converted into models on access
+    :type lazy: bool, optional
+    :return: A cache key variant
+    :rtype: str
+    """
+    variant = f"object:{model.__module__}.{model.__qualname__}:{sub_keys}:{extract_list}"
+    return f"{variant}:lazy" if lazy else variant
+
+
+class ResponseCache:
+    def __init__(self,
+                 backend: CacheBackend = None,
+                 ttl: float = 300,
+                 endpoint_ttls: Dict[str, float] = None):
+        """
+        Cache successful GET responses
+
+        :param backend: Where to store entries (defaults to an in-memory LRU cache)
+        :type backend: CacheBackend, optional
+        :param ttl: Default number of seconds responses are cached for
+        :type ttl: float, optional
+        :param endpoint_ttls: Per-endpoint TTL overrides, keyed by glob pattern (e.g. {"/reference/*": 86400}),
+            first match wins
+        :type endpoint_ttls: dict, optional
+        """
+        self.backend: CacheBackend = backend or MemoryCache()
+        self.ttl: float = ttl
+        self.endpoint_ttls: Dict[str, float] = endpoint_ttls or {}
+        self._flight: SingleFlight = SingleFlight()
+        self._async_flight: AsyncSingleFlight = AsyncSingleFlight()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.backend.stats
+
+    def ttl_for(self, endpoint: str, ttl: float = None) -> float:
+        """
+        Get the TTL for an endpoint
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param ttl: Per-call override
+        :type ttl: float, optional
+        :return: Number of seconds to cache the response for (0 disables caching)
+        :rtype: float
+        """
+        if ttl is not None:
+            return ttl
+        endpoint = f"/{endpoint.lstrip('/')}"
+        for pattern, pattern_ttl in self.endpoint_ttls.items():
+            if fnmatch(endpoint, pattern):
+                return pattern_ttl
+        return self.ttl
+
+    def fetch(self, key: str, ttl: float, loader: Callable[[], Tuple[Any, bool]]) -> Any:
+        """
+        Get a cached value, or load it (once, however many threads miss at the same time) and cache it
+
+        :param key: Cache key
+        :type key: str
+        :param ttl: Seconds to cache a loaded value for
+        :type ttl: float
+        :param loader: Function returning the value and whether it may be cached
+        :type loader: callable
+        :return: The cached or loaded value
+        :rtype: object
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            return entry.value
+
+        def load() -> Any:
+            value, cacheable = loader()
+            if cacheable:
+                self.backend.set(key, value, ttl)
+            return value
+
+        return self._flight.do(key, load)
+
+    async def async_fetch(self, key: str, ttl: float, loader: Callable[[], Awaitable[Tuple[Any, bool]]]) -> Any:
+        """
+        Get a cached value, or load it (once, however many coroutines miss at the same time) and cache it
+
+        :param key: Cache key
+        :type key: str
+        :param ttl: Seconds to cache a loaded value for
+        :type ttl: float
+        :param loader: Coroutine function returning the value and whether it may be cached
+        :type loader: callable
+        :return: The cached or loaded value
+        :rtype: object
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            return entry.value
+
+        async def load() -> Any:
+            value, cacheable = await loader()
+            if cacheable:
+                self.backend.set(key, value, ttl)
+            return value
+
+        return await self._async_flight.do(key, load)
+
+    def clear(self) -> None:
+        self.backend.clear()
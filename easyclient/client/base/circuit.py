@@ -0,0 +1,240 @@
+import threading
+import time
+from fnmatch import fnmatch
+from typing import Dict, Iterable, List, Tuple, Type, Union
+
+from easyclient.client.base.retry import RETRY_EXCEPTIONS
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+FAILURE_STATUSES = frozenset((500, 502, 503, 504))
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after: float):
+        """
+        Raised instead of sending a request while its circuit is open
+
+        :param name: Name of the open circuit
+        :type name: str
+        :param retry_after: Number of seconds until the circuit lets a trial request through
+        :type retry_after: float
+        """
+        super().__init__(f"Circuit {name} is open, retry in {retry_after:.1f}s")
+        self.name: str = name
+        self.retry_after: float = retry_after
+
+
+class Circuit:
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float, half_open_max_calls: int):
+        """
+        The state of a single circuit: closed (requests flow), open (requests fail fast)
+        or half-open (a few trial requests decide whether to close or re-open)
+
+        :param name: Name of the circuit (base URL or endpoint pattern)
+        :type name: str
+        :param failure_threshold: Number of consecutive failures that open the circuit
+        :type failure_threshold: int
+        :param recovery_timeout: Number of seconds an open circuit waits before letting trial requests through
+        :type recovery_timeout: float
+        :param half_open_max_calls: Number of concurrent trial requests allowed while half-open
+        :type half_open_max_calls: int
+        """
+        self.name: str = name
+        self.failure_threshold: int = failure_threshold
+        self.recovery_timeout: float = recovery_timeout
+        self.half_open_max_calls: int = half_open_max_calls
+        self._state: str = CLOSED
+        self._failures: int = 0
+        self._opened_at: float = 0.0
+        self._trials: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self.times_opened: int = 0
+        self.rejected: int = 0
+        self.successes: int = 0
+        self.failures: int = 0
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def allow(self) -> None:
+        """
+        Let a request through, or raise if the circuit is open
+
+        :raises CircuitOpenError: If the circuit is open or its trial requests are already in flight
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._trials < self.half_open_max_calls:
+                self._trials += 1
+                return
+            self.rejected += 1
+            retry_after = max(self._opened_at + self.recovery_timeout - now, 0.0)
+        raise CircuitOpenError(name=self.name, retry_after=retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.successes += 1
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self.times_opened += 1
+
+    def release(self) -> None:
+        """
+        Give back a trial request whose outcome says nothing about the upstream's health
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._trials:
+                self._trials -= 1
+
+    def reset(self) -> None:
+        """
+        Close the circuit
+        """
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trials = 0
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_after": max(self._opened_at + self.recovery_timeout - now, 0.0) if state == OPEN else 0.0,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+                "successes": self.successes,
+                "failures": self.failures,
+            }
+
+    def __repr__(self) -> str:
+        return f"Circuit(name={self.name!r}, state={self.state!r})"
+
+
+class CircuitBreaker:
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1,
+                 endpoint_patterns: List[str] = None,
+                 failure_statuses: Iterable[int] = FAILURE_STATUSES,
+                 exceptions: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS):
+        """
+        Fail fast while an upstream is down instead of tying up connections and threads waiting on it
+        Requests share one circuit per base URL, except endpoints matching a pattern, which get a circuit per pattern
+
+        :param failure_threshold: Number of consecutive failures that open a circuit
+        :type failure_threshold: int, optional
+        :param recovery_timeout: Number of seconds an open circuit waits before letting trial requests through
+        :type recovery_timeout: float, optional
+        :param half_open_max_calls: Number of concurrent trial requests allowed while half-open
+        :type half_open_max_calls: int, optional
+        :param endpoint_patterns: Glob patterns of endpoints tracked separately (e.g. ["/search*"]), first match wins
+        :type endpoint_patterns: list, optional
+        :param failure_statuses: Response status codes counted as failures
+        :type failure_statuses: iterable, optional
+        :param exceptions: Exception types counted as failures
+        :type exceptions: tuple, optional
+        """
+        self.failure_threshold: int = max(failure_threshold, 1)
+        self.recovery_timeout: float = recovery_timeout
+        self.half_open_max_calls: int = max(half_open_max_calls, 1)
+        self.endpoint_patterns: List[str] = endpoint_patterns or []
+        self.failure_statuses: frozenset = frozenset(failure_statuses)
+        self.exceptions: Tuple[Type[BaseException], ...] = tuple(exceptions)
+        self._circuits: Dict[str, Circuit] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def circuit_name(self, base_url: Union[str, None], endpoint: str) -> str:
+        """
+        Get the name of the circuit a request belongs to
+
+        :param base_url: Base URL of the client
+        :type base_url: str, optional
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :return: Name of the circuit
+        :rtype: str
+        """
+        endpoint = f"/{endpoint.lstrip('/')}"
+        for pattern in self.endpoint_patterns:
+            if fnmatch(endpoint, pattern):
+                return f"{(base_url or '').rstrip('/')}{pattern}"
+        return base_url or ""
+
+    def circuit(self, name: str) -> Circuit:
+        """
+        Get a circuit by name, creating it (closed) if it does not exist yet
+
+        :param name: Name of the circuit
+        :type name: str
+        :return: The circuit
+        :rtype: Circuit
+        """
+        circuit = self._circuits.get(name)
+        if circuit is None:
+            with self._lock:
+                circuit = self._circuits.setdefault(name, Circuit(name=name,
+                                                                  failure_threshold=self.failure_threshold,
+                                                                  recovery_timeout=self.recovery_timeout,
+                                                                  half_open_max_calls=self.half_open_max_calls))
+        return circuit
+
+    def is_failure(self, status_code: int = None, error: BaseException = None) -> bool:
+        if error is not None:
+            return isinstance(error, self.exceptions)
+        return status_code in self.failure_statuses
+
+    def states(self) -> Dict[str, str]:
+        """
+        Get the state of every circuit
+
+        :return: Circuit states ("closed", "open" or "half_open") keyed by circuit name
+        :rtype: dict
+        """
+        return {name: circuit.state for name, circuit in list(self._circuits.items())}
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Get the state and counters of every circuit
+
+        :return: Circuit details keyed by circuit name
+        :rtype: dict
+        """
+        return {name: circuit.snapshot() for name, circuit in list(self._circuits.items())}
+
+    def reset(self, name: str = None) -> None:
+        """
+        Close a circuit, or every circuit
+
+        :param name: Name of the circuit to close (all circuits if None)
+        :type name: str, optional
+        """
+        for circuit_name, circuit in list(self._circuits.items()):
+            if name is None or circuit_name == name:
+                circuit.reset()
@@ -1,8 +1,217 @@
+import time
+from typing import Any, List, Union
+
 from objectrest import (
     RequestHandler,
 )
 
+from easyclient.client.base.auth import ApiAuth
+from easyclient.client.base.body import streaming_body
+from easyclient.client.base.cache import (
+    ResponseCache,
+    make_cache_key,
+)
+from easyclient.client.base.circuit import CircuitBreaker
+from easyclient.client.base.codec import (
+    JsonCodec,
+    get_codec,
+)
+from easyclient.client.base.conditional import ValidatorStore
+from easyclient.client.base.encoding import ContentEncodingPolicy
+from easyclient.client.base.hedge import HedgePolicy
+from easyclient.client.base.metrics import Instrumentation
+from easyclient.client.base.parsing import (
+    create_object,
+    parse_json,
+)
+from easyclient.client.base.pool import ConnectionPoolConfig
+from easyclient.client.base.ratelimit import RateLimiter
+from easyclient.client.base.request_log import LoggingPolicy
+from easyclient.client.base.retry import RetryPolicy
+from easyclient.client.base.session import _endpoint
+from easyclient.client.base.singleflight import SingleFlight
+from easyclient.client.base.token import TokenManager
+from easyclient.client.base.transport import Transport
+
 
 class ApiClient:
-    def __init__(self, request_handler: RequestHandler):
+    # keyword argument the session expects raw request bodies in
+    _body_argument: str = "data"
+    # whether streamed request bodies are sent by an async session
+    _async_bodies: bool = False
+    # collapses identical in-flight GETs when single-flight mode is enabled
+    _flight_class: type = SingleFlight
+
+    def __init__(self,
+                 request_handler: RequestHandler,
+                 pool_config: ConnectionPoolConfig = None,
+                 auth: ApiAuth = None,
+                 cache: ResponseCache = None,
+                 validators: ValidatorStore = None,
+                 json_backend: Union[str, JsonCodec] = None,
+                 rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None,
+                 single_flight: bool = False,
+                 hedge_policy: HedgePolicy = None,
+                 instrumentation: Instrumentation = None,
+                 logging_policy: LoggingPolicy = None,
+                 transport: Transport = None,
+                 trusted_models: bool = False,
+                 encoding_policy: ContentEncodingPolicy = None):
         self._request_handler = request_handler
+        self._pool_config: ConnectionPoolConfig = pool_config or ConnectionPoolConfig()
+        self._auth: Union[ApiAuth, None] = auth
+        self._cache: Union[ResponseCache, None] = cache
+        self._validators: Union[ValidatorStore, None] = validators
+        self._codec: JsonCodec = get_codec(json_backend)
+        self._rate_limiter: Union[RateLimiter, None] = rate_limiter or getattr(auth, "rate_limiter", None)
+        self._token_manager: Union[TokenManager, None] = getattr(auth, "token_manager", None)
+        self._token_attached: bool = self._token_manager is not None
+        if self._token_manager:
+            self._token_manager.attach()
+        self._retry_policy: Union[RetryPolicy, None] = retry_policy
+        self._circuit_breaker: Union[CircuitBreaker, None] = circuit_breaker
+        self._single_flight = self._flight_class() if single_flight else None
+        self._hedge_policy: Union[HedgePolicy, None] = hedge_policy
+        self._instrumentation: Union[Instrumentation, None] = instrumentation
+        self._logging_policy: Union[LoggingPolicy, None] = logging_policy
+        self._transport: Union[Transport, None] = transport
+        self._trusted_models: bool = trusted_models
+        self._encoding_policy: Union[ContentEncodingPolicy, None] = encoding_policy
+        if logging_policy and auth:
+            for name in auth._secret_params():
+                logging_policy.redact_param(name)
+        if transport and auth:
+            for name in auth._secret_params():
+                transport.strip_param(name)
+
+    @property
+    def pool_config(self) -> ConnectionPoolConfig:
+        return self._pool_config
+
+    @property
+    def codec(self) -> JsonCodec:
+        return self._codec
+
+    @property
+    def cache(self) -> Union[ResponseCache, None]:
+        return self._cache
+
+    @property
+    def validators(self) -> Union[ValidatorStore, None]:
+        return self._validators
+
+    @property
+    def rate_limiter(self) -> Union[RateLimiter, None]:
+        return self._rate_limiter
+
+    @property
+    def retry_policy(self) -> Union[RetryPolicy, None]:
+        return self._retry_policy
+
+    @property
+    def circuit_breaker(self) -> Union[CircuitBreaker, None]:
+        return self._circuit_breaker
+
+    @property
+    def single_flight(self):
+        return self._single_flight
+
+    @property
+    def hedge_policy(self) -> Union[HedgePolicy, None]:
+        return self._hedge_policy
+
+    @property
+    def instrumentation(self) -> Union[Instrumentation, None]:
+        return self._instrumentation
+
+    @property
+    def logging_policy(self) -> Union[LoggingPolicy, None]:
+        return self._logging_policy
+
+    @property
+    def transport(self) -> Union[Transport, None]:
+        return self._transport
+
+    @property
+    def trusted_models(self) -> bool:
+        return self._trusted_models
+
+    @property
+    def encoding_policy(self) -> Union[ContentEncodingPolicy, None]:
+        return self._encoding_policy
+
+    def _detach_token_manager(self) -> None:
+        # the manager belongs to the auth, which other clients may share, so only this client's use of it ends
+        if self._token_manager and self._token_attached:
+            self._token_attached = False
+            self._token_manager.detach()
+
+    def _cache_ttl(self, endpoint: str, cache_ttl: float = None) -> float:
+        """
+        Get the number of seconds to cache a GET response for
+
+        :return: TTL of the response (0 if it should not be cached)
+        :rtype: float
+        """
+        if self._cache is None:
+            return 0
+        return max(self._cache.ttl_for(endpoint=endpoint, ttl=cache_ttl), 0)
+
+    def _request_key(self, endpoint: str, params: dict, variant: str) -> str:
+        """
+        Get the key identifying a GET request and how its response is parsed
+
+        :return: The request key
+        :rtype: str
+        """
+        identity = self._auth._identity() if self._auth else None
+        return make_cache_key(method="GET", base_url=self._request_handler.base_url, endpoint=endpoint, params=params,
+                              identity=identity, variant=variant)
+
+    def _record_deserialize(self, response, started: float) -> None:
+        request = getattr(response, "request", None)
+        if request is None:
+            return
+        self._instrumentation.record_deserialize(method=request.method,
+                                                 endpoint=_endpoint(self._request_handler.base_url,
+                                                                    str(response.url)),
+                                                 seconds=time.perf_counter() - started)
+
+    def _parse_json(self, response) -> Any:
+        if not self._instrumentation:
+            return parse_json(response, codec=self._codec)
+        started = time.perf_counter()
+        json_data = parse_json(response, codec=self._codec)
+        self._record_deserialize(response, started)
+        return json_data
+
+    def _parse_object(self, response, model: type, sub_keys: List = None, extract_list: bool = False,
+                      lazy: bool = False) -> Any:
+        if not self._instrumentation:
+            return create_object(json_data=parse_json(response, codec=self._codec), model=model, sub_keys=sub_keys,
+                                 extract_list=extract_list, trusted=self._trusted_models, lazy=lazy)
+        started = time.perf_counter()
+        value = create_object(json_data=parse_json(response, codec=self._codec), model=model, sub_keys=sub_keys,
+                              extract_list=extract_list, trusted=self._trusted_models, lazy=lazy)
+        self._record_deserialize(response, started)
+        return value
+
+    def _body_kwargs(self, body: Any = None) -> dict:
+        """
+        Build the session keyword arguments sending a request body
+        Streaming bodies, multipart bodies, file objects, memory-mapped files, generators and async iterables
+        are streamed, anything else is encoded as JSON
+
+        :param body: Request body
+        :type body: object, optional
+        :return: Keyword arguments for the session
+        :rtype: dict
+        """
+        if body is None:
+            return {}
+        stream = streaming_body(body)
+        if stream is not None:
+            return stream.request_kwargs(asynchronous=self._async_bodies)
+        return {self._body_argument: self._codec.dumps(body), "headers": {"Content-Type": "application/json"}}
@@ -0,0 +1,86 @@
+import json
+from typing import Any, Callable, Dict, Union
+
+
+class JsonCodec:
+    name: str = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decode JSON data
+
+        :param data: Raw JSON (bytes are decoded directly, without building an intermediate str)
+        :type data: bytes or str
+        :return: Decoded JSON data
+        :rtype: object
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encode an object as JSON
+
+        :param obj: Object to encode
+        :type obj: object
+        :return: UTF-8 encoded JSON
+        :rtype: bytes
+        """
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.name!r})"
+
+
+class OrjsonCodec(JsonCodec):
+    name: str = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+
+class UjsonCodec(JsonCodec):
+    name: str = "ujson"
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._ujson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+_CODECS: Dict[str, Callable[[], JsonCodec]] = {
+    "json": JsonCodec,
+    "orjson": OrjsonCodec,
+    "ujson": UjsonCodec,
+}
+
+
+def get_codec(backend: Union[str, JsonCodec, None] = None) -> JsonCodec:
+    """
+    Get a JSON codec by name, falling back to the standard library if the backend is not installed
+
+    :param backend: Name of the backend ("json", "orjson" or "ujson") or a codec instance
+    :type backend: str or JsonCodec, optional
+    :return: A JSON codec
+    :rtype: JsonCodec
+    """
+    if isinstance(backend, JsonCodec):
+        return backend
+    factory = _CODECS.get(backend or "json")
+    if not factory:
+        raise ValueError(f"Unknown JSON backend {backend}. Choose from: {', '.join(_CODECS)}")
+    try:
+        return factory()
+    except ImportError:
+        return JsonCodec()
@@ -0,0 +1,404 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Tuple, Type, Union
+
+from easyclient.client.base.metrics import _escape_label
+from easyclient.client.base.retry import RETRY_EXCEPTIONS
+
+AIMD = "aimd"
+GRADIENT = "gradient"
+
+# responses with which an upstream says it is overloaded
+OVERLOAD_STATUSES = frozenset((429, 503))
+
+# reasons a limit changed, recorded in its history
+INCREASE = "increase"
+OVERLOAD = "overload"
+LATENCY = "latency"
+GRADIENT_CHANGE = "gradient"
+
+# number of latency samples the gradient algorithm's long-term average spans
+_LONG_WINDOW = 600
+
+
+class ConcurrencyLimit:
+    def __init__(self,
+                 name: str,
+                 algorithm: str,
+                 initial_limit: int,
+                 min_limit: int,
+                 max_limit: int,
+                 backoff_ratio: float,
+                 latency_threshold: Union[float, None],
+                 tolerance: float,
+                 smoothing: float,
+                 window: int,
+                 history_size: int):
+        """
+        The adaptive limit on the number of requests in flight to a single base URL
+
+        :param name: Name of the limit (base URL)
+        :type name: str
+        :param algorithm: "aimd" or "gradient"
+        :type algorithm: str
+        :param initial_limit: Limit before any request has been measured
+        :type initial_limit: int
+        :param min_limit: Lowest the limit goes
+        :type min_limit: int
+        :param max_limit: Highest the limit goes
+        :type max_limit: int
+        :param backoff_ratio: Factor the limit is multiplied by when the upstream is overloaded
+        :type backoff_ratio: float
+        :param latency_threshold: Number of seconds above which AIMD treats a response as a sign of overload
+        :type latency_threshold: float, optional
+        :param tolerance: Ratio of recent to long-term latency the gradient algorithm accepts before lowering the limit
+        :type tolerance: float
+        :param smoothing: Weight of a new gradient estimate against the current limit
+        :type smoothing: float
+        :param window: Number of latency samples the gradient algorithm averages before adjusting the limit
+        :type window: int
+        :param history_size: Number of limit changes kept
+        :type history_size: int
+        """
+        self.name: str = name
+        self.algorithm: str = algorithm
+        self.min_limit: int = min_limit
+        self.max_limit: int = max_limit
+        self.backoff_ratio: float = backoff_ratio
+        self.latency_threshold: Union[float, None] = latency_threshold
+        self.tolerance: float = tolerance
+        self.smoothing: float = smoothing
+        self.window: int = window
+        self._limit: float = float(initial_limit)
+        self._lock: threading.Lock = threading.Lock()
+        self._waiters: Deque[asyncio.Future] = deque()
+        # a request sent before the last decrease was already counted by it, so it does not decrease the limit again
+        self._decreased_at: float = 0.0
+        self._samples: List[float] = []
+        self._long_latency: float = 0.0
+        self.history: Deque[Tuple[float, int, str]] = deque([(time.time(), initial_limit, "initial")],
+                                                            maxlen=history_size)
+        self.in_flight: int = 0
+        self.successes: int = 0
+        self.overloads: int = 0
+        self.increases: int = 0
+        self.decreases: int = 0
+
+    @property
+    def limit(self) -> int:
+        """
+        Number of requests allowed in flight
+        """
+        return int(self._limit)
+
+    @property
+    def waiting(self) -> int:
+        """
+        Number of requests waiting for a free slot
+        """
+        return len(self._waiters)
+
+    async def acquire(self) -> float:
+        """
+        Wait until the number of requests in flight is below the limit, then take a slot
+
+        :return: time.monotonic() value the slot was taken at, to pass to release()
+        :rtype: float
+        """
+        with self._lock:
+            if not self._waiters and self.in_flight < self.limit:
+                self.in_flight += 1
+                return time.monotonic()
+            waiter = asyncio.get_event_loop().create_future()
+            self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.cancelled():
+                    # a slot freed before the cancellation ran has already dropped it from the queue
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                else:
+                    # the slot was handed over just as the request was cancelled
+                    self.in_flight -= 1
+                    self._wake()
+            raise
+        return time.monotonic()
+
+    def _wake(self) -> None:
+        # slots are handed straight to waiting requests, so a new request cannot jump the queue
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def release(self, started: float, overloaded: bool = None) -> None:
+        """
+        Free the slot of a finished request and adjust the limit to how it went
+
+        :param started: Value returned by acquire()
+        :type started: float
+        :param overloaded: Whether the upstream signalled overload (None if the request says nothing about the
+            upstream, e.g. it was cancelled)
+        :type overloaded: bool, optional
+        """
+        now = time.monotonic()
+        with self._lock:
+            in_flight = self.in_flight
+            self.in_flight -= 1
+            if overloaded:
+                self.overloads += 1
+                if started >= self._decreased_at:
+                    self._decrease(now, OVERLOAD)
+            elif overloaded is not None:
+                self.successes += 1
+                self._observe(now, now - started, in_flight)
+            self._wake()
+
+    def _observe(self, now: float, latency: float, in_flight: int) -> None:
+        if self.algorithm == AIMD:
+            if self.latency_threshold is not None and latency > self.latency_threshold:
+                if now - latency >= self._decreased_at:
+                    self._decrease(now, LATENCY)
+            elif in_flight * 2 >= self.limit:
+                # only grow while the limit is actually in use, not while the caller sends few requests
+                self._change(self._limit + 1 / max(self._limit, 1), INCREASE)
+            return
+        self._samples.append(latency)
+        if len(self._samples) < self.window:
+            return
+        recent = sum(self._samples) / len(self._samples)
+        self._samples.clear()
+        if not self._long_latency:
+            self._long_latency = recent
+        else:
+            self._long_latency += (recent - self._long_latency) * 2 / (_LONG_WINDOW / self.window + 1)
+            if self._long_latency > recent * 2:
+                # the upstream got faster for good, let the long-term average catch up
+                self._long_latency *= 0.9
+        if in_flight * 2 < self.limit:
+            return
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_latency / recent))
+        # headroom of sqrt(limit) lets the limit grow while latency stays flat
+        estimate = self._limit * gradient + math.sqrt(self._limit)
+        self._change(self._limit * (1 - self.smoothing) + estimate * self.smoothing, GRADIENT_CHANGE)
+
+    def _decrease(self, now: float, reason: str) -> None:
+        self._decreased_at = now
+        self._change(self._limit * self.backoff_ratio, reason)
+
+    def _change(self, limit: float, reason: str) -> None:
+        previous = self.limit
+        self._limit = max(float(self.min_limit), min(float(self.max_limit), limit))
+        if self.limit != previous:
+            if self.limit > previous:
+                self.increases += 1
+            else:
+                self.decreases += 1
+            self.history.append((time.time(), self.limit, reason))
+
+    def reset(self, limit: int) -> None:
+        with self._lock:
+            self._limit = float(max(self.min_limit, min(self.max_limit, limit)))
+            self._decreased_at = 0.0
+            self._samples.clear()
+            self._long_latency = 0.0
+            self.history.append((time.time(), self.limit, "reset"))
+            self._wake()
+
+    def snapshot(self) -> dict:
+        return {
+            "algorithm": self.algorithm,
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "successes": self.successes,
+            "overloads": self.overloads,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "history": [{"time": when, "limit": limit, "reason": reason} for when, limit, reason in self.history],
+        }
+
+    def __repr__(self) -> str:
+        return f"ConcurrencyLimit(name={self.name!r}, limit={self.limit}, in_flight={self.in_flight})"
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self,
+                 algorithm: str = AIMD,
+                 initial_limit: int = 10,
+                 min_limit: int = 1,
+                 max_limit: int = 200,
+                 backoff_ratio: float = 0.9,
+                 latency_threshold: float = None,
+                 tolerance: float = 1.5,
+                 smoothing: float = 0.2,
+                 window: int = 10,
+                 overload_statuses: Tuple[int, ...] = tuple(OVERLOAD_STATUSES),
+                 exceptions: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS,
+                 history_size: int = 1000):
+        """
+        Adjust the number of requests in flight to each base URL to what the upstream can take,
+        instead of a fixed concurrency picked up front
+        Requests over the limit wait for a slot; each finished request moves the limit
+
+        AIMD grows the limit by one per limit's worth of successful requests and multiplies it by backoff_ratio
+        when the upstream returns an overload status, times out or, with latency_threshold, responds slower than it
+        The gradient algorithm compares recent latency to its long-term average, lowering the limit as requests queue
+        up on the upstream and growing it while latency stays flat
+
+        The limit should not exceed the connection pool's per-host limit (or max_concurrent_streams with HTTP/2),
+        beyond which requests queue for a connection instead of reaching the upstream
+
+        :param algorithm: "aimd" or "gradient"
+        :type algorithm: str, optional
+        :param initial_limit: Limit before any request has been measured
+        :type initial_limit: int, optional
+        :param min_limit: Lowest the limit goes
+        :type min_limit: int, optional
+        :param max_limit: Highest the limit goes
+        :type max_limit: int, optional
+        :param backoff_ratio: Factor the limit is multiplied by when the upstream is overloaded
+        :type backoff_ratio: float, optional
+        :param latency_threshold: Number of seconds above which AIMD treats a response as a sign of overload
+        :type latency_threshold: float, optional
+        :param tolerance: Ratio of recent to long-term latency the gradient algorithm accepts before lowering the limit
+        :type tolerance: float, optional
+        :param smoothing: Weight of a new gradient estimate against the current limit
+        :type smoothing: float, optional
+        :param window: Number of latency samples the gradient algorithm averages before adjusting the limit
+        :type window: int, optional
+        :param overload_statuses: Response status codes signalling overload
+        :type overload_statuses: tuple, optional
+        :param exceptions: Exception types signalling overload
+        :type exceptions: tuple, optional
+        :param history_size: Number of limit changes kept per base URL
+        :type history_size: int, optional
+        :raises ValueError: If the algorithm is unknown or the limits are out of order
+        """
+        if algorithm not in (AIMD, GRADIENT):
+            raise ValueError(f"Unknown concurrency algorithm {algorithm!r}, expected {AIMD!r} or {GRADIENT!r}.")
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Concurrency limits must satisfy 1 <= min_limit <= max_limit.")
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be between 0 and 1.")
+        self.algorithm: str = algorithm
+        self.initial_limit: int = max(min_limit, min(max_limit, initial_limit))
+        self.min_limit: int = min_limit
+        self.max_limit: int = max_limit
+        self.backoff_ratio: float = backoff_ratio
+        self.latency_threshold: Union[float, None] = latency_threshold
+        self.tolerance: float = max(tolerance, 1.0)
+        self.smoothing: float = min(max(smoothing, 0.0), 1.0)
+        self.window: int = max(window, 1)
+        self.overload_statuses: frozenset = frozenset(overload_statuses)
+        self.exceptions: Tuple[Type[BaseException], ...] = tuple(exceptions)
+        self.history_size: int = history_size
+        self._limits: Dict[str, ConcurrencyLimit] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def limit(self, name: str) -> ConcurrencyLimit:
+        """
+        Get the limit of a base URL, creating it at the initial limit if it does not exist yet
+
+        :param name: Base URL
+        :type name: str
+        :return: The limit
+        :rtype: ConcurrencyLimit
+        """
+        limit = self._limits.get(name)
+        if limit is None:
+            with self._lock:
+                limit = self._limits.setdefault(name, ConcurrencyLimit(name=name,
+                                                                       algorithm=self.algorithm,
+                                                                       initial_limit=self.initial_limit,
+                                                                       min_limit=self.min_limit,
+                                                                       max_limit=self.max_limit,
+                                                                       backoff_ratio=self.backoff_ratio,
+                                                                       latency_threshold=self.latency_threshold,
+                                                                       tolerance=self.tolerance,
+                                                                       smoothing=self.smoothing,
+                                                                       window=self.window,
+                                                                       history_size=self.history_size))
+        return limit
+
+    def is_overload(self, status_code: int = None, error: BaseException = None) -> Union[bool, None]:
+        """
+        Work out whether the outcome of a request signals that the upstream is overloaded
+
+        :param status_code: Status code of the response
+        :type status_code: int, optional
+        :param error: Error the request failed with
+        :type error: BaseException, optional
+        :return: True if it does, False if not, None if the outcome says nothing about the upstream
+        :rtype: bool
+        """
+        if error is not None:
+            if isinstance(error, self.exceptions):
+                return True
+            return None
+        return status_code in self.overload_statuses
+
+    def limits(self) -> Dict[str, int]:
+        """
+        Get the current limit of every base URL
+
+        :return: Limits keyed by base URL
+        :rtype: dict
+        """
+        return {name: limit.limit for name, limit in list(self._limits.items())}
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Get the limit, counters and history of limit changes of every base URL
+
+        :return: Limit details keyed by base URL
+        :rtype: dict
+        """
+        return {name: limit.snapshot() for name, limit in list(self._limits.items())}
+
+    def to_prometheus(self, prefix: str = "easyclient") -> str:
+        """
+        Export the limits in the Prometheus text exposition format
+
+        :param prefix: Prefix of the metric names
+        :type prefix: str, optional
+        :return: Metrics in Prometheus text format
+        :rtype: str
+        """
+        limits = sorted(self._limits.items())
+        lines = []
+        for name in ("limit", "in_flight", "waiting"):
+            lines.append(f"# TYPE {prefix}_concurrency_{name} gauge")
+            for base_url, limit in limits:
+                lines.append(f'{prefix}_concurrency_{name}{{base_url="{_escape_label(base_url)}"}} '
+                             f'{getattr(limit, name)}')
+        lines.append(f"# TYPE {prefix}_concurrency_limit_changes_total counter")
+        for base_url, limit in limits:
+            for direction in ("increases", "decreases"):
+                lines.append(f'{prefix}_concurrency_limit_changes_total{{base_url="{_escape_label(base_url)}",'
+                             f'direction="{direction[:-1]}"}} {getattr(limit, direction)}')
+        lines.append(f"# TYPE {prefix}_concurrency_overloads_total counter")
+        for base_url, limit in limits:
+            lines.append(f'{prefix}_concurrency_overloads_total{{base_url="{_escape_label(base_url)}"}} '
+                         f'{limit.overloads}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self, name: str = None) -> None:
+        """
+        Put a limit, or every limit, back to the initial limit
+
+        :param name: Base URL of the limit to reset (all limits if None)
+        :type name: str, optional
+        """
+        for limit_name, limit in list(self._limits.items()):
+            if name is None or limit_name == name:
+                limit.reset(self.initial_limit)
+
+    def __repr__(self) -> str:
+        return f"AdaptiveConcurrencyLimiter(algorithm={self.algorithm!r}, limits={self.limits()!r})"
@@ -0,0 +1,101 @@
+from typing import Any, Mapping, Union
+
+from easyclient.client.base.cache import (
+    CacheBackend,
+    MemoryCache,
+)
+
+
+class ValidatorRecord:
+    def __init__(self, value: Any, etag: str = None, last_modified: str = None):
+        """
+        The validators of a response and the value parsed from it
+
+        :param value: Value parsed from the response
+        :type value: object
+        :param etag: ETag header of the response
+        :type etag: str, optional
+        :param last_modified: Last-Modified header of the response
+        :type last_modified: str, optional
+        """
+        self.value: Any = value
+        self.etag: Union[str, None] = etag
+        self.last_modified: Union[str, None] = last_modified
+
+    @property
+    def headers(self) -> dict:
+        """
+        Headers asking the server to only send the response if it changed
+
+        :return: If-None-Match and/or If-Modified-Since headers
+        :rtype: dict
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ValidatorStore:
+    def __init__(self, backend: CacheBackend = None, ttl: float = 7 * 24 * 60 * 60):
+        """
+        Remember ETag/Last-Modified validators so unchanged GET responses are revalidated with a 304
+        instead of being downloaded and parsed again
+
+        :param backend: Where to store validators and parsed values (defaults to an in-memory LRU cache, which like
+            the SQLite one hands out a copy of the parsed value on every lookup)
+        :type backend: CacheBackend, optional
+        :param ttl: Seconds to remember the validators of a response for
+        :type ttl: float, optional
+        """
+        self.backend: CacheBackend = backend or MemoryCache()
+        self.ttl: float = ttl
+        self.not_modified: int = 0
+        self.modified: int = 0
+
+    def lookup(self, key: str) -> Union[ValidatorRecord, None]:
+        """
+        Get the validators stored for a request
+
+        :param key: Request key
+        :type key: str
+        :return: The stored record, or None if there is none
+        :rtype: ValidatorRecord
+        """
+        entry = self.backend.get(key)
+        return entry.value if entry is not None else None
+
+    def store(self, key: str, headers: Mapping[str, str], value: Any) -> None:
+        """
+        Store the validators of a response and the value parsed from it, if the response has any validators
+
+        :param key: Request key
+        :type key: str
+        :param headers: Response headers
+        :type headers: mapping
+        :param value: Value parsed from the response
+        :type value: object
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        self.modified += 1
+        self.backend.set(key, ValidatorRecord(value=value, etag=etag, last_modified=last_modified), self.ttl)
+
+    def revalidated(self, key: str, record: ValidatorRecord) -> Any:
+        """
+        Record a 304 Not Modified response and get the previously parsed value
+
+        :param key: Request key
+        :type key: str
+        :param record: The record the request was revalidated against
+        :type record: ValidatorRecord
+        :return: The previously parsed value, as copied by the lookup that found the record
+        :rtype: object
+        """
+        self.not_modified += 1
+        self.backend.set(key, record, self.ttl)
+        return record.value
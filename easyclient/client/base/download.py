@@ -0,0 +1,116 @@
+import os
+import re
+from typing import Any, BinaryIO, Callable, Iterable, Mapping, Union
+
+import requests
+
+from easyclient.client.base.retry import RETRY_EXCEPTIONS
+
+Destination = Union[str, os.PathLike, BinaryIO, bytearray, memoryview]
+
+# errors that cut a body off part way, after which the rest of it can be requested with a Range header
+INTERRUPTED_EXCEPTIONS = RETRY_EXCEPTIONS + (requests.exceptions.ChunkedEncodingError,)
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)")
+
+
+def range_headers(position: int) -> dict:
+    """
+    Build the headers requesting a body from a position onwards
+    The body is requested unencoded: a Range header counts bytes of the body as sent, while a compressed body is
+    read decoded, so positions in a compressed body cannot be resumed from
+
+    :param position: Number of bytes of the body already received
+    :type position: int
+    :return: Headers with Accept-Encoding: identity, and a Range header unless the whole body is requested
+    :rtype: dict
+    """
+    headers = {"Accept-Encoding": "identity"}
+    if position:
+        headers["Range"] = f"bytes={position}-"
+    return headers
+
+
+def range_start(status_code: int, headers: Mapping[str, str], position: int) -> Union[int, None]:
+    """
+    Get the position in the body a response to a (possibly ranged) request starts at
+
+    :param status_code: Status code of the response
+    :type status_code: int
+    :param headers: Headers of the response
+    :type headers: mapping
+    :param position: Position the body was requested from
+    :type position: int
+    :return: Position the response starts at (0 if the server ignored the Range header),
+        or None if the body was already received in full
+    :rtype: int
+    """
+    match = _CONTENT_RANGE.match(headers.get("Content-Range", ""))
+    if status_code == 206:
+        return int(match.group(1)) if match and match.group(1) is not None else position
+    if status_code == 416 and position and match and match.group(2) == str(position):
+        return None
+    return 0
+
+
+def file_offset(path: Union[str, os.PathLike], resume: bool) -> int:
+    """
+    Get the position to resume downloading into a file from
+
+    :param path: Path of the file
+    :type path: str
+    :param resume: Whether to resume the download
+    :type resume: bool
+    :return: Size of the file if resuming and it exists, 0 otherwise
+    :rtype: int
+    """
+    return os.path.getsize(path) if resume and os.path.exists(path) else 0
+
+
+def is_encoded(headers: Mapping[str, str]) -> bool:
+    return headers.get("Content-Encoding", "identity").strip().lower() != "identity"
+
+
+def is_buffer(destination: Destination) -> bool:
+    return isinstance(destination, (bytearray, memoryview))
+
+
+def is_path(destination: Destination) -> bool:
+    return isinstance(destination, (str, os.PathLike))
+
+
+class BufferWriter:
+    def __init__(self, buffer: Union[bytearray, memoryview]):
+        """
+        Copy chunks into a preallocated buffer, one after the other
+
+        :param buffer: Writable buffer
+        :type buffer: bytearray or memoryview
+        """
+        self._view: memoryview = memoryview(buffer).cast("B")
+        self.position: int = 0
+
+    def write(self, chunk: bytes) -> None:
+        end = self.position + len(chunk)
+        if end > len(self._view):
+            raise ValueError(f"Response body does not fit in a buffer of {len(self._view)} bytes.")
+        self._view[self.position:end] = chunk
+        self.position = end
+
+
+def write_chunks(write: Callable[[bytes], Any], chunks: Iterable[bytes]) -> int:
+    """
+    Write chunks as they arrive
+
+    :param write: Function writing a chunk
+    :type write: callable
+    :param chunks: Chunks to write
+    :type chunks: iterable
+    :return: Number of bytes written
+    :rtype: int
+    """
+    written = 0
+    for chunk in chunks:
+        write(chunk)
+        written += len(chunk)
+    return written
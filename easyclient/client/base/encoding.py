@@ -0,0 +1,367 @@
+import importlib
+import threading
+import zlib
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+# most to least preferred; zstd and br are only offered when their library is installed
+DEFAULT_ENCODINGS = ("zstd", "br", "gzip", "deflate")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class _GzipDecoder:
+    def __init__(self):
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes) -> bytes:
+        output = []
+        while data:
+            output.append(self._decompressor.decompress(data))
+            if not self._decompressor.eof:
+                break
+            # a gzip body may be several concatenated members
+            data = self._decompressor.unused_data
+            if data:
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        return b"".join(output)
+
+    def flush(self) -> bytes:
+        return self._decompressor.flush()
+
+
+class _DeflateDecoder:
+    def __init__(self):
+        self._decompressor = zlib.decompressobj()
+        self._pending: Union[bytes, None] = b""
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._pending is None or not data:
+            return self._decompressor.decompress(data)
+        # servers disagree on whether deflate means zlib-wrapped or raw deflate, so both are accepted
+        self._pending += data
+        try:
+            output = self._decompressor.decompress(data)
+        except zlib.error:
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            pending, self._pending = self._pending, None
+            return self._decompressor.decompress(pending)
+        if output:
+            self._pending = None
+        return output
+
+    def flush(self) -> bytes:
+        return self._decompressor.flush()
+
+
+class _BrotliDecoder:
+    def __init__(self, brotli: Any):
+        self._decompressor = brotli.Decompressor()
+        # brotli names it process, brotlicffi decompress
+        self.decompress: Callable[[bytes], bytes] = getattr(self._decompressor, "process", None) or \
+            self._decompressor.decompress
+
+    def flush(self) -> bytes:
+        flush = getattr(self._decompressor, "flush", None)
+        return flush() if flush else b""
+
+
+class _ZstdDecoder:
+    def __init__(self, zstandard: Any):
+        self._zstandard = zstandard
+        self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes) -> bytes:
+        output = []
+        while data:
+            output.append(self._decompressor.decompress(data))
+            # a zstd body may be several concatenated frames
+            data = getattr(self._decompressor, "unused_data", b"") if getattr(self._decompressor, "eof", False) \
+                else b""
+            if data:
+                self._decompressor = self._zstandard.ZstdDecompressor().decompressobj()
+        return b"".join(output)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _ChainDecoder:
+    def __init__(self, decoders: List[Any]):
+        self._decoders: List[Any] = decoders
+
+    def decompress(self, data: bytes) -> bytes:
+        for decoder in self._decoders:
+            data = decoder.decompress(data)
+        return data
+
+    def flush(self) -> bytes:
+        data = b""
+        for decoder in self._decoders:
+            data = (decoder.decompress(data) if data else b"") + decoder.flush()
+        return data
+
+
+def _import_first(*names: str) -> Any:
+    for name in names:
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+def _decoder_factories() -> Dict[str, Callable[[], Any]]:
+    factories: Dict[str, Callable[[], Any]] = {"gzip": _GzipDecoder, "x-gzip": _GzipDecoder, "deflate": _DeflateDecoder}
+    brotli = _import_first("brotli", "brotlicffi")
+    if brotli is not None:
+        factories["br"] = lambda: _BrotliDecoder(brotli)
+    zstandard = _import_first("zstandard")
+    if zstandard is not None:
+        factories["zstd"] = lambda: _ZstdDecoder(zstandard)
+    return factories
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """
+    Get the content encodings that can be decoded with the installed libraries
+
+    :return: Encodings, most preferred first
+    :rtype: tuple
+    """
+    factories = _decoder_factories()
+    return tuple(encoding for encoding in DEFAULT_ENCODINGS if encoding in factories)
+
+
+class EncodingStats:
+    def __init__(self):
+        """
+        Counters of response bytes received on the wire and after decompression
+        """
+        self.responses: int = 0
+        self.compressed_responses: int = 0
+        self.bytes_received: int = 0
+        self.bytes_decoded: int = 0
+        self.encodings: Dict[str, int] = {}
+
+    @property
+    def compression_ratio(self) -> float:
+        """
+        Number of decoded bytes per byte received, 1.0 if nothing was compressed
+        """
+        return self.bytes_decoded / self.bytes_received if self.bytes_received else 1.0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_decoded - self.bytes_received
+
+    def snapshot(self) -> dict:
+        return {
+            "responses": self.responses,
+            "compressed_responses": self.compressed_responses,
+            "bytes_received": self.bytes_received,
+            "bytes_decoded": self.bytes_decoded,
+            "bytes_saved": self.bytes_saved,
+            "compression_ratio": self.compression_ratio,
+            "encodings": dict(self.encodings),
+        }
+
+    def __repr__(self) -> str:
+        return f"EncodingStats({self.snapshot()})"
+
+
+def _buffered_content(response: Any) -> Union[bytes, None]:
+    if getattr(response, "_content_consumed", False):  # requests, read by the transport
+        return response.content
+    content = getattr(response, "_content", None)  # httpx, only set once read
+    return content if isinstance(content, bytes) else None
+
+
+class ContentEncodingPolicy:
+    def __init__(self, encodings: Iterable[str] = DEFAULT_ENCODINGS, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Negotiate compressed responses and decompress them as they are received, counting the bytes saved
+
+        Response bodies are read undecoded from the connection and decompressed chunk by chunk, so the compressed
+        body is never held in full; responses are decoded the same way by the sync and async clients, including
+        encodings the HTTP library cannot decode itself
+
+        :param encodings: Encodings to accept, most preferred first (ones whose library is not installed are skipped)
+        :type encodings: iterable, optional
+        :param chunk_size: Number of bytes to read from the connection at a time
+        :type chunk_size: int, optional
+        :raises ValueError: If an encoding is not supported
+        """
+        factories = _decoder_factories()
+        unknown = [encoding for encoding in encodings if encoding not in DEFAULT_ENCODINGS]
+        if unknown:
+            raise ValueError(f"Unsupported content encodings: {', '.join(unknown)}.")
+        self.encodings: Tuple[str, ...] = tuple(encoding for encoding in encodings if encoding in factories)
+        self.chunk_size: int = chunk_size
+        self.stats: EncodingStats = EncodingStats()
+        self._factories: Dict[str, Callable[[], Any]] = factories
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def accept_encoding(self) -> str:
+        """
+        Value of the Accept-Encoding request header
+        """
+        return ", ".join(self.encodings) or "identity"
+
+    def headers(self, headers: Union[dict, None] = None) -> dict:
+        """
+        Add the Accept-Encoding header to request headers, unless they already have one
+
+        :param headers: Request headers
+        :type headers: dict, optional
+        :return: A copy of the headers with Accept-Encoding
+        :rtype: dict
+        """
+        headers = dict(headers or {})
+        if not any(name.lower() == "accept-encoding" for name in headers):
+            headers["Accept-Encoding"] = self.accept_encoding
+        return headers
+
+    def decoder(self, content_encoding: Union[str, None]) -> Any:
+        """
+        Build an incremental decoder for a Content-Encoding header
+
+        :param content_encoding: Value of the Content-Encoding response header
+        :type content_encoding: str, optional
+        :return: The decoder, or None if the body is not encoded or the encoding cannot be decoded
+        :rtype: object
+        """
+        names = [name.strip().lower() for name in (content_encoding or "").split(",")]
+        names = [name for name in names if name and name != "identity"]
+        if not names or any(name not in self._factories for name in names):
+            return None
+        # encodings are listed in the order they were applied, so they are undone last to first
+        decoders = [self._factories[name]() for name in reversed(names)]
+        return decoders[0] if len(decoders) == 1 else _ChainDecoder(decoders)
+
+    def _record(self, content_encoding: Union[str, None], received: int, decoded: int, compressed: bool) -> None:
+        with self._lock:
+            stats = self.stats
+            stats.responses += 1
+            stats.bytes_received += received
+            stats.bytes_decoded += decoded
+            if compressed:
+                stats.compressed_responses += 1
+                name = content_encoding.strip().lower()
+                stats.encodings[name] = stats.encodings.get(name, 0) + 1
+
+    def _decode(self, decoder: Any, chunk: bytes, counts: List[int]) -> bytes:
+        counts[0] += len(chunk)
+        data = decoder.decompress(chunk) if decoder is not None else chunk
+        counts[1] += len(data)
+        return data
+
+    def _flush(self, decoder: Any, counts: List[int]) -> bytes:
+        data = decoder.flush() if decoder is not None else b""
+        counts[1] += len(data)
+        return data
+
+    def iter_content(self, response: Any, chunk_size: int = None) -> Iterator[bytes]:
+        """
+        Read and decode the body of a response of the sync client, chunk by chunk
+
+        :param response: Response sent with stream=True
+        :type response: requests.Response
+        :param chunk_size: Number of bytes to read from the connection at a time
+        :type chunk_size: int, optional
+        :return: Decoded chunks
+        :rtype: iterator
+        """
+        return self._iter_content(response, chunk_size or self.chunk_size, [0, 0])
+
+    def _iter_content(self, response: Any, chunk_size: int, counts: List[int]) -> Iterator[bytes]:
+        content_encoding = response.headers.get("Content-Encoding")
+        content = _buffered_content(response)
+        if content is not None:
+            # already read (and decoded) by the transport, e.g. when recording or replaying
+            content_encoding, chunks, decoder = None, [content], None
+        else:
+            chunks, decoder = response.raw.stream(chunk_size, decode_content=False), self.decoder(content_encoding)
+        try:
+            for chunk in chunks:
+                data = self._decode(decoder, chunk, counts)
+                if data:
+                    yield data
+            data = self._flush(decoder, counts)
+            if data:
+                yield data
+        finally:
+            # also counts bodies the caller stopped reading part way
+            self._record(content_encoding, counts[0], counts[1], compressed=decoder is not None)
+
+    def aiter_content(self, response: Any, chunk_size: int = None) -> AsyncIterator[bytes]:
+        """
+        Read and decode the body of a response of the async client, chunk by chunk
+
+        :param response: Response sent with stream=True
+        :type response: httpx.Response
+        :param chunk_size: Number of bytes to read from the connection at a time
+        :type chunk_size: int, optional
+        :return: Decoded chunks
+        :rtype: async iterator
+        """
+        return self._aiter_content(response, chunk_size or self.chunk_size, [0, 0])
+
+    async def _aiter_content(self, response: Any, chunk_size: int, counts: List[int]) -> AsyncIterator[bytes]:
+        content_encoding = response.headers.get("Content-Encoding")
+        content = _buffered_content(response)
+        if content is not None:
+            # already read (and decoded) by the transport, e.g. when recording or replaying
+            content_encoding, decoder = None, None
+        else:
+            decoder = self.decoder(content_encoding)
+        try:
+            if content is not None:
+                yield self._decode(None, content, counts)
+            else:
+                async for chunk in response.aiter_raw(chunk_size):
+                    data = self._decode(decoder, chunk, counts)
+                    if data:
+                        yield data
+            data = self._flush(decoder, counts)
+            if data:
+                yield data
+        finally:
+            self._record(content_encoding, counts[0], counts[1], compressed=decoder is not None)
+
+    def read(self, response: Any) -> bytes:
+        """
+        Read and decode the whole body of a response of the sync client, making it its content
+
+        :param response: Response sent with stream=True
+        :type response: requests.Response
+        :return: The decoded body
+        :rtype: bytes
+        """
+        counts = [0, 0]
+        content = b"".join(self._iter_content(response, self.chunk_size, counts))
+        response._content = content
+        response._content_consumed = True
+        response.compressed_size = counts[0]
+        return content
+
+    async def aread(self, response: Any) -> bytes:
+        """
+        Read and decode the whole body of a response of the async client, making it its content
+
+        :param response: Response sent with stream=True
+        :type response: httpx.Response
+        :return: The decoded body
+        :rtype: bytes
+        """
+        counts = [0, 0]
+        chunks = []
+        async for chunk in self._aiter_content(response, self.chunk_size, counts):
+            chunks.append(chunk)
+        content = b"".join(chunks)
+        response._content = content
+        response.compressed_size = counts[0]
+        return content
+
+    def __repr__(self) -> str:
+        return f"ContentEncodingPolicy(encodings={self.encodings!r})"
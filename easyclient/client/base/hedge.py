@@ -0,0 +1,125 @@
+import threading
+from collections import deque
+from typing import Deque, Union
+
+
+class HedgeStats:
+    def __init__(self):
+        """
+        Counters for hedged requests
+        """
+        self.requests: int = 0
+        self.hedges: int = 0
+        self.hedge_wins: int = 0
+        self.budget_denied: int = 0
+
+    @property
+    def hedge_ratio(self) -> float:
+        return self.hedges / self.requests if self.requests else 0.0
+
+    @property
+    def win_ratio(self) -> float:
+        return self.hedge_wins / self.hedges if self.hedges else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "budget_denied": self.budget_denied,
+            "hedge_ratio": self.hedge_ratio,
+            "win_ratio": self.win_ratio,
+        }
+
+    def __repr__(self) -> str:
+        return f"HedgeStats({self.snapshot()})"
+
+
+class HedgePolicy:
+    def __init__(self,
+                 delay: float = None,
+                 percentile: float = 95.0,
+                 initial_delay: float = 0.1,
+                 min_delay: float = 0.005,
+                 max_extra_load: float = 0.1,
+                 window: int = 1000):
+        """
+        Send a duplicate of a GET request that has not answered in time, and use whichever response comes first
+
+        :param delay: Fixed number of seconds to wait before hedging
+            (if None, the percentile of recent latencies is used)
+        :type delay: float, optional
+        :param percentile: Latency percentile to wait for before hedging, when no fixed delay is set
+        :type percentile: float, optional
+        :param initial_delay: Number of seconds to wait before hedging until enough latencies have been recorded
+        :type initial_delay: float, optional
+        :param min_delay: Minimum number of seconds to wait before hedging
+        :type min_delay: float, optional
+        :param max_extra_load: Maximum number of hedges per request, e.g. 0.1 allows 10% extra requests
+        :type max_extra_load: float, optional
+        :param window: Number of recent latencies the percentile is computed over
+        :type window: int, optional
+        """
+        self.delay: Union[float, None] = delay
+        self.percentile: float = percentile
+        self.initial_delay: float = initial_delay
+        self.min_delay: float = min_delay
+        self.max_extra_load: float = max_extra_load
+        self.stats: HedgeStats = HedgeStats()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._estimate: float = initial_delay
+        self._recorded: int = 0
+        # hedges are paid for with tokens earned by requests, with a little burst headroom
+        self._tokens: float = 1.0
+        self._max_tokens: float = max(10 * max_extra_load, 1.0)
+        self._lock: threading.Lock = threading.Lock()
+
+    def hedge_delay(self) -> float:
+        """
+        Get the number of seconds to wait for a response before hedging
+
+        :return: Hedge delay
+        :rtype: float
+        """
+        if self.delay is not None:
+            return max(self.delay, self.min_delay)
+        return max(self._estimate, self.min_delay)
+
+    def record_latency(self, seconds: float) -> None:
+        """
+        Record how long a request took to answer
+
+        :param seconds: Latency of the request
+        :type seconds: float
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+            self._recorded += 1
+            # sorting the window on every request would cost more than it saves, so refresh periodically
+            if self.delay is None and self._recorded % 32 == 0:
+                ordered = sorted(self._latencies)
+                self._estimate = ordered[min(int(len(ordered) * self.percentile / 100), len(ordered) - 1)]
+
+    def start_request(self) -> None:
+        with self._lock:
+            self.stats.requests += 1
+            self._tokens = min(self._tokens + self.max_extra_load, self._max_tokens)
+
+    def try_hedge(self) -> bool:
+        """
+        Take a hedge from the extra load budget
+
+        :return: True if a hedge may be sent, False if the budget is spent
+        :rtype: bool
+        """
+        with self._lock:
+            if self._tokens < 1:
+                self.stats.budget_denied += 1
+                return False
+            self._tokens -= 1
+            self.stats.hedges += 1
+            return True
+
+    def record_win(self) -> None:
+        with self._lock:
+            self.stats.hedge_wins += 1
@@ -0,0 +1,371 @@
+import re
+import threading
+import time
+from fnmatch import fnmatch
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+# each power of two is split into 2 ** _SUB_BUCKET_BITS linear buckets, bounding the relative error to ~3%
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+
+# bucket boundaries (in seconds) of the exported Prometheus histograms
+PROMETHEUS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|"
+                         r"[0-9a-fA-F]{16,})$")
+_MAX_TEMPLATES = 10000
+
+
+class LatencyHistogram:
+    def __init__(self):
+        """
+        An HDR-style histogram of durations, recorded in microseconds into log-linear buckets
+        """
+        self._counts: Dict[int, int] = {}
+        self.count: int = 0
+        self.total: float = 0.0
+        self.min: float = 0.0
+        self.max: float = 0.0
+
+    @staticmethod
+    def _index(micros: int) -> int:
+        if micros < _SUB_BUCKETS:
+            return micros
+        shift = micros.bit_length() - _SUB_BUCKET_BITS - 1
+        return ((shift + 1) << _SUB_BUCKET_BITS) + (micros >> shift) - _SUB_BUCKETS
+
+    @staticmethod
+    def _bounds(index: int) -> Tuple[int, int]:
+        if index < 2 * _SUB_BUCKETS:
+            return index, index
+        shift = (index >> _SUB_BUCKET_BITS) - 1
+        top = (index & (_SUB_BUCKETS - 1)) + _SUB_BUCKETS
+        return top << shift, ((top + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        """
+        Record a duration
+
+        :param seconds: Duration in seconds
+        :type seconds: float
+        """
+        index = self._index(max(int(seconds * 1000000), 0))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        if not self.count or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.count += 1
+        self.total += seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Get a percentile of the recorded durations
+
+        :param percentile: Percentile to get, between 0 and 100
+        :type percentile: float
+        :return: The duration in seconds (within ~3%), or 0 if nothing was recorded
+        :rtype: float
+        """
+        if not self.count:
+            return 0.0
+        rank = max(percentile / 100 * self.count, 1)
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                lower, upper = self._bounds(index)
+                return min(max((lower + upper) / 2 / 1000000, self.min), self.max)
+        return self.max
+
+    def cumulative_counts(self, boundaries: Tuple[float, ...] = PROMETHEUS_BUCKETS) -> List[int]:
+        """
+        Count the durations at or below each boundary
+
+        :param boundaries: Ascending bucket boundaries in seconds
+        :type boundaries: tuple, optional
+        :return: Cumulative count per boundary
+        :rtype: list
+        """
+        counts = [0] * len(boundaries)
+        for index, count in self._counts.items():
+            upper = self._bounds(index)[1] / 1000000
+            for position, boundary in enumerate(boundaries):
+                if upper <= boundary:
+                    counts[position] += count
+        return counts
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+
+
+class EndpointMetrics:
+    def __init__(self):
+        """
+        Aggregated metrics of one method and endpoint template
+        """
+        self.network: LatencyHistogram = LatencyHistogram()
+        self.deserialize: LatencyHistogram = LatencyHistogram()
+        self.statuses: Dict[int, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+        self.bytes_received_compressed: int = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "network": self.network.snapshot(),
+            "deserialize": self.deserialize.snapshot(),
+            "statuses": dict(self.statuses),
+            "errors": dict(self.errors),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "bytes_received_compressed": self.bytes_received_compressed,
+        }
+
+
+class RequestEvent:
+    def __init__(self, method: str, url: str, endpoint: str, template: str, headers: dict):
+        """
+        A request as seen by request hooks
+        Pre-request hooks may modify headers, e.g. to propagate tracing context
+
+        :param method: HTTP method
+        :type method: str
+        :param url: Full URL
+        :type url: str
+        :param endpoint: URL endpoint relative to the base URL
+        :type endpoint: str
+        :param template: Endpoint template the metrics are aggregated under
+        :type template: str
+        :param headers: Request headers
+        :type headers: dict
+        """
+        self.method: str = method
+        self.url: str = url
+        self.endpoint: str = endpoint
+        self.template: str = template
+        self.headers: dict = headers
+        self.started: float = time.perf_counter()
+        self.elapsed: float = 0.0
+        self.status_code: Union[int, None] = None
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+        self.bytes_received_compressed: int = 0
+        self.response: Any = None
+        self.error: Union[BaseException, None] = None
+
+
+def _body_size(response: Any) -> Tuple[int, int, int]:
+    request = getattr(response, "request", None)
+    body = getattr(request, "body", None)  # requests
+    if body is None:
+        try:
+            body = getattr(request, "content", None)  # httpx
+        except Exception:  # streaming request bodies cannot be measured
+            body = None
+    sent = len(body) if isinstance(body, (bytes, str)) else 0
+    content = getattr(response, "_content", None)  # only set once the body has been read (not when streaming)
+    received = len(content) if isinstance(content, bytes) else 0
+    # set when a ContentEncodingPolicy decoded the body, which is otherwise counted decoded
+    received_compressed = getattr(response, "compressed_size", received)
+    return sent, received, received_compressed
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Instrumentation:
+    def __init__(self, endpoint_templates: List[str] = None):
+        """
+        Collect per-endpoint latency histograms, status and byte counters, and call request hooks
+
+        :param endpoint_templates: Glob patterns (e.g. ["/users/*/orders"]) to aggregate matching endpoints under,
+            first match wins; other endpoints have numeric, UUID and long hexadecimal segments replaced with {id}
+        :type endpoint_templates: list, optional
+        """
+        self.endpoint_templates: List[str] = endpoint_templates or []
+        self.pre_request_hooks: List[Callable[[RequestEvent], None]] = []
+        self.post_request_hooks: List[Callable[[RequestEvent], None]] = []
+        self._metrics: Dict[Tuple[str, str], EndpointMetrics] = {}
+        self._templates: Dict[str, str] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def add_pre_request_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        """
+        Call a function before every request is sent
+
+        :param hook: Function receiving the RequestEvent
+        :type hook: callable
+        """
+        self.pre_request_hooks.append(hook)
+
+    def add_post_request_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        """
+        Call a function after every request is answered or fails
+
+        :param hook: Function receiving the RequestEvent
+        :type hook: callable
+        """
+        self.post_request_hooks.append(hook)
+
+    def template(self, endpoint: str) -> str:
+        """
+        Get the template an endpoint is aggregated under
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :return: Endpoint template
+        :rtype: str
+        """
+        template = self._templates.get(endpoint)
+        if template is not None:
+            return template
+        path = f"/{endpoint.split('?', 1)[0].lstrip('/')}"
+        template = next((pattern for pattern in self.endpoint_templates if fnmatch(path, pattern)), None)
+        if template is None:
+            template = "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+        if len(self._templates) < _MAX_TEMPLATES:
+            self._templates[endpoint] = template
+        return template
+
+    def _endpoint_metrics(self, method: str, template: str) -> EndpointMetrics:
+        key = (method.upper(), template)
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            with self._lock:
+                metrics = self._metrics.setdefault(key, EndpointMetrics())
+        return metrics
+
+    def start(self, method: str, url: str, endpoint: str, headers: Union[dict, None]) -> RequestEvent:
+        """
+        Record the start of a request and call the pre-request hooks
+
+        :return: The request event
+        :rtype: RequestEvent
+        """
+        event = RequestEvent(method=method.upper(), url=url, endpoint=endpoint, template=self.template(endpoint),
+                             headers=dict(headers or {}))
+        for hook in self.pre_request_hooks:
+            hook(event)
+        event.started = time.perf_counter()
+        return event
+
+    def finish(self, event: RequestEvent, response: Any = None, error: BaseException = None) -> None:
+        """
+        Record the end of a request and call the post-request hooks
+
+        :param event: The event returned by start()
+        :type event: RequestEvent
+        :param response: The response, if one was received
+        :type response: object, optional
+        :param error: The exception raised by the request, if any
+        :type error: BaseException, optional
+        """
+        event.elapsed = time.perf_counter() - event.started
+        event.response = response
+        event.error = error
+        metrics = self._endpoint_metrics(event.method, event.template)
+        with self._lock:
+            metrics.network.record(event.elapsed)
+            if response is not None:
+                event.status_code = response.status_code
+                event.bytes_sent, event.bytes_received, event.bytes_received_compressed = _body_size(response)
+                metrics.statuses[event.status_code] = metrics.statuses.get(event.status_code, 0) + 1
+                metrics.bytes_sent += event.bytes_sent
+                metrics.bytes_received += event.bytes_received
+                metrics.bytes_received_compressed += event.bytes_received_compressed
+            if error is not None:
+                name = error.__class__.__name__
+                metrics.errors[name] = metrics.errors.get(name, 0) + 1
+        for hook in self.post_request_hooks:
+            hook(event)
+
+    def record_deserialize(self, method: str, endpoint: str, seconds: float) -> None:
+        """
+        Record the time spent parsing a response body
+
+        :param method: HTTP method of the request
+        :type method: str
+        :param endpoint: URL endpoint of the request
+        :type endpoint: str
+        :param seconds: Time spent parsing
+        :type seconds: float
+        """
+        metrics = self._endpoint_metrics(method, self.template(endpoint))
+        with self._lock:
+            metrics.deserialize.record(seconds)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Get the metrics of every endpoint
+
+        :return: Metrics keyed by "METHOD template"
+        :rtype: dict
+        """
+        with self._lock:
+            return {f"{method} {template}": metrics.snapshot()
+                    for (method, template), metrics in sorted(self._metrics.items())}
+
+    def to_prometheus(self, prefix: str = "easyclient") -> str:
+        """
+        Export the metrics in the Prometheus text exposition format
+
+        :param prefix: Prefix of the metric names
+        :type prefix: str, optional
+        :return: Metrics in Prometheus text format
+        :rtype: str
+        """
+        histograms = {"request_duration_seconds": "network", "deserialize_duration_seconds": "deserialize"}
+        lines = []
+        with self._lock:
+            items = sorted(self._metrics.items())
+            for name, attribute in histograms.items():
+                lines.append(f"# TYPE {prefix}_{name} histogram")
+                for (method, template), metrics in items:
+                    histogram: LatencyHistogram = getattr(metrics, attribute)
+                    if not histogram.count:
+                        continue
+                    labels = f'method="{method}",endpoint="{_escape_label(template)}"'
+                    for boundary, count in zip(PROMETHEUS_BUCKETS, histogram.cumulative_counts()):
+                        lines.append(f'{prefix}_{name}_bucket{{{labels},le="{boundary}"}} {count}')
+                    lines.append(f'{prefix}_{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{prefix}_{name}_sum{{{labels}}} {histogram.total}")
+                    lines.append(f"{prefix}_{name}_count{{{labels}}} {histogram.count}")
+            lines.append(f"# TYPE {prefix}_responses_total counter")
+            for (method, template), metrics in items:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(f'{prefix}_responses_total{{method="{method}",endpoint="{_escape_label(template)}",'
+                                 f'status="{status}"}} {count}')
+            lines.append(f"# TYPE {prefix}_request_errors_total counter")
+            for (method, template), metrics in items:
+                for error, count in sorted(metrics.errors.items()):
+                    lines.append(f'{prefix}_request_errors_total{{method="{method}",'
+                                 f'endpoint="{_escape_label(template)}",error="{error}"}} {count}')
+            for name in ("bytes_sent", "bytes_received", "bytes_received_compressed"):
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                for (method, template), metrics in items:
+                    lines.append(f'{prefix}_{name}_total{{method="{method}",endpoint="{_escape_label(template)}"}} '
+                                 f'{getattr(metrics, name)}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """
+        Discard all recorded metrics
+        """
+        with self._lock:
+            self._metrics.clear()
@@ -0,0 +1,195 @@
+import dataclasses
+import threading
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+
+_UNBUILT = object()
+
+
+def _identity(item: Any) -> Any:
+    return item
+
+
+class ModelAdapter:
+    def __init__(self, model: Union[type, None], trusted: bool = False):
+        """
+        Build instances of a model from JSON items, with the construction strategy worked out once per model
+
+        Pydantic 2 models are validated by pydantic-core (a whole list in one call), Pydantic 1 models are parsed,
+        dataclasses and plain classes are called with the item's keys as keyword arguments
+        In trusted mode Pydantic 1 models are constructed without validation (nested models stay dicts); Pydantic 2
+        validation is already faster than constructing without it, so trusted mode leaves it unchanged
+
+        :param model: Model to build, or None to return JSON items unchanged
+        :type model: type, optional
+        :param trusted: Whether to skip validation, for data from APIs whose responses are known to match the model
+        :type trusted: bool, optional
+        """
+        self.model: Union[type, None] = model
+        self.trusted: bool = trusted
+        self._constructor: Union[Callable[..., Any], None] = None
+        self._validate_list: Union[Callable[[List[Any]], List[Any]], None] = None
+        self.build: Callable[[Any], Any]
+        if model is None:
+            self.kind: str = "json"
+            self.build = _identity
+        elif hasattr(model, "model_validate") and hasattr(model, "model_construct"):
+            self.kind = "pydantic"
+            self.build = model.model_validate
+            self._validate_list = _pydantic_list_validator(model)
+        elif hasattr(model, "parse_obj") and hasattr(model, "__fields__"):
+            self.kind = "pydantic"
+            if trusted:
+                self._use_constructor(model.construct)
+            else:
+                self.build = model.parse_obj
+        else:
+            self.kind = "dataclass" if dataclasses.is_dataclass(model) else "class"
+            self._use_constructor(model)
+
+    def _use_constructor(self, constructor: Callable[..., Any]) -> None:
+        self._constructor = constructor
+        self.build = lambda item: constructor(**item)
+
+    def build_list(self, items: List[Any]) -> List[Any]:
+        """
+        Build a model instance from every item of a list
+
+        :param items: JSON items
+        :type items: list
+        :return: Model instances
+        :rtype: list
+        """
+        if self.model is None:
+            return items
+        if self._validate_list is not None:
+            return self._validate_list(items)
+        if self._constructor is not None:
+            constructor = self._constructor
+            return [constructor(**item) for item in items]
+        build = self.build
+        return [build(item) for item in items]
+
+    def __repr__(self) -> str:
+        return f"ModelAdapter(model={self.model!r}, kind={self.kind!r}, trusted={self.trusted!r})"
+
+
+def _pydantic_list_validator(model: type) -> Union[Callable[[List[Any]], List[Any]], None]:
+    try:
+        from pydantic import TypeAdapter
+    except ImportError:
+        return None
+    # validating the whole list in one call keeps the per-item loop inside pydantic-core
+    return TypeAdapter(List[model]).validate_python
+
+
+_adapters: Dict[Tuple[Union[type, None], bool], ModelAdapter] = {}
+_adapters_lock: threading.Lock = threading.Lock()
+
+
+def model_adapter(model: Union[type, None], trusted: bool = False) -> ModelAdapter:
+    """
+    Get the cached adapter of a model, building it on first use
+
+    :param model: Model to build, or None to return JSON items unchanged
+    :type model: type, optional
+    :param trusted: Whether to skip validation
+    :type trusted: bool, optional
+    :return: The model adapter
+    :rtype: ModelAdapter
+    """
+    key = (model, trusted)
+    adapter = _adapters.get(key)
+    if adapter is None:
+        with _adapters_lock:
+            adapter = _adapters.get(key)
+            if adapter is None:
+                adapter = _adapters[key] = ModelAdapter(model, trusted=trusted)
+    return adapter
+
+
+class LazyModelList(Sequence):
+    def __init__(self, items: List[Any], model: Union[type, None], trusted: bool = False):
+        """
+        A read-only list of models over decoded JSON items, building each model the first time it is accessed
+        Built models are kept, so accessing an item again returns the same instance, and slices share them
+        Items that do not match the model raise when they are accessed rather than when the response is parsed
+
+        :param items: JSON items
+        :type items: list
+        :param model: Model to build, or None to return JSON items unchanged
+        :type model: type, optional
+        :param trusted: Whether to skip validation
+        :type trusted: bool, optional
+        """
+        self._items: List[Any] = items
+        self._model: Union[type, None] = model
+        self._trusted: bool = trusted
+        self._build: Callable[[Any], Any] = model_adapter(model, trusted=trusted).build
+        self._built: List[Any] = [_UNBUILT] * len(items)
+        self._positions: range = range(len(items))
+
+    def _get(self, position: int) -> Any:
+        value = self._built[position]
+        if value is _UNBUILT:
+            value = self._built[position] = self._build(self._items[position])
+        return value
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            view = LazyModelList.__new__(LazyModelList)
+            view.__dict__.update(self.__dict__)
+            view._positions = self._positions[index]
+            return view
+        try:
+            position = self._positions[index]
+        except IndexError:
+            raise IndexError("LazyModelList index out of range") from None
+        return self._get(position)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __iter__(self) -> Iterator[Any]:
+        for position in self._positions:
+            yield self._get(position)
+
+    def raw(self, index: int) -> Any:
+        """
+        Get the JSON item at an index without building its model
+
+        :param index: Index of the item
+        :type index: int
+        :return: The JSON item
+        :rtype: object
+        """
+        return self._items[self._positions[index]]
+
+    @property
+    def built(self) -> int:
+        """
+        Number of items whose model has been built
+        """
+        return sum(1 for position in self._positions if self._built[position] is not _UNBUILT)
+
+    def materialize(self) -> List[Any]:
+        """
+        Build every remaining model
+
+        :return: The models, as a plain list
+        :rtype: list
+        """
+        return list(self)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, tuple, LazyModelList)):
+            return len(self) == len(other) and all(mine == theirs for mine, theirs in zip(self, other))
+        return NotImplemented
+
+    def __reduce__(self) -> tuple:
+        # the model adapter is rebuilt from the cache on unpickling, unbuilt items stay unbuilt
+        return LazyModelList, ([self._items[position] for position in self._positions], self._model, self._trusted)
+
+    def __repr__(self) -> str:
+        name = getattr(self._model, "__name__", None)
+        return f"LazyModelList(model={name}, items={len(self)}, built={self.built})"
@@ -0,0 +1,227 @@
+from typing import Any, List, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from objectrest import (
+    Response,
+    AsyncResponse,
+)
+
+from easyclient.client.base.codec import JsonCodec
+from easyclient.client.base.parsing import (
+    dig,
+    parse_json,
+)
+
+
+class PageRequest:
+    def __init__(self, endpoint: str, params: Union[dict, List[Tuple[str, str]]] = None):
+        """
+        The endpoint and parameters used to fetch a single page
+
+        :param endpoint: URL endpoint (or absolute URL under the client's base URL)
+        :type endpoint: str
+        :param params: Dictionary of parameters to add to url, or a list of (name, value) pairs if names repeat
+        :type params: dict or list, optional
+        """
+        self.endpoint: str = endpoint
+        self.params: Union[dict, List[Tuple[str, str]]] = params if params is not None else {}
+
+    def __repr__(self) -> str:
+        return f"PageRequest(endpoint={self.endpoint!r}, params={self.params!r})"
+
+
+class Page:
+    def __init__(self,
+                 request: PageRequest,
+                 response: Union[Response, AsyncResponse],
+                 sub_keys: List = None,
+                 codec: JsonCodec = None):
+        """
+        A single fetched page
+
+        :param request: The request that fetched this page
+        :type request: PageRequest
+        :param response: The response for this page
+        :type response: Response or AsyncResponse
+        :param sub_keys: A list of sub-keys to search for (in order) to find the list of items
+        :type sub_keys: list, optional
+        :param codec: JSON codec to decode the response body with
+        :type codec: JsonCodec, optional
+        """
+        self.request: PageRequest = request
+        self.response: Union[Response, AsyncResponse] = response
+        self.json_data: Any = parse_json(response, codec=codec)
+        items = dig(self.json_data, sub_keys)
+        self.items: list = items if isinstance(items, list) else []
+
+
+class PaginationStrategy:
+    def first_request(self, endpoint: str, params: dict = None) -> PageRequest:
+        """
+        Build the request for the first page
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param params: Dictionary of parameters to add to url
+        :type params: dict, optional
+        :return: Request for the first page
+        :rtype: PageRequest
+        """
+        return PageRequest(endpoint=endpoint, params=dict(params or {}))
+
+    def next_request(self, page: Page) -> Union[PageRequest, None]:
+        """
+        Build the request for the page following the given one
+
+        :param page: The most recently fetched page
+        :type page: Page
+        :return: Request for the next page, or None if there are no more pages
+        :rtype: PageRequest
+        """
+        raise NotImplementedError
+
+
+class OffsetPagination(PaginationStrategy):
+    def __init__(self, limit: int = 100, offset_param: str = "offset", limit_param: str = "limit", start: int = 0):
+        """
+        Paginate with offset/limit parameters, stopping on a short or empty page
+
+        :param limit: Number of items to request per page
+        :type limit: int, optional
+        :param offset_param: Name of the offset parameter
+        :type offset_param: str, optional
+        :param limit_param: Name of the limit parameter
+        :type limit_param: str, optional
+        :param start: Offset of the first page
+        :type start: int, optional
+        """
+        self.limit: int = limit
+        self.offset_param: str = offset_param
+        self.limit_param: str = limit_param
+        self.start: int = start
+
+    def first_request(self, endpoint: str, params: dict = None) -> PageRequest:
+        request = super().first_request(endpoint=endpoint, params=params)
+        request.params.setdefault(self.offset_param, self.start)
+        request.params[self.limit_param] = self.limit
+        return request
+
+    def next_request(self, page: Page) -> Union[PageRequest, None]:
+        if len(page.items) < self.limit:
+            return None
+        params = dict(page.request.params)
+        params[self.offset_param] = int(params[self.offset_param]) + len(page.items)
+        return PageRequest(endpoint=page.request.endpoint, params=params)
+
+
+class PageNumberPagination(PaginationStrategy):
+    def __init__(self, page_param: str = "page", page_size: int = None, size_param: str = "per_page", start: int = 1):
+        """
+        Paginate with a page number parameter, stopping on an empty (or short, if page_size is set) page
+
+        :param page_param: Name of the page number parameter
+        :type page_param: str, optional
+        :param page_size: Number of items to request per page (not sent if None)
+        :type page_size: int, optional
+        :param size_param: Name of the page size parameter
+        :type size_param: str, optional
+        :param start: Number of the first page
+        :type start: int, optional
+        """
+        self.page_param: str = page_param
+        self.page_size: Union[int, None] = page_size
+        self.size_param: str = size_param
+        self.start: int = start
+
+    def first_request(self, endpoint: str, params: dict = None) -> PageRequest:
+        request = super().first_request(endpoint=endpoint, params=params)
+        request.params.setdefault(self.page_param, self.start)
+        if self.page_size:
+            request.params[self.size_param] = self.page_size
+        return request
+
+    def next_request(self, page: Page) -> Union[PageRequest, None]:
+        if not page.items or (self.page_size and len(page.items) < self.page_size):
+            return None
+        params = dict(page.request.params)
+        params[self.page_param] = int(params[self.page_param]) + 1
+        return PageRequest(endpoint=page.request.endpoint, params=params)
+
+
+class CursorPagination(PaginationStrategy):
+    def __init__(self, cursor_keys: List, cursor_param: str = "cursor"):
+        """
+        Paginate with a cursor found in the response body, stopping when the cursor is missing or empty
+
+        :param cursor_keys: A list of sub-keys to search for (in order) to find the next cursor in the response JSON
+        :type cursor_keys: list
+        :param cursor_param: Name of the parameter the cursor is sent as
+        :type cursor_param: str, optional
+        """
+        self.cursor_keys: List = cursor_keys
+        self.cursor_param: str = cursor_param
+
+    def next_request(self, page: Page) -> Union[PageRequest, None]:
+        cursor = dig(page.json_data, self.cursor_keys)
+        if not page.items or not cursor or isinstance(cursor, (dict, list)):
+            return None
+        params = dict(page.request.params)
+        params[self.cursor_param] = cursor
+        return PageRequest(endpoint=page.request.endpoint, params=params)
+
+
+class LinkHeaderPagination(PaginationStrategy):
+    def __init__(self, rel: str = "next"):
+        """
+        Paginate by following RFC 5988 Link headers
+
+        :param rel: Relation type of the link to follow
+        :type rel: str, optional
+        """
+        self.rel: str = rel
+
+    def next_request(self, page: Page) -> Union[PageRequest, None]:
+        link = page.response.links.get(self.rel)
+        if not page.items or not link or not link.get("url"):
+            return None
+        # links may be relative to the page they were found on
+        url = urlsplit(urljoin(str(page.response.url), link["url"]))
+        return PageRequest(endpoint=urlunsplit((url.scheme, url.netloc, url.path, "", "")),
+                           params=parse_qsl(url.query, keep_blank_values=True))
+
+
+def relative_endpoint(base_url: str, endpoint: str) -> str:
+    """
+    Convert an absolute URL under the base URL into an endpoint relative to it
+
+    :param base_url: Base URL of the client
+    :type base_url: str
+    :param endpoint: URL endpoint or absolute URL
+    :type endpoint: str
+    :return: URL endpoint relative to the base URL
+    :rtype: str
+    """
+    if not urlsplit(endpoint).scheme:
+        return endpoint
+    base = base_url.rstrip("/")
+    if endpoint != base and not endpoint.startswith(f"{base}/"):
+        raise ValueError(f"Next page {endpoint} is not under base URL {base_url}")
+    return endpoint[len(base):]
+
+
+def page_target(base_url: str, request: PageRequest) -> Tuple[str, Union[dict, None]]:
+    """
+    Get the endpoint and parameters to fetch a page with
+
+    :param base_url: Base URL of the client
+    :type base_url: str
+    :param request: Request for the page
+    :type request: PageRequest
+    :return: URL endpoint relative to the base URL, and the dictionary of parameters to add to it
+    :rtype: tuple
+    """
+    endpoint = relative_endpoint(base_url, request.endpoint)
+    if isinstance(request.params, dict):
+        return endpoint, request.params
+    # parameters are merged into a dictionary before they are sent, so repeated names are kept in the endpoint
+    return (f"{endpoint}?{urlencode(request.params)}" if request.params else endpoint), None
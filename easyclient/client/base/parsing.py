@@ -0,0 +1,102 @@
+from typing import Any, List, Union
+
+from objectrest import (
+    Response,
+    AsyncResponse,
+)
+
+from easyclient.client.base.codec import JsonCodec
+from easyclient.client.base.models import (
+    LazyModelList,
+    model_adapter,
+)
+
+_default_codec: JsonCodec = JsonCodec()
+
+
+def parse_json(response: Union[Response, AsyncResponse, None], codec: JsonCodec = None) -> Any:
+    """
+    Parse the JSON data from a response, mirroring objectrest's behavior
+
+    :param response: The response from the request
+    :type response: Response or AsyncResponse
+    :param codec: JSON codec to decode the response body with (defaults to the standard library)
+    :type codec: JsonCodec, optional
+    :return: JSON data, or an empty dict if the request failed or the body is not JSON
+    :rtype: object
+    """
+    if not response:  # utilize the truthiness of request.Response
+        return {}
+    try:
+        return (codec or _default_codec).loads(response.content)
+    except Exception:
+        return {}
+
+
+def dig(json_data: Any, sub_keys: List = None) -> Any:
+    """
+    Follow a list of sub-keys (in order) into JSON data
+
+    :param json_data: JSON data to search
+    :type json_data: object
+    :param sub_keys: A list of sub-keys to search for (in order)
+    :type sub_keys: list, optional
+    :return: The JSON data found at the end of the sub-keys, or an empty dict if any key is missing
+    :rtype: object
+    """
+    for key in sub_keys or []:
+        if not isinstance(json_data, dict):
+            return {}
+        json_data = json_data.get(key, {})
+    return json_data
+
+
+def build_model(model: Union[type, None], item: Any, trusted: bool = False) -> Any:
+    """
+    Build a model instance from a single JSON item
+
+    :param model: Model to build, or None to return the JSON item unchanged
+    :type model: type, optional
+    :param item: JSON item
+    :type item: object
+    :param trusted: Whether to build the model without validating the item
+    :type trusted: bool, optional
+    :return: A model instance
+    :rtype: object
+    """
+    return model_adapter(model, trusted=trusted).build(item)
+
+
+def create_object(json_data: Any, model: type, sub_keys: List = None, extract_list: bool = False,
+                  trusted: bool = False, lazy: bool = False) -> Any:
+    """
+    Parse JSON data into a model (or list of models), mirroring objectrest's behavior
+
+    :param json_data: JSON data to parse
+    :type json_data: object
+    :param model: a Pydantic model to generate from the JSON data
+    :type model: type
+    :param sub_keys: A list of sub-keys to search for (in order) to find JSON data for model.
+    :type sub_keys: list, optional
+    :param extract_list: If top-level of JSON is a list, whether to convert each list item into model
+        or treat entire JSON as a whole object
+    :type extract_list: bool, optional
+    :param trusted: Whether to build the model without validating the JSON data
+    :type trusted: bool, optional
+    :param lazy: Whether to return a list of models as a LazyModelList, building each model when it is accessed
+    :type lazy: bool, optional
+    :return: An object, a list of objects, or None if the data could not be parsed
+    :rtype: object
+    """
+    json_data = dig(json_data, sub_keys)
+    if not json_data:
+        return None
+    adapter = model_adapter(model, trusted=trusted)
+    try:
+        if isinstance(json_data, list) and extract_list:
+            if lazy:
+                return LazyModelList(json_data, model=model, trusted=trusted)
+            return adapter.build_list(json_data)
+        return adapter.build(json_data)
+    except Exception:
+        return None
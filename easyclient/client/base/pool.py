@@ -0,0 +1,72 @@
+from typing import Union
+
+import httpx
+from requests.adapters import HTTPAdapter
+
+
+class ConnectionPoolConfig:
+    def __init__(self,
+                 max_connections: int = 100,
+                 max_connections_per_host: int = 10,
+                 max_keepalive_connections: int = 20,
+                 keepalive_timeout: Union[float, None] = 5.0,
+                 block: bool = False,
+                 max_concurrent_streams: int = 100):
+        """
+        Connection pool settings shared by the synchronous and asynchronous clients
+
+        :param max_connections: Maximum number of open connections across all hosts
+        :type max_connections: int, optional
+        :param max_connections_per_host: Maximum number of open connections to a single host
+        :type max_connections_per_host: int, optional
+        :param max_keepalive_connections: Maximum number of idle connections kept open for reuse
+        :type max_keepalive_connections: int, optional
+        :param keepalive_timeout: Seconds an idle connection is kept open before it is evicted (None to never evict)
+        :type keepalive_timeout: float, optional
+        :param block: Whether to wait for a free connection when the pool is exhausted,
+            instead of opening a throwaway one
+        :type block: bool, optional
+        :param max_concurrent_streams: Maximum number of requests multiplexed over one HTTP/2 connection at a time
+            (should not exceed the server's own limit, usually 100 or more)
+        :type max_concurrent_streams: int, optional
+        """
+        if max_connections < 1 or max_connections_per_host < 1 or max_concurrent_streams < 1:
+            raise ValueError("Connection limits must be at least 1.")
+        self.max_connections: int = max_connections
+        self.max_connections_per_host: int = min(max_connections_per_host, max_connections)
+        self.max_keepalive_connections: int = min(max_keepalive_connections, max_connections)
+        self.keepalive_timeout: Union[float, None] = keepalive_timeout
+        self.block: bool = block
+        self.max_concurrent_streams: int = max_concurrent_streams
+
+    @property
+    def host_pools(self) -> int:
+        """
+        Number of per-host pools that fit inside the overall connection limit
+
+        :return: Number of host pools to keep
+        :rtype: int
+        """
+        return max(1, self.max_connections // self.max_connections_per_host)
+
+    def build_adapter(self) -> HTTPAdapter:
+        """
+        Build a Requests transport adapter honoring these settings
+
+        :return: A pooled HTTP adapter
+        :rtype: HTTPAdapter
+        """
+        return HTTPAdapter(pool_connections=self.host_pools,
+                           pool_maxsize=self.max_connections_per_host,
+                           pool_block=self.block)
+
+    def build_limits(self) -> httpx.Limits:
+        """
+        Build HTTPX connection limits honoring these settings
+
+        :return: HTTPX connection limits
+        :rtype: httpx.Limits
+        """
+        return httpx.Limits(max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_keepalive_connections,
+                            keepalive_expiry=self.keepalive_timeout)
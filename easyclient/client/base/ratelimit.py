@@ -0,0 +1,264 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from fnmatch import fnmatch
+from typing import Deque, Dict, List, Mapping, Union
+
+# X-RateLimit-Reset values above this are epoch timestamps rather than seconds from now
+_EPOCH_THRESHOLD = 10 ** 9
+
+
+def _header_float(headers: Mapping[str, str], *names: str) -> Union[float, None]:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def parse_retry_after(value: Union[str, None]) -> Union[float, None]:
+    """
+    Parse a Retry-After header
+
+    :param value: Header value, either a number of seconds or an HTTP date
+    :type value: str, optional
+    :return: Number of seconds to wait, or None if the header is missing or invalid
+    :rtype: float
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class RateLimit:
+    def __init__(self):
+        """
+        A limit on how often requests may be sent
+        """
+        self._lock: threading.Lock = threading.Lock()
+        self._paused_until: float = 0.0
+
+    def reserve(self, now: float = None) -> float:
+        """
+        Reserve a slot for one request
+
+        :param now: Current time.monotonic() value
+        :type now: float, optional
+        :return: Number of seconds to wait before sending the request
+        :rtype: float
+        """
+        raise NotImplementedError
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out slots for a number of seconds, e.g. after the server reported the quota is exhausted
+
+        :param seconds: Number of seconds to pause for
+        :type seconds: float
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def observe(self, remaining: float, reset: Union[float, None]) -> None:
+        """
+        Adjust the limit to the remaining quota reported by the server
+
+        :param remaining: Number of requests left in the current window
+        :type remaining: float
+        :param reset: Number of seconds until the window resets, if known
+        :type reset: float, optional
+        """
+        if remaining <= 0 and reset:
+            self.pause(reset)
+
+
+class TokenBucket(RateLimit):
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Allow a steady rate of requests with bursts of up to capacity requests
+
+        :param rate: Number of requests allowed per second
+        :type rate: float
+        :param capacity: Maximum burst size (defaults to one second's worth of requests)
+        :type capacity: float, optional
+        """
+        super().__init__()
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate: float = rate
+        self.capacity: float = max(capacity if capacity is not None else rate, 1)
+        self._tokens: float = self.capacity
+        self._updated: float = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, now: float = None) -> float:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._refill(now)
+            # tokens may go negative: callers queue up behind each other instead of racing for the next token
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def observe(self, remaining: float, reset: Union[float, None]) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, remaining)
+        super().observe(remaining=remaining, reset=reset)
+
+    def __repr__(self) -> str:
+        return f"TokenBucket(rate={self.rate!r}, capacity={self.capacity!r})"
+
+
+class SlidingWindow(RateLimit):
+    def __init__(self, limit: int, window: float = 1.0):
+        """
+        Allow at most limit requests in any window of the given length
+
+        :param limit: Number of requests allowed per window
+        :type limit: int
+        :param window: Length of the window in seconds
+        :type window: float, optional
+        """
+        super().__init__()
+        if limit < 1 or window <= 0:
+            raise ValueError("limit and window must be positive")
+        self.limit: int = limit
+        self.window: float = window
+        self._sent: Deque[float] = deque()
+
+    def reserve(self, now: float = None) -> float:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._sent and self._sent[0] <= now - self.window:
+                self._sent.popleft()
+            slot = max(now, self._paused_until)
+            if len(self._sent) >= self.limit:
+                slot = max(slot, self._sent[-self.limit] + self.window)
+            if self._sent:
+                slot = max(slot, self._sent[-1])
+            self._sent.append(slot)
+            return slot - now
+
+    def __repr__(self) -> str:
+        return f"SlidingWindow(limit={self.limit!r}, window={self.window!r})"
+
+
+class RateLimiter:
+    def __init__(self,
+                 limit: RateLimit = None,
+                 endpoint_limits: Dict[str, RateLimit] = None,
+                 respect_headers: bool = True):
+        """
+        Throttle requests on the client side so they stay within the API's quota
+        Share one instance between clients (e.g. through their ApiAuthKey) to share the quota
+
+        :param limit: Limit applied to every request
+        :type limit: RateLimit, optional
+        :param endpoint_limits: Additional per-endpoint limits, keyed by glob pattern
+            (e.g. {"/search*": TokenBucket(1)}), first match wins
+        :type endpoint_limits: dict, optional
+        :param respect_headers: Whether to adjust to X-RateLimit-* and Retry-After response headers
+        :type respect_headers: bool, optional
+        """
+        self.limit: Union[RateLimit, None] = limit
+        self.endpoint_limits: Dict[str, RateLimit] = endpoint_limits or {}
+        self.respect_headers: bool = respect_headers
+        self.waits: int = 0
+        self.waited: float = 0.0
+        self.throttled: int = 0
+
+    def limits_for(self, endpoint: str) -> List[RateLimit]:
+        """
+        Get the limits applying to an endpoint
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :return: The first matching endpoint limit (if any) and the client-wide limit (if any)
+        :rtype: list
+        """
+        limits = []
+        endpoint = f"/{endpoint.lstrip('/')}"
+        for pattern, limit in self.endpoint_limits.items():
+            if fnmatch(endpoint, pattern):
+                limits.append(limit)
+                break
+        if self.limit is not None:
+            limits.append(self.limit)
+        return limits
+
+    def _reserve(self, endpoint: str) -> float:
+        now = time.monotonic()
+        wait = max([limit.reserve(now) for limit in self.limits_for(endpoint)] or [0.0])
+        if wait > 0:
+            self.waits += 1
+            self.waited += wait
+        return wait
+
+    def acquire(self, endpoint: str) -> None:
+        """
+        Block until a request to the endpoint may be sent
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        """
+        wait = self._reserve(endpoint)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def async_acquire(self, endpoint: str) -> None:
+        """
+        Wait, without blocking the event loop, until a request to the endpoint may be sent
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        """
+        wait = self._reserve(endpoint)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update(self, endpoint: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Adjust the limits of an endpoint to the rate limit headers of its response
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param status_code: Status code of the response
+        :type status_code: int
+        :param headers: Response headers
+        :type headers: mapping
+        """
+        if status_code == 429:
+            self.throttled += 1
+        if not self.respect_headers:
+            return
+        limits = self.limits_for(endpoint)
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None and status_code in (429, 503):
+            for limit in limits:
+                limit.pause(retry_after)
+            return
+        remaining = _header_float(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        if remaining is None:
+            return
+        reset = _header_float(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+        if reset is not None and reset > _EPOCH_THRESHOLD:
+            reset = max(reset - time.time(), 0.0)
+        for limit in limits:
+            limit.observe(remaining=remaining, reset=reset)
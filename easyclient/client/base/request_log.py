@@ -0,0 +1,215 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import re
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Iterable, Mapping, Union
+
+REDACTED = "[REDACTED]"
+
+SECRET_PARAMS = ("key", "api_key", "apikey", "token", "access_token", "client_secret", "password")
+SECRET_HEADERS = ("Authorization", "Proxy-Authorization", "Cookie", "Set-Cookie", "X-Api-Key")
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a request log record as a single JSON object
+
+        :param record: Log record
+        :type record: logging.LogRecord
+        :return: JSON line
+        :rtype: str
+        """
+        data = {"time": self.formatTime(record), "level": record.levelname, "logger": record.name}
+        data.update(getattr(record, "request", None) or {"message": record.getMessage()})
+        return json.dumps(data, default=str)
+
+
+class LoggingPolicy:
+    def __init__(self,
+                 sample_rate: float = 1.0,
+                 slow_threshold_ms: float = None,
+                 errors_only: bool = False,
+                 redact_params: Iterable[str] = SECRET_PARAMS,
+                 redact_headers: Iterable[str] = SECRET_HEADERS,
+                 include_headers: bool = False,
+                 json_format: bool = True,
+                 handler: logging.Handler = None,
+                 logger_name: str = "easyclient.requests",
+                 asynchronous: bool = True):
+        """
+        Decide which requests to log and how, keeping logging off the request path
+
+        Failed requests (exceptions and 4xx/5xx responses) are always logged, other requests are logged if they are
+        slower than slow_threshold_ms (when set) or otherwise picked by the sample rate
+
+        :param sample_rate: Fraction of successful requests to log, between 0 and 1
+        :type sample_rate: float, optional
+        :param slow_threshold_ms: Only log successful requests taking at least this many milliseconds
+        :type slow_threshold_ms: float, optional
+        :param errors_only: Only log failed requests
+        :type errors_only: bool, optional
+        :param redact_params: Names of URL parameters whose values are redacted (case-insensitive)
+        :type redact_params: iterable, optional
+        :param redact_headers: Names of headers whose values are redacted (case-insensitive)
+        :type redact_headers: iterable, optional
+        :param include_headers: Whether to log request headers
+        :type include_headers: bool, optional
+        :param json_format: Whether to write structured JSON lines instead of plain text
+        :type json_format: bool, optional
+        :param handler: Where to write log lines (defaults to stderr), only this policy's requests are written to it
+        :type handler: logging.Handler, optional
+        :param logger_name: Name of the logger requests are logged with, whose level and propagation are left to the
+            application (its level is set to INFO only if it has none)
+        :type logger_name: str, optional
+        :param asynchronous: Whether to format and write log lines on a background thread through a queue
+        :type asynchronous: bool, optional
+        """
+        self.sample_rate: float = sample_rate
+        self.slow_threshold: Union[float, None] = slow_threshold_ms / 1000 if slow_threshold_ms is not None else None
+        self.errors_only: bool = errors_only
+        self.redact_params: set = {name.lower() for name in redact_params}
+        self.redact_headers: set = {name.lower() for name in redact_headers}
+        self.include_headers: bool = include_headers
+        self.logger: logging.Logger = logging.getLogger(logger_name)
+        self._handler: logging.Handler = handler or logging.StreamHandler()
+        if json_format:
+            self._handler.setFormatter(JsonFormatter())
+        elif self._handler.formatter is None:
+            self._handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        self._asynchronous: bool = asynchronous
+        self._listener: Union[QueueListener, None] = None
+        # the handler attached to the logger, which is the queue feeding the listener when logging asynchronously
+        self._attached: Union[logging.Handler, None] = None
+        self._lock: threading.Lock = threading.Lock()
+        self._configured: bool = False
+
+    def redact_param(self, name: str) -> None:
+        """
+        Redact the value of another URL parameter, e.g. the keyword an API key is sent as
+
+        :param name: Parameter name
+        :type name: str
+        """
+        self.redact_params.add(name.lower())
+
+    def _own_record(self, record: logging.LogRecord) -> bool:
+        # policies may share a logger, each one only writes the requests it logged itself
+        return getattr(record, "logging_policy", None) is self
+
+    def _configure(self) -> None:
+        with self._lock:
+            if self._configured:
+                return
+            if self._asynchronous:
+                records: queue.Queue = queue.Queue(-1)
+                self._attached = QueueHandler(records)
+                self._listener = QueueListener(records, self._handler, respect_handler_level=True)
+                self._listener.start()
+                atexit.register(self.close)
+            else:
+                self._attached = self._handler
+            self._attached.addFilter(self._own_record)
+            self.logger.addHandler(self._attached)
+            if self.logger.level == logging.NOTSET:
+                self.logger.setLevel(logging.INFO)
+            self._configured = True
+
+    def should_log(self, elapsed: float, status_code: int = None, error: BaseException = None) -> bool:
+        """
+        Decide whether to log a request
+
+        :param elapsed: Seconds the request took
+        :type elapsed: float
+        :param status_code: Status code of the response, if one was received
+        :type status_code: int, optional
+        :param error: Exception raised by the request, if any
+        :type error: BaseException, optional
+        :return: Whether to log the request
+        :rtype: bool
+        """
+        if error is not None or (status_code is not None and status_code >= 400):
+            return True
+        if self.errors_only:
+            return False
+        if self.slow_threshold is not None:
+            return elapsed >= self.slow_threshold
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def _redact_text(self, text: str) -> str:
+        # exception messages may embed the full URL, secret parameters included
+        names = "|".join(re.escape(name) for name in sorted(self.redact_params))
+        if not names:
+            return text
+        return re.sub(rf"(?i)\b({names})=[^&\s'\"]+", rf"\1={REDACTED}", text)
+
+    def _redacted(self, values: Union[Mapping[str, Any], None], secret: set) -> Union[dict, None]:
+        if not values:
+            return None
+        return {name: REDACTED if name.lower() in secret else value for name, value in values.items()}
+
+    def log(self,
+            method: str,
+            url: str,
+            elapsed: float,
+            params: Mapping[str, Any] = None,
+            headers: Mapping[str, str] = None,
+            status_code: int = None,
+            error: BaseException = None) -> None:
+        """
+        Log a finished request if the policy selects it
+
+        :param method: HTTP method
+        :type method: str
+        :param url: URL without parameters
+        :type url: str
+        :param elapsed: Seconds the request took
+        :type elapsed: float
+        :param params: URL parameters
+        :type params: mapping, optional
+        :param headers: Request headers
+        :type headers: mapping, optional
+        :param status_code: Status code of the response, if one was received
+        :type status_code: int, optional
+        :param error: Exception raised by the request, if any
+        :type error: BaseException, optional
+        """
+        if not self.should_log(elapsed=elapsed, status_code=status_code, error=error):
+            return
+        if not self._configured:
+            self._configure()
+        request = {
+            "method": method.upper(),
+            "url": url,
+            "params": self._redacted(params, self.redact_params),
+            "status": status_code,
+            "elapsed_ms": round(elapsed * 1000, 3),
+        }
+        if self.include_headers:
+            request["headers"] = self._redacted(headers, self.redact_headers)
+        if error is not None:
+            request["error"] = self._redact_text(f"{error.__class__.__name__}: {error}")
+        failed = error is not None or (status_code is not None and status_code >= 400)
+        # the message is only rendered by the handler, the request dict is formatted on the listener thread
+        self.logger.log(logging.ERROR if failed else logging.INFO, "%s %s %s %.1fms", request["method"], url,
+                        status_code if error is None else request["error"], elapsed * 1000,
+                        extra={"request": request, "logging_policy": self})
+
+    def close(self) -> None:
+        """
+        Flush queued log lines, stop the background thread and detach the handler from the logger
+        """
+        with self._lock:
+            if self._attached is not None:
+                self.logger.removeHandler(self._attached)
+                self._attached.removeFilter(self._own_record)
+                self._attached = None
+            if self._listener is not None:
+                self._listener.stop()
+                self._listener = None
+                atexit.unregister(self.close)
+            self._configured = False
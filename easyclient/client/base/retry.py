@@ -0,0 +1,226 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Tuple, Type, Union
+
+import httpx
+import requests
+
+from easyclient.client.base.ratelimit import parse_retry_after
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"))
+RETRY_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+RETRY_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    httpx.TransportError,
+)
+
+
+class RetryStats:
+    def __init__(self):
+        """
+        Attempt counters for a retry policy
+        """
+        self.calls: int = 0
+        self.attempts: int = 0
+        self.retries: int = 0
+        self.exhausted: int = 0
+        self.budget_exhausted: int = 0
+        self.attempts_per_call: Dict[int, int] = {}
+
+    @property
+    def mean_attempts(self) -> float:
+        return self.attempts / self.calls if self.calls else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+            "budget_exhausted": self.budget_exhausted,
+            "mean_attempts": self.mean_attempts,
+            "attempts_per_call": dict(sorted(self.attempts_per_call.items())),
+        }
+
+    def __repr__(self) -> str:
+        return f"RetryStats({self.snapshot()})"
+
+
+class RetryBudget:
+    def __init__(self, ratio: float = 0.2, min_retries_per_second: float = 10, window: float = 10.0):
+        """
+        Cap retries to a fraction of recent calls, so retries cannot multiply load during an outage
+        Share one instance between policies to apply a global budget
+
+        :param ratio: Number of retries allowed per call made in the window
+        :type ratio: float, optional
+        :param min_retries_per_second: Retries always allowed regardless of traffic, so low-volume clients can retry
+        :type min_retries_per_second: float, optional
+        :param window: Number of seconds calls and retries are counted over
+        :type window: float, optional
+        """
+        self.ratio: float = ratio
+        self.min_retries_per_second: float = min_retries_per_second
+        self.window: float = window
+        self._calls: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._lock: threading.Lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        for events in (self._calls, self._retries):
+            while events and events[0] <= now - self.window:
+                events.popleft()
+
+    def record_call(self) -> None:
+        """
+        Record a call (not counting its retries)
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._calls.append(now)
+
+    def withdraw(self) -> bool:
+        """
+        Take a retry from the budget
+
+        :return: True if the retry is allowed, False if the budget is spent
+        :rtype: bool
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            allowed = self.min_retries_per_second * self.window + self.ratio * len(self._calls)
+            if len(self._retries) >= allowed:
+                return False
+            self._retries.append(now)
+            return True
+
+
+class RetryPolicy:
+    def __init__(self,
+                 max_attempts: int = 3,
+                 backoff_base: float = 0.1,
+                 backoff_max: float = 10.0,
+                 statuses: Iterable[int] = RETRY_STATUSES,
+                 exceptions: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS,
+                 methods: Iterable[str] = IDEMPOTENT_METHODS,
+                 respect_retry_after: bool = True,
+                 max_retry_after: float = 60.0,
+                 budget: RetryBudget = None):
+        """
+        Retry failed requests with exponential backoff and full jitter
+
+        :param max_attempts: Maximum number of attempts per call, including the first
+        :type max_attempts: int, optional
+        :param backoff_base: Backoff ceiling of the first retry in seconds, doubled on every retry
+        :type backoff_base: float, optional
+        :param backoff_max: Maximum backoff ceiling in seconds
+        :type backoff_max: float, optional
+        :param statuses: Response status codes to retry
+        :type statuses: iterable, optional
+        :param exceptions: Exception types to retry
+        :type exceptions: tuple, optional
+        :param methods: HTTP methods to retry (non-idempotent methods such as POST must be opted into)
+        :type methods: iterable, optional
+        :param respect_retry_after: Whether to wait as long as the Retry-After header asks, if longer than the backoff
+        :type respect_retry_after: bool, optional
+        :param max_retry_after: Give up instead of waiting if Retry-After asks for longer than this many seconds
+        :type max_retry_after: float, optional
+        :param budget: Budget limiting how many retries may be made (defaults to a budget for this policy only)
+        :type budget: RetryBudget, optional
+        """
+        self.max_attempts: int = max(max_attempts, 1)
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.statuses: frozenset = frozenset(statuses)
+        self.exceptions: Tuple[Type[BaseException], ...] = tuple(exceptions)
+        self.methods: frozenset = frozenset(method.upper() for method in methods)
+        self.respect_retry_after: bool = respect_retry_after
+        self.max_retry_after: float = max_retry_after
+        self.budget: RetryBudget = budget or RetryBudget()
+        self.stats: RetryStats = RetryStats()
+        self._lock: threading.Lock = threading.Lock()
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Get a random backoff before the next attempt ("full jitter")
+
+        :param attempt: Number of attempts made so far
+        :type attempt: int
+        :return: Number of seconds to wait
+        :rtype: float
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def retryable_error(self, error: BaseException) -> bool:
+        return isinstance(error, self.exceptions)
+
+    def retry_delay(self,
+                    method: str,
+                    attempt: int,
+                    status_code: int = None,
+                    headers=None,
+                    error: BaseException = None) -> Union[float, None]:
+        """
+        Decide whether to retry a failed attempt
+
+        :param method: HTTP method of the request
+        :type method: str
+        :param attempt: Number of attempts made so far
+        :type attempt: int
+        :param status_code: Status code of the response, if one was received
+        :type status_code: int, optional
+        :param headers: Headers of the response, if one was received
+        :type headers: mapping, optional
+        :param error: Exception raised by the attempt, if any
+        :type error: BaseException, optional
+        :return: Number of seconds to wait before retrying, or None to stop
+        :rtype: float
+        """
+        if method.upper() not in self.methods:
+            return None
+        if error is not None:
+            if not self.retryable_error(error):
+                return None
+        elif status_code not in self.statuses:
+            return None
+        if attempt >= self.max_attempts:
+            with self._lock:
+                self.stats.exhausted += 1
+            return None
+        delay = self.backoff(attempt)
+        if self.respect_retry_after and headers is not None:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                if retry_after > self.max_retry_after:
+                    return None
+                delay = max(delay, retry_after)
+        if not self.budget.withdraw():
+            with self._lock:
+                self.stats.budget_exhausted += 1
+            return None
+        with self._lock:
+            self.stats.retries += 1
+        return delay
+
+    def record_call(self) -> None:
+        """
+        Record the start of a call
+        """
+        self.budget.record_call()
+
+    def record_attempts(self, attempts: int) -> None:
+        """
+        Record the number of attempts a finished call took
+
+        :param attempts: Number of attempts
+        :type attempts: int
+        """
+        with self._lock:
+            self.stats.calls += 1
+            self.stats.attempts += attempts
+            self.stats.attempts_per_call[attempts] = self.stats.attempts_per_call.get(attempts, 0) + 1
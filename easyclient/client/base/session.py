@@ -0,0 +1,534 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Union
+from urllib.parse import urlsplit
+
+import httpx
+import objectrest
+from objectrest import (
+    Response,
+    AsyncResponse,
+)
+
+from easyclient.client.base.circuit import (
+    Circuit,
+    CircuitBreaker,
+)
+from easyclient.client.base.concurrency import AdaptiveConcurrencyLimiter
+from easyclient.client.base.encoding import ContentEncodingPolicy
+from easyclient.client.base.hedge import HedgePolicy
+from easyclient.client.base.metrics import Instrumentation
+from easyclient.client.base.pool import ConnectionPoolConfig
+from easyclient.client.base.ratelimit import RateLimiter
+from easyclient.client.base.request_log import LoggingPolicy
+from easyclient.client.base.retry import RetryPolicy
+from easyclient.client.base.token import (
+    OAuth2Token,
+    TokenManager,
+)
+from easyclient.client.base.transport import Transport
+
+
+def _endpoint(base_url: str, url: str) -> str:
+    """
+    Get the endpoint of a URL relative to the base URL, or its path if it is not under the base URL
+
+    :return: URL endpoint
+    :rtype: str
+    """
+    base = (base_url or "").rstrip("/")
+    if base and url.startswith(base):
+        return url[len(base):].split("?", 1)[0] or "/"
+    return urlsplit(url).path or "/"
+
+
+def _allow(breaker: Union[CircuitBreaker, None], base_url: str, endpoint: str) -> Union[Circuit, None]:
+    """
+    Get the circuit of a request and let the request through it
+
+    :return: The circuit, or None if there is no circuit breaker
+    :rtype: Circuit
+    :raises CircuitOpenError: If the circuit is open
+    """
+    if not breaker:
+        return None
+    circuit = breaker.circuit(breaker.circuit_name(base_url, endpoint))
+    circuit.allow()
+    return circuit
+
+
+def _origin(base_url: Union[str, None], url: str) -> str:
+    if base_url:
+        return base_url
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _authorized(headers: Union[dict, None], token: OAuth2Token) -> dict:
+    headers = dict(headers or {})
+    headers["Authorization"] = token.authorization
+    return headers
+
+
+def _hedgeable(hedge_policy: Union[HedgePolicy, None], method: str, kwargs: dict) -> bool:
+    return hedge_policy is not None and method.upper() == "GET" and not kwargs.get("stream")
+
+
+def _replayable(kwargs: dict) -> bool:
+    # streamed bodies read from an iterator are gone once sent, so requests sending them cannot be retried
+    body = kwargs.get("data", kwargs.get("content"))
+    return getattr(body, "replayable", True)
+
+
+def _read_decoded(policy: ContentEncodingPolicy, response: Response) -> None:
+    try:
+        policy.read(response)
+    except BaseException:
+        response.close()
+        raise
+
+
+async def _async_read_decoded(policy: ContentEncodingPolicy, response: AsyncResponse) -> None:
+    try:
+        await policy.aread(response)
+    except BaseException:
+        await response.aclose()
+        raise
+
+
+def _discard(future: Future) -> None:
+    # a request already running in a thread cannot be interrupted, so close its response once it arrives
+    if not future.cancel():
+        future.add_done_callback(lambda finished: finished.exception() is None and finished.result().close())
+
+
+def _log_request(policy: LoggingPolicy, method: str, url: str, kwargs: dict, started: float,
+                 status_code: int = None, error: BaseException = None) -> None:
+    policy.log(method=method, url=url, elapsed=time.perf_counter() - started, params=kwargs.get("params"),
+               headers=kwargs.get("headers"), status_code=status_code, error=error)
+
+
+def _record_outcome(breaker: CircuitBreaker, circuit: Circuit, status_code: int = None,
+                    error: BaseException = None) -> None:
+    if breaker.is_failure(status_code=status_code, error=error):
+        circuit.record_failure()
+    elif error is not None:
+        circuit.release()
+    else:
+        circuit.record_success()
+
+
+def _release_circuit(breaker: CircuitBreaker, circuit: Circuit, sent: bool, error: BaseException) -> None:
+    if sent:
+        _record_outcome(breaker, circuit, error=error)
+    else:
+        # the request failed before reaching the upstream (e.g. fetching its token), so it only gives its slot back
+        circuit.release()
+
+
+class PooledSession(objectrest.Session):
+    def __init__(self, pool_config: ConnectionPoolConfig = None, rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None,
+                 token_manager: TokenManager = None,
+                 hedge_policy: HedgePolicy = None,
+                 instrumentation: Instrumentation = None,
+                 logging_policy: LoggingPolicy = None,
+                 transport: Transport = None,
+                 encoding_policy: ContentEncodingPolicy = None,
+                 base_url: str = None):
+        """
+        A keep-alive session that reuses pooled connections for every request
+
+        :param pool_config: Connection pool settings
+        :type pool_config: ConnectionPoolConfig, optional
+        :param rate_limiter: Limiter to throttle requests with
+        :type rate_limiter: RateLimiter, optional
+        :param retry_policy: Policy to retry failed requests with
+        :type retry_policy: RetryPolicy, optional
+        :param circuit_breaker: Circuit breaker to fail fast with while the upstream is down
+        :type circuit_breaker: CircuitBreaker, optional
+        :param token_manager: Manager of the OAuth2 token to authorize requests with
+        :type token_manager: TokenManager, optional
+        :param hedge_policy: Policy to hedge slow GET requests with
+        :type hedge_policy: HedgePolicy, optional
+        :param instrumentation: Collector of request metrics and hooks
+        :type instrumentation: Instrumentation, optional
+        :param logging_policy: Policy deciding which requests to log
+        :type logging_policy: LoggingPolicy, optional
+        :param transport: Transport sending the requests, e.g. to record or replay them
+        :type transport: Transport, optional
+        :param encoding_policy: Policy negotiating compressed responses and decompressing them
+        :type encoding_policy: ContentEncodingPolicy, optional
+        :param base_url: Base URL the rate limiter's endpoint patterns are relative to
+        :type base_url: str, optional
+        """
+        super().__init__()
+        self._rate_limiter: Union[RateLimiter, None] = rate_limiter
+        self._retry_policy: Union[RetryPolicy, None] = retry_policy
+        self._circuit_breaker: Union[CircuitBreaker, None] = circuit_breaker
+        self._token_manager: Union[TokenManager, None] = token_manager
+        self._hedge_policy: Union[HedgePolicy, None] = hedge_policy
+        self._instrumentation: Union[Instrumentation, None] = instrumentation
+        self._logging_policy: Union[LoggingPolicy, None] = logging_policy
+        self._encoding_policy: Union[ContentEncodingPolicy, None] = encoding_policy
+        self._base_url: Union[str, None] = base_url
+        self._pool_config: ConnectionPoolConfig = pool_config or ConnectionPoolConfig()
+        self._transport: Transport = transport or Transport()
+        self._session.mount("http://", self._transport.build_adapter(self._pool_config))
+        self._session.mount("https://", self._transport.build_adapter(self._pool_config))
+        self._last_used: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+        self._hedge_executor: Union[ThreadPoolExecutor, None] = None
+
+    def evict_idle(self) -> bool:
+        """
+        Close pooled connections if the session has been idle longer than the keep-alive timeout
+
+        :return: True if connections were evicted, False otherwise
+        :rtype: bool
+        """
+        timeout = self._pool_config.keepalive_timeout
+        if timeout is None or time.monotonic() - self._last_used <= timeout:
+            return False
+        with self._lock:
+            for adapter in self._session.adapters.values():
+                if getattr(adapter, "poolmanager", None) is not None:
+                    adapter.poolmanager.clear()
+            self._last_used = time.monotonic()
+        return True
+
+    def request(self, method, url, **kwargs) -> Response:
+        send = self._hedged_send if _hedgeable(self._hedge_policy, method, kwargs) else self._send
+        policy = self._retry_policy
+        if not policy or not _replayable(kwargs):
+            return send(method, url, **kwargs)
+        policy.record_call()
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                try:
+                    res = send(method, url, **kwargs)
+                except Exception as error:
+                    delay = policy.retry_delay(method, attempt, error=error)
+                    if delay is None:
+                        raise
+                else:
+                    delay = policy.retry_delay(method, attempt, status_code=res.status_code, headers=res.headers)
+                    if delay is None:
+                        return res
+                    res.close()
+                time.sleep(delay)
+        finally:
+            policy.record_attempts(attempt)
+
+    def _send(self, method, url, **kwargs) -> Response:
+        endpoint = _endpoint(self._base_url, url)
+        circuit = _allow(self._circuit_breaker, self._base_url, endpoint)
+        # streamed responses are decoded by the HTTP library as their caller reads them
+        decode = self._encoding_policy is not None and not kwargs.get("stream")
+        event = started = None
+        sent = False
+        try:
+            if self._rate_limiter:
+                self._rate_limiter.acquire(endpoint)
+            if self._token_manager:
+                kwargs["headers"] = _authorized(kwargs.get("headers"), self._token_manager.token())
+            if decode:
+                kwargs["headers"] = self._encoding_policy.headers(kwargs.get("headers"))
+                kwargs["stream"] = True
+            self.evict_idle()
+            if self._instrumentation:
+                event = self._instrumentation.start(method, url, endpoint, kwargs.get("headers"))
+                kwargs["headers"] = event.headers
+            started = time.perf_counter() if self._logging_policy else None
+            sent = True
+            res = self._session.request(method, url, **kwargs)
+            if decode:
+                _read_decoded(self._encoding_policy, res)
+        except BaseException as error:
+            if started is not None and isinstance(error, Exception):  # cancelled hedges are not failures
+                _log_request(self._logging_policy, method, url, kwargs, started, error=error)
+            if event:
+                self._instrumentation.finish(event, error=error)
+            if circuit:
+                _release_circuit(self._circuit_breaker, circuit, sent, error)
+            raise
+        finally:
+            self._last_used = time.monotonic()
+        if started is not None:
+            _log_request(self._logging_policy, method, url, kwargs, started, status_code=res.status_code)
+        if event:
+            self._instrumentation.finish(event, response=res)
+        if circuit:
+            _record_outcome(self._circuit_breaker, circuit, status_code=res.status_code)
+        if self._rate_limiter:
+            self._rate_limiter.update(endpoint, status_code=res.status_code, headers=res.headers)
+        return res
+
+    def _timed_send(self, method, url, **kwargs) -> Response:
+        start = time.perf_counter()
+        res = self._send(method, url, **kwargs)
+        self._hedge_policy.record_latency(time.perf_counter() - start)
+        return res
+
+    def _hedged_send(self, method, url, **kwargs) -> Response:
+        hedge = self._hedge_policy
+        hedge.start_request()
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self._pool_config.max_connections,
+                                                          thread_name_prefix="easyclient-hedge")
+        primary = self._hedge_executor.submit(self._timed_send, method, url, **kwargs)
+        done, _ = wait([primary], timeout=hedge.hedge_delay())
+        if done or not hedge.try_hedge():
+            return primary.result()
+        backup = self._hedge_executor.submit(self._timed_send, method, url, **kwargs)
+        pending = {primary, backup}
+        winner = error = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                elif winner is None:
+                    winner = future
+                else:
+                    future.result().close()
+        for future in pending:
+            _discard(future)
+        if winner is None:
+            raise error
+        if winner is backup:
+            hedge.record_win()
+        return winner.result()
+
+    def close(self) -> None:
+        """
+        Close all pooled connections and the transport, e.g. to flush a recording
+        """
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self._session.close()
+        self._transport.close()
+
+
+class PooledAsyncSession(objectrest.AsyncSession):
+    def __init__(self, pool_config: ConnectionPoolConfig = None, rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None,
+                 token_manager: TokenManager = None,
+                 hedge_policy: HedgePolicy = None,
+                 instrumentation: Instrumentation = None,
+                 logging_policy: LoggingPolicy = None,
+                 transport: Transport = None,
+                 encoding_policy: ContentEncodingPolicy = None,
+                 http2: bool = False,
+                 concurrency_limiter: AdaptiveConcurrencyLimiter = None,
+                 base_url: str = None):
+        """
+        A keep-alive asynchronous session that reuses pooled connections for every request
+
+        :param pool_config: Connection pool settings
+        :type pool_config: ConnectionPoolConfig, optional
+        :param rate_limiter: Limiter to throttle requests with
+        :type rate_limiter: RateLimiter, optional
+        :param retry_policy: Policy to retry failed requests with
+        :type retry_policy: RetryPolicy, optional
+        :param circuit_breaker: Circuit breaker to fail fast with while the upstream is down
+        :type circuit_breaker: CircuitBreaker, optional
+        :param token_manager: Manager of the OAuth2 token to authorize requests with
+        :type token_manager: TokenManager, optional
+        :param hedge_policy: Policy to hedge slow GET requests with
+        :type hedge_policy: HedgePolicy, optional
+        :param instrumentation: Collector of request metrics and hooks
+        :type instrumentation: Instrumentation, optional
+        :param logging_policy: Policy deciding which requests to log
+        :type logging_policy: LoggingPolicy, optional
+        :param transport: Transport sending the requests, e.g. to record or replay them
+        :type transport: Transport, optional
+        :param encoding_policy: Policy negotiating compressed responses and decompressing them
+        :type encoding_policy: ContentEncodingPolicy, optional
+        :param http2: Whether to multiplex requests to HTTPS servers over HTTP/2 connections (requires the h2 package)
+        :type http2: bool, optional
+        :param concurrency_limiter: Limiter adapting the number of requests in flight to each base URL
+        :type concurrency_limiter: AdaptiveConcurrencyLimiter, optional
+        :param base_url: Base URL the rate limiter's endpoint patterns are relative to
+        :type base_url: str, optional
+        """
+        # objectrest.AsyncSession closes its client after every request, so it is intentionally not initialized here
+        self._pool_config: ConnectionPoolConfig = pool_config or ConnectionPoolConfig()
+        self._transport: Transport = transport or Transport()
+        self._http2: bool = http2
+        self._session: httpx.AsyncClient = httpx.AsyncClient(
+            transport=self._transport.build_async_transport(self._pool_config, http2=http2))
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._rate_limiter: Union[RateLimiter, None] = rate_limiter
+        self._retry_policy: Union[RetryPolicy, None] = retry_policy
+        self._circuit_breaker: Union[CircuitBreaker, None] = circuit_breaker
+        self._token_manager: Union[TokenManager, None] = token_manager
+        self._hedge_policy: Union[HedgePolicy, None] = hedge_policy
+        self._instrumentation: Union[Instrumentation, None] = instrumentation
+        self._logging_policy: Union[LoggingPolicy, None] = logging_policy
+        self._encoding_policy: Union[ContentEncodingPolicy, None] = encoding_policy
+        self._concurrency_limiter: Union[AdaptiveConcurrencyLimiter, None] = concurrency_limiter
+        self._base_url: Union[str, None] = base_url
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        parts = urlsplit(url)
+        host = parts.netloc
+        semaphore = self._host_semaphores.get(host)
+        if not semaphore:
+            # HTTP/2 (only negotiated over HTTPS) multiplexes every request to a host over a single connection
+            multiplexed = self._http2 and parts.scheme == "https"
+            semaphore = asyncio.Semaphore(self._pool_config.max_concurrent_streams if multiplexed
+                                          else self._pool_config.max_connections_per_host)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def get(self, url, **kwargs) -> AsyncResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs) -> AsyncResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url, **kwargs) -> AsyncResponse:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url, **kwargs) -> AsyncResponse:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def patch(self, url, **kwargs) -> AsyncResponse:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def head(self, url, **kwargs) -> AsyncResponse:
+        return await self.request("HEAD", url, **kwargs)
+
+    async def options(self, url, **kwargs) -> AsyncResponse:
+        return await self.request("OPTIONS", url, **kwargs)
+
+    async def request(self, method, url, **kwargs) -> AsyncResponse:
+        send = self._hedged_send if _hedgeable(self._hedge_policy, method, kwargs) else self._send
+        policy = self._retry_policy
+        if not policy or not _replayable(kwargs):
+            return await send(method, url, **kwargs)
+        policy.record_call()
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                try:
+                    res = await send(method, url, **kwargs)
+                except Exception as error:
+                    delay = policy.retry_delay(method, attempt, error=error)
+                    if delay is None:
+                        raise
+                else:
+                    delay = policy.retry_delay(method, attempt, status_code=res.status_code, headers=res.headers)
+                    if delay is None:
+                        return res
+                    await res.aclose()
+                await asyncio.sleep(delay)
+        finally:
+            policy.record_attempts(attempt)
+
+    async def _send(self, method, url, stream: bool = False, **kwargs) -> AsyncResponse:
+        endpoint = _endpoint(self._base_url, url)
+        circuit = _allow(self._circuit_breaker, self._base_url, endpoint)
+        # streamed responses are decoded by the HTTP library as their caller reads them
+        decode = self._encoding_policy is not None and not stream
+        limiter = self._concurrency_limiter
+        limit = limiter.limit(_origin(self._base_url, url)) if limiter else None
+        event = started = acquired = None
+        sent = False
+        try:
+            if self._rate_limiter:
+                await self._rate_limiter.async_acquire(endpoint)
+            if self._token_manager:
+                kwargs["headers"] = _authorized(kwargs.get("headers"), await self._token_manager.async_token())
+            if decode:
+                kwargs["headers"] = self._encoding_policy.headers(kwargs.get("headers"))
+            if limit:
+                acquired = await limit.acquire()
+            if self._instrumentation:
+                event = self._instrumentation.start(method, url, endpoint, kwargs.get("headers"))
+                kwargs["headers"] = event.headers
+            started = time.perf_counter() if self._logging_policy else None
+            sent = True
+            async with self._host_semaphore(url):
+                if stream or decode:
+                    # the caller must close a streamed response once the body has been consumed
+                    res = await self._session.send(self._session.build_request(method, url, **kwargs), stream=True)
+                    if decode:
+                        await _async_read_decoded(self._encoding_policy, res)
+                else:
+                    res = await self._session.request(method, url, **kwargs)
+        except BaseException as error:
+            if started is not None and isinstance(error, Exception):  # cancelled hedges are not failures
+                _log_request(self._logging_policy, method, url, kwargs, started, error=error)
+            if event:
+                self._instrumentation.finish(event, error=error)
+            if circuit:
+                _release_circuit(self._circuit_breaker, circuit, sent, error)
+            if acquired is not None:
+                limit.release(acquired, overloaded=limiter.is_overload(error=error) if sent else None)
+            raise
+        if limit:
+            # a streamed response frees its slot once its headers arrive, its body is read at the caller's pace
+            limit.release(acquired, overloaded=limiter.is_overload(status_code=res.status_code))
+        if started is not None:
+            _log_request(self._logging_policy, method, url, kwargs, started, status_code=res.status_code)
+        if event:
+            self._instrumentation.finish(event, response=res)
+        if circuit:
+            _record_outcome(self._circuit_breaker, circuit, status_code=res.status_code)
+        if self._rate_limiter:
+            self._rate_limiter.update(endpoint, status_code=res.status_code, headers=res.headers)
+        return res
+
+    async def _timed_send(self, method, url, **kwargs) -> AsyncResponse:
+        start = time.perf_counter()
+        res = await self._send(method, url, **kwargs)
+        self._hedge_policy.record_latency(time.perf_counter() - start)
+        return res
+
+    async def _hedged_send(self, method, url, **kwargs) -> AsyncResponse:
+        hedge = self._hedge_policy
+        hedge.start_request()
+        primary = asyncio.ensure_future(self._timed_send(method, url, **kwargs))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge.hedge_delay())
+            if done or not hedge.try_hedge():
+                return await primary
+            backup = asyncio.ensure_future(self._timed_send(method, url, **kwargs))
+            tasks.append(backup)
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            hedge.record_win()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # cancelling the slower request closes its connection instead of leaving it running
+            for task in tasks:
+                task.cancel()
+
+    @property
+    def is_closed(self) -> bool:
+        return self._session.is_closed
+
+    async def close(self) -> None:
+        """
+        Close all pooled connections and the transport, e.g. to flush a recording
+        """
+        await self._session.aclose()
+        self._transport.close()
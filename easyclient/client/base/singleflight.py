@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done: threading.Event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Collapse concurrent calls for the same key into a single call (thread-safe)
+        """
+        self._lock: threading.Lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls: int = 0
+        self.shared: int = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Call func, or wait for the result of an identical call already in flight
+
+        :param key: Identity of the call
+        :type key: hashable
+        :param func: Function to call if no identical call is in flight
+        :type func: callable
+        :return: The result of func
+        :rtype: object
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        """
+        Collapse concurrent calls for the same key into a single call (coroutine-safe)
+        """
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self.calls: int = 0
+        self.shared: int = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable]) -> Any:
+        """
+        Await func, or wait for the result of an identical call already in flight
+
+        :param key: Identity of the call
+        :type key: hashable
+        :param func: Coroutine function to await if no identical call is in flight
+        :type func: callable
+        :return: The result of func
+        :rtype: object
+        """
+        future = self._futures.get(key)
+        if future is not None:
+            self.shared += 1
+        else:
+            self.calls += 1
+            future = asyncio.ensure_future(func())
+            self._futures[key] = future
+            future.add_done_callback(lambda finished: self._finish(key, finished))
+        # shield so one caller being cancelled does not cancel the call for everyone else
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._futures.get(key) is future:
+            del self._futures[key]
+        if not future.cancelled():
+            future.exception()  # mark as retrieved in case every caller was cancelled
@@ -0,0 +1,147 @@
+import codecs
+import json
+import re
+from typing import Any, List, Tuple
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = " \t\n\r,:]}"
+
+_VALUE = 0  # expecting the value found at the current depth of the sub-key path
+_KEY = 1  # inside an object, expecting the next key
+_COLON = 2  # expecting the colon after a key
+_SKIP = 3  # skipping the value of a key that is not on the sub-key path
+_ITEMS = 4  # inside the target array, expecting the next element
+_DONE = 5
+
+
+class _Incomplete(Exception):
+    pass
+
+
+class JsonItemStream:
+    def __init__(self, sub_keys: List = None):
+        """
+        Incrementally parse a JSON document fed in chunks, yielding the elements of the array found at sub_keys
+        Memory is bounded by the largest single element rather than by the whole document
+
+        :param sub_keys: A list of sub-keys to search for (in order) to find the array of items
+        :type sub_keys: list, optional
+        """
+        self._sub_keys: List = list(sub_keys or [])
+        self._depth: int = 0
+        self._state: int = _VALUE
+        self._key: Any = None
+        self._text: str = ""
+        self._pos: int = 0
+        self._retry_at: int = 0
+        self._closed: bool = False
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder: json.JSONDecoder = json.JSONDecoder()
+
+    @property
+    def done(self) -> bool:
+        return self._state == _DONE
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Parse the next chunk of the document
+
+        :param data: Next chunk of the raw document
+        :type data: bytes
+        :return: Elements completed by this chunk
+        :rtype: list
+        """
+        if self._state == _DONE:
+            return []
+        self._text = self._text[self._pos:] + self._utf8.decode(data)
+        self._pos = 0
+        if len(self._text) < self._retry_at:
+            return []
+        return self._parse()
+
+    def close(self) -> List[Any]:
+        """
+        Signal the end of the document
+
+        :return: Elements completed by the end of the document
+        :rtype: list
+        """
+        self._closed = True
+        if self._state == _DONE:
+            return []
+        self._text = self._text[self._pos:] + self._utf8.decode(b"", final=True)
+        self._pos = 0
+        items = self._parse()
+        empty = self._state == _VALUE and self._depth == 0 and not self._text[self._pos:].strip()
+        if self._state != _DONE and not empty:
+            raise ValueError("Incomplete or invalid JSON document")
+        return items
+
+    def _skip_whitespace(self) -> bool:
+        self._pos = _WHITESPACE.match(self._text, self._pos).end()
+        return self._pos < len(self._text)
+
+    def _decode_value(self) -> Tuple[Any, int]:
+        try:
+            value, end = self._decoder.raw_decode(self._text, self._pos)
+        except json.JSONDecodeError:
+            if self._closed:
+                raise
+            raise _Incomplete()
+        # a value not followed by a delimiter may be a truncated number (e.g. "12" of "12.5")
+        if not self._closed and (end >= len(self._text) or self._text[end] not in _DELIMITERS):
+            raise _Incomplete()
+        return value, end
+
+    def _parse(self) -> List[Any]:
+        items = []
+        try:
+            while self._state != _DONE and self._skip_whitespace():
+                char = self._text[self._pos]
+                if self._state == _VALUE:
+                    if self._depth < len(self._sub_keys):
+                        if char != "{":
+                            self._state = _DONE
+                            continue
+                        self._pos += 1
+                        self._state = _KEY
+                    elif char == "[":
+                        self._pos += 1
+                        self._state = _ITEMS
+                    else:
+                        value, self._pos = self._decode_value()
+                        items.append(value)
+                        self._state = _DONE
+                elif self._state == _KEY:
+                    if char == ",":
+                        self._pos += 1
+                    elif char == "}":
+                        self._state = _DONE
+                    else:
+                        self._key, self._pos = self._decode_value()
+                        self._state = _COLON
+                elif self._state == _COLON:
+                    if char != ":":
+                        raise ValueError(f"Expected ':' at position {self._pos}")
+                    self._pos += 1
+                    if self._key == self._sub_keys[self._depth]:
+                        self._depth += 1
+                        self._state = _VALUE
+                    else:
+                        self._state = _SKIP
+                elif self._state == _SKIP:
+                    _, self._pos = self._decode_value()
+                    self._state = _KEY
+                elif self._state == _ITEMS:
+                    if char == ",":
+                        self._pos += 1
+                    elif char == "]":
+                        self._state = _DONE
+                    else:
+                        value, self._pos = self._decode_value()
+                        items.append(value)
+            self._retry_at = 0
+        except _Incomplete:
+            # wait for the buffer to double before retrying, so huge elements are not re-parsed on every chunk
+            self._retry_at = 2 * (len(self._text) - self._pos)
+        return items
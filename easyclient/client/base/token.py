@@ -0,0 +1,353 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Union
+
+from oauthlib.oauth2 import BackendApplicationClient
+from requests.auth import HTTPBasicAuth
+from requests_oauthlib import OAuth2Session
+
+from easyclient.client.base.singleflight import SingleFlight
+
+# collapses concurrent refreshes of the same credentials across every manager in the process
+_refresh_flight: SingleFlight = SingleFlight()
+
+
+class OAuth2Token:
+    def __init__(self, access_token: str, expires_at: float = None, token_type: str = "Bearer",
+                 issued_at: float = None):
+        """
+        An OAuth2 access token
+
+        :param access_token: The access token
+        :type access_token: str
+        :param expires_at: UNIX timestamp the token expires at (never, if None)
+        :type expires_at: float, optional
+        :param token_type: Type of the token, used as the Authorization header scheme
+        :type token_type: str, optional
+        :param issued_at: UNIX timestamp the token was issued at
+        :type issued_at: float, optional
+        """
+        self.access_token: str = access_token
+        self.expires_at: Union[float, None] = expires_at
+        self.token_type: str = token_type or "Bearer"
+        self.issued_at: Union[float, None] = issued_at
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any]) -> "OAuth2Token":
+        """
+        Build a token from a token endpoint response
+
+        :param data: JSON returned by the token endpoint
+        :type data: dict
+        :return: The token
+        :rtype: OAuth2Token
+        """
+        if not data.get("access_token"):
+            raise ValueError("No access token provided by the API.")
+        now = time.time()
+        expires_at = data.get("expires_at")
+        if expires_at is None and data.get("expires_in") is not None:
+            expires_at = now + float(data["expires_in"])
+        token_type = data.get("token_type") or "Bearer"
+        # RFC 6750 scheme names are case-insensitive, but some servers only accept "Bearer"
+        return cls(access_token=data["access_token"],
+                   expires_at=float(expires_at) if expires_at is not None else None,
+                   token_type="Bearer" if token_type.lower() == "bearer" else token_type,
+                   issued_at=now)
+
+    @property
+    def authorization(self) -> str:
+        return f"{self.token_type} {self.access_token}"
+
+    def expires_within(self, seconds: float) -> bool:
+        return self.expires_at is not None and self.expires_at - time.time() <= seconds
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_within(0)
+
+    def refresh_in(self, margin: float) -> Union[float, None]:
+        """
+        Get the number of seconds until the token should be refreshed
+
+        :param margin: Number of seconds before expiry to refresh the token (capped at half its lifetime)
+        :type margin: float
+        :return: Seconds until the token should be refreshed (negative if overdue), or None if it never expires
+        :rtype: float
+        """
+        if self.expires_at is None:
+            return None
+        if self.issued_at is not None:
+            margin = min(margin, (self.expires_at - self.issued_at) / 2)
+        return self.expires_at - time.time() - margin
+
+    def to_dict(self) -> dict:
+        return {"access_token": self.access_token, "expires_at": self.expires_at, "token_type": self.token_type,
+                "issued_at": self.issued_at}
+
+    def __repr__(self) -> str:
+        return f"OAuth2Token(token_type={self.token_type!r}, expires_at={self.expires_at!r})"
+
+
+class TokenStore:
+    def get(self, key: str) -> Union[OAuth2Token, None]:
+        """
+        Get a token
+
+        :param key: Token key
+        :type key: str
+        :return: The token, or None if there is none
+        :rtype: OAuth2Token
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, token: OAuth2Token) -> None:
+        """
+        Store a token
+
+        :param key: Token key
+        :type key: str
+        :param token: The token
+        :type token: OAuth2Token
+        """
+        raise NotImplementedError
+
+
+class MemoryTokenStore(TokenStore):
+    def __init__(self):
+        """
+        Keep tokens in memory
+        """
+        self._tokens: Dict[str, OAuth2Token] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: str) -> Union[OAuth2Token, None]:
+        return self._tokens.get(key)
+
+    def set(self, key: str, token: OAuth2Token) -> None:
+        with self._lock:
+            self._tokens[key] = token
+
+
+class FileTokenStore(MemoryTokenStore):
+    def __init__(self, path: str):
+        """
+        Keep tokens in a JSON file (readable by the current user only) so they survive restarts
+
+        :param path: Path of the file
+        :type path: str
+        """
+        super().__init__()
+        self.path: str = os.path.expanduser(path)
+        self._loaded_mtime: Union[float, None] = None
+
+    def _load(self) -> None:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._loaded_mtime:
+            return
+        try:
+            with open(self.path) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        self._tokens = {key: OAuth2Token(**value) for key, value in data.items()}
+        self._loaded_mtime = mtime
+
+    def get(self, key: str) -> Union[OAuth2Token, None]:
+        with self._lock:
+            self._load()
+            return self._tokens.get(key)
+
+    def set(self, key: str, token: OAuth2Token) -> None:
+        with self._lock:
+            self._load()
+            self._tokens[key] = token
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+            try:
+                with os.fdopen(descriptor, "w") as file:
+                    json.dump({key: value.to_dict() for key, value in self._tokens.items()}, file)
+                os.chmod(temporary_path, 0o600)
+                os.replace(temporary_path, self.path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+            self._loaded_mtime = os.path.getmtime(self.path)
+
+
+# shared by every manager that is not given a store, so clients with the same credentials share tokens
+_default_store: MemoryTokenStore = MemoryTokenStore()
+
+
+class TokenManager:
+    def __init__(self,
+                 client_id: str,
+                 client_secret: str,
+                 authorization_url: str,
+                 store: TokenStore = None,
+                 refresh_margin: float = 60.0,
+                 auto_refresh: bool = True,
+                 fetch_token: Callable[[], Dict[str, Any]] = None):
+        """
+        Fetch, cache and refresh OAuth2 client credentials tokens
+        Tokens are refreshed in the background before they expire, so requests do not wait on the token endpoint
+
+        :param client_id: The client ID
+        :type client_id: str
+        :param client_secret: The client secret
+        :type client_secret: str
+        :param authorization_url: The URL to exchange the client ID and secret for a token
+        :type authorization_url: str
+        :param store: Where to keep tokens (defaults to a process-wide in-memory store)
+        :type store: TokenStore, optional
+        :param refresh_margin: Number of seconds before expiry to refresh a token
+        :type refresh_margin: float, optional
+        :param auto_refresh: Whether to refresh a token that is in use on a timer, even if no request needs it yet
+        :type auto_refresh: bool, optional
+        :param fetch_token: Function returning a token endpoint response (defaults to a client credentials grant)
+        :type fetch_token: callable, optional
+        """
+        self._client_id: str = client_id
+        self._client_secret: str = client_secret
+        self._authorization_url: str = authorization_url
+        self.store: TokenStore = store or _default_store
+        self.refresh_margin: float = refresh_margin
+        self.auto_refresh: bool = auto_refresh
+        self._fetch_token: Callable[[], Dict[str, Any]] = fetch_token or self._client_credentials_grant
+        # the secret is deliberately left out, so it never ends up in a token file
+        self.key: str = hashlib.sha256(f"{client_id}\x00{authorization_url}".encode()).hexdigest()[:16]
+        self._lock: threading.Lock = threading.Lock()
+        self._background: Union[threading.Thread, None] = None
+        self._timer: Union[threading.Timer, None] = None
+        self._used: bool = False
+        self._closed: bool = False
+        # clients sharing the manager (through their auth), background refreshes stop once the last one is closed
+        self._clients: int = 0
+        self.refreshes: int = 0
+        self.background_refreshes: int = 0
+
+    def _client_credentials_grant(self) -> Dict[str, Any]:
+        oauth = OAuth2Session(client=BackendApplicationClient(client_id=self._client_id))
+        return oauth.fetch_token(token_url=self._authorization_url,
+                                 auth=HTTPBasicAuth(self._client_id, self._client_secret))
+
+    def _refresh(self) -> OAuth2Token:
+        token = OAuth2Token.from_response(self._fetch_token())
+        self.store.set(self.key, token)
+        self.refreshes += 1
+        self._schedule(token)
+        return token
+
+    def refresh(self) -> OAuth2Token:
+        """
+        Fetch a new token, or wait for a refresh of the same credentials already in flight
+
+        :return: The new token
+        :rtype: OAuth2Token
+        """
+        return _refresh_flight.do(self.key, self._refresh)
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self.refresh()
+            self.background_refreshes += 1
+        except Exception:
+            pass  # the current token is still valid, the next request past the margin tries again
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._closed or (self._background is not None and self._background.is_alive()):
+                return
+            self._background = threading.Thread(target=self._refresh_quietly, name="easyclient-token-refresh",
+                                                daemon=True)
+            self._background.start()
+
+    def _schedule(self, token: OAuth2Token) -> None:
+        refresh_in = token.refresh_in(self.refresh_margin)
+        if not self.auto_refresh or refresh_in is None:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(max(refresh_in, 0), self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self) -> None:
+        # tokens nobody used since the last refresh are left to expire
+        if self._used:
+            self._used = False
+            self._refresh_quietly()
+
+    def _current(self) -> Union[OAuth2Token, None]:
+        token = self.store.get(self.key)
+        self._used = True
+        if token is None or token.expired:
+            return None
+        refresh_in = token.refresh_in(self.refresh_margin)
+        if refresh_in is not None and refresh_in <= 0:
+            self._refresh_in_background()
+        return token
+
+    def token(self) -> OAuth2Token:
+        """
+        Get a valid token, only waiting on the token endpoint if there is no unexpired token
+
+        :return: The token
+        :rtype: OAuth2Token
+        """
+        return self._current() or self.refresh()
+
+    async def async_token(self) -> OAuth2Token:
+        """
+        Get a valid token, fetching it in a thread (without blocking the event loop) if there is no unexpired token
+
+        :return: The token
+        :rtype: OAuth2Token
+        """
+        token = self._current()
+        if token is None:
+            token = await asyncio.get_running_loop().run_in_executor(None, self.refresh)
+        return token
+
+    def _stop(self) -> None:
+        self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def attach(self) -> None:
+        """
+        Register a client using the manager, so background refreshes run until every client using it is closed
+        """
+        with self._lock:
+            self._clients += 1
+            self._closed = False
+
+    def detach(self) -> None:
+        """
+        Unregister a client using the manager, stopping background refreshes if it was the last one
+        """
+        with self._lock:
+            self._clients = max(self._clients - 1, 0)
+            if not self._clients:
+                self._stop()
+
+    def close(self) -> None:
+        """
+        Stop refreshing tokens in the background, whichever clients use the manager (tokens are still fetched when a
+        request needs one, and background refreshes resume once another client attaches)
+        """
+        with self._lock:
+            self._stop()
@@ -0,0 +1,504 @@
+import asyncio
+import atexit
+import base64
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import timedelta
+from http.client import responses as _reasons
+from typing import Any, Dict, Iterable, List, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from easyclient.client.base.pool import ConnectionPoolConfig
+
+# the stored body is already decoded, so these would describe a body that no longer exists
+_DROPPED_HEADERS = frozenset(("content-encoding", "content-length", "transfer-encoding"))
+_KEY_PREFIX = '{"key":'
+_decoder = json.JSONDecoder()
+
+
+def request_key(method: str, url: str) -> str:
+    """
+    Get the key a request is recorded and replayed under: its method and URL, with the parameters sorted
+
+    :param method: HTTP method
+    :type method: str
+    :param url: Full URL, parameters included
+    :type url: str
+    :return: The request key
+    :rtype: str
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit((parts.scheme, parts.netloc, parts.path or '/', query, ''))}"
+
+
+def strip_params(url: str, names: Iterable[str]) -> str:
+    """
+    Remove URL parameters, e.g. the API key, from a URL
+
+    :param url: Full URL, parameters included
+    :type url: str
+    :param names: Names of the parameters to remove (case-insensitive)
+    :type names: iterable
+    :return: The URL without these parameters
+    :rtype: str
+    """
+    names = {name.lower() for name in names}
+    parts = urlsplit(url)
+    if not names or not parts.query:
+        return url
+    params = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+              if name.lower() not in names]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(params), parts.fragment))
+
+
+class ReplayMissError(LookupError):
+    def __init__(self, key: str):
+        """
+        Raised when a replayed request was never recorded
+
+        :param key: Key of the request
+        :type key: str
+        """
+        super().__init__(f"No recorded response for {key}")
+        self.key: str = key
+
+
+def _require_h2() -> None:
+    # HTTPX only checks for h2 once the first HTTP/2 connection is opened
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        raise ImportError("HTTP/2 requires the h2 package, install it with `pip install easyclient[http2]`.") from None
+
+
+class Transport:
+    """
+    Sends the requests of a session: pooled connections straight to the API
+    Subclasses wrap the pooled adapter (Requests) and transport (HTTPX) to change how requests are sent
+    """
+
+    def __init__(self):
+        # URL parameters carrying credentials, which are left out of anything the transport writes or matches on
+        self.secret_params: set = set()
+
+    def strip_param(self, name: str) -> None:
+        """
+        Leave a URL parameter out of recorded and replayed requests, e.g. the keyword an API key is sent as
+
+        :param name: Parameter name
+        :type name: str
+        """
+        self.secret_params.add(name.lower())
+
+    def _public_url(self, url: str) -> str:
+        return strip_params(url, self.secret_params)
+
+    def build_adapter(self, pool_config: ConnectionPoolConfig) -> BaseAdapter:
+        """
+        Build the Requests transport adapter a synchronous session mounts
+
+        :param pool_config: Connection pool settings
+        :type pool_config: ConnectionPoolConfig
+        :return: A transport adapter
+        :rtype: BaseAdapter
+        """
+        return pool_config.build_adapter()
+
+    def build_async_transport(self, pool_config: ConnectionPoolConfig, http2: bool = False) -> httpx.AsyncBaseTransport:
+        """
+        Build the HTTPX transport an asynchronous session sends requests with
+
+        :param pool_config: Connection pool settings
+        :type pool_config: ConnectionPoolConfig
+        :param http2: Whether to negotiate HTTP/2 with HTTPS servers (requires the h2 package)
+        :type http2: bool, optional
+        :return: An HTTPX transport
+        :rtype: httpx.AsyncBaseTransport
+        :raises ImportError: If HTTP/2 is requested and the h2 package is not installed
+        """
+        if http2:
+            _require_h2()
+        return httpx.AsyncHTTPTransport(limits=pool_config.build_limits(), http2=http2)
+
+    def close(self) -> None:
+        """
+        Release what the transport holds besides pooled connections (it is reopened if it is used again)
+        """
+
+
+class RecordingTransport(Transport):
+    def __init__(self, path: str, compress: bool = True, compress_level: int = 6):
+        """
+        Send requests to the API and append every request/response pair to a JSONL recording
+        Responses are read in full before they are returned, so recording does not stream
+
+        :param path: Path of the recording (appended to if it exists)
+        :type path: str
+        :param compress: Whether to store bodies zlib-compressed
+        :type compress: bool, optional
+        :param compress_level: zlib compression level, from 1 (fastest) to 9 (smallest)
+        :type compress_level: int, optional
+        """
+        super().__init__()
+        self.path: str = os.path.expanduser(path)
+        self.compress: bool = compress
+        self.compress_level: int = compress_level
+        self.recorded: int = 0
+        self._file = None
+        self._index: Dict[str, List[int]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _open(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "ab")
+        if self._file.tell():
+            recording = Recording(self.path)
+            self._index = recording.index
+            recording.close()
+        atexit.register(self.close)
+
+    def record(self, method: str, url: str, status_code: int, headers: List[Tuple[str, str]], body: bytes,
+               elapsed: float) -> None:
+        """
+        Append a request/response pair to the recording
+
+        :param method: HTTP method
+        :type method: str
+        :param url: Full URL, parameters included (secret parameters are left out of the recording)
+        :type url: str
+        :param status_code: Status code of the response
+        :type status_code: int
+        :param headers: Response headers
+        :type headers: list
+        :param body: Decoded response body
+        :type body: bytes
+        :param elapsed: Seconds the response took
+        :type elapsed: float
+        """
+        url = self._public_url(url)
+        key = request_key(method, url)
+        encoding = "zlib" if self.compress and body else "identity"
+        if encoding == "zlib":
+            body = zlib.compress(body, self.compress_level)
+        with self._lock:
+            if self._file is None:
+                self._open()
+            entry = {
+                # the key comes first, so a recording can be indexed without decoding whole lines
+                "key": key,
+                "method": method.upper(),
+                "url": url,
+                "elapsed": round(elapsed, 6),
+                "status": status_code,
+                "headers": [[name, value] for name, value in headers if name.lower() not in _DROPPED_HEADERS],
+                "encoding": encoding,
+                "body": base64.b64encode(body).decode("ascii"),
+            }
+            self._index.setdefault(key, []).append(self._file.tell())
+            self._file.write(json.dumps(entry, separators=(",", ":")).encode() + b"\n")
+            self.recorded += 1
+
+    def build_adapter(self, pool_config: ConnectionPoolConfig) -> BaseAdapter:
+        return _RecordingAdapter(self, pool_config)
+
+    def build_async_transport(self, pool_config: ConnectionPoolConfig, http2: bool = False) -> httpx.AsyncBaseTransport:
+        return _RecordingAsyncTransport(self, super().build_async_transport(pool_config, http2=http2))
+
+    def close(self) -> None:
+        """
+        Flush the recording and write its index next to it, so replaying it does not need to scan it
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.flush()
+            size = self._file.tell()
+            self._file.close()
+            self._file = None
+            _write_index(self.path, size, self._index)
+            atexit.unregister(self.close)
+
+
+class _RecordingAdapter(HTTPAdapter):
+    def __init__(self, transport: RecordingTransport, pool_config: ConnectionPoolConfig):
+        super().__init__(pool_connections=pool_config.host_pools,
+                         pool_maxsize=pool_config.max_connections_per_host,
+                         pool_block=pool_config.block)
+        self._transport: RecordingTransport = transport
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        body = response.content
+        self._transport.record(method=request.method, url=request.url, status_code=response.status_code,
+                               headers=list(response.headers.items()), body=body, elapsed=time.perf_counter() - started)
+        return response
+
+
+class _RecordingAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: RecordingTransport, inner: httpx.AsyncBaseTransport):
+        self._transport: RecordingTransport = transport
+        self._inner: httpx.AsyncBaseTransport = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self._inner.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        self._transport.record(method=request.method, url=str(request.url), status_code=response.status_code,
+                               headers=response.headers.multi_items(), body=body, elapsed=time.perf_counter() - started)
+        headers = [(name, value) for name, value in response.headers.multi_items()
+                   if name.lower() not in _DROPPED_HEADERS]
+        return httpx.Response(status_code=response.status_code, headers=headers, content=body, request=request,
+                              extensions=response.extensions)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _index_path(path: str) -> str:
+    return f"{path}.index"
+
+
+def _write_index(path: str, size: int, index: Dict[str, List[int]]) -> None:
+    temporary_path = f"{_index_path(path)}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump({"size": size, "keys": index}, file, separators=(",", ":"))
+    os.replace(temporary_path, _index_path(path))
+
+
+class Recording:
+    def __init__(self, path: str):
+        """
+        A recording of request/response pairs, indexed by request key
+        Only the index (the byte offset of every entry) is kept in memory, entries are read from disk when requested
+
+        :param path: Path of the recording
+        :type path: str
+        """
+        self.path: str = os.path.expanduser(path)
+        self.index: Dict[str, List[int]] = self._load_index()
+        self._file = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _load_index(self) -> Dict[str, List[int]]:
+        size = os.path.getsize(self.path)
+        try:
+            with open(_index_path(self.path)) as file:
+                data = json.load(file)
+            if data.get("size") == size:
+                return data["keys"]
+        except (OSError, ValueError):
+            pass
+        index = self._scan()
+        try:
+            _write_index(self.path, size, index)
+        except OSError:
+            pass  # e.g. a read-only recording, it is scanned again next time
+        return index
+
+    def _scan(self) -> Dict[str, List[int]]:
+        index: Dict[str, List[int]] = {}
+        offset = 0
+        with open(self.path, "rb") as file:
+            for line in file:
+                text = line.decode()
+                if text.startswith(_KEY_PREFIX):
+                    key = _decoder.raw_decode(text, len(_KEY_PREFIX))[0]
+                else:
+                    key = json.loads(text)["key"] if text.strip() else None
+                if key is not None:
+                    index.setdefault(key, []).append(offset)
+                offset += len(line)
+        return index
+
+    def __len__(self) -> int:
+        return sum(len(offsets) for offsets in self.index.values())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def read(self, offset: int) -> Dict[str, Any]:
+        """
+        Read the entry at a byte offset of the recording
+
+        :param offset: Byte offset of the entry
+        :type offset: int
+        :return: The entry, with its body decoded to bytes
+        :rtype: dict
+        """
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "rb")
+            self._file.seek(offset)
+            line = self._file.readline()
+        entry = json.loads(line)
+        body = base64.b64decode(entry["body"])
+        entry["body"] = zlib.decompress(body) if entry["encoding"] == "zlib" else body
+        return entry
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class ReplayTransport(Transport):
+    def __init__(self, path: str, speed: Union[float, None] = None, passthrough: bool = False):
+        """
+        Answer requests from a recording instead of the API
+        Requests are matched by method, URL and parameters; a request recorded several times is answered with its
+        recorded responses in order, starting over once they run out. Only response times are replayed, how fast
+        requests are sent is up to the caller
+
+        :param path: Path of the recording
+        :type path: str
+        :param speed: How fast to replay recorded response times, e.g. 1 for the original timing and 10 for ten times
+            faster (if None, responses are served as fast as possible)
+        :type speed: float, optional
+        :param passthrough: Whether to send requests missing from the recording to the API instead of raising
+        :type passthrough: bool, optional
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("Replay speed must be positive.")
+        super().__init__()
+        self.recording: Recording = Recording(path)
+        self.speed: Union[float, None] = speed
+        self.passthrough: bool = passthrough
+        self.replayed: int = 0
+        self.missed: int = 0
+        self._positions: Dict[str, int] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def lookup(self, method: str, url: str) -> Union[Dict[str, Any], None]:
+        """
+        Get the next recorded response of a request
+
+        :param method: HTTP method
+        :type method: str
+        :param url: Full URL, parameters included
+        :type url: str
+        :return: The recorded entry, or None if the request was never recorded
+        :rtype: dict
+        """
+        key = self.key(method, url)
+        offsets = self.recording.index.get(key)
+        with self._lock:
+            if not offsets:
+                self.missed += 1
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            self.replayed += 1
+        return self.recording.read(offsets[position % len(offsets)])
+
+    def key(self, method: str, url: str) -> str:
+        """
+        Get the key a request is replayed under, without its secret parameters
+
+        :param method: HTTP method
+        :type method: str
+        :param url: Full URL, parameters included
+        :type url: str
+        :return: The request key
+        :rtype: str
+        """
+        return request_key(method, self._public_url(url))
+
+    def delay(self, entry: Dict[str, Any]) -> float:
+        """
+        Get the number of seconds to wait before serving a recorded response
+
+        :param entry: The recorded entry
+        :type entry: dict
+        :return: Seconds to wait
+        :rtype: float
+        """
+        return entry["elapsed"] / self.speed if self.speed else 0.0
+
+    def build_adapter(self, pool_config: ConnectionPoolConfig) -> BaseAdapter:
+        return _ReplayAdapter(self, super().build_adapter(pool_config) if self.passthrough else None)
+
+    def build_async_transport(self, pool_config: ConnectionPoolConfig, http2: bool = False) -> httpx.AsyncBaseTransport:
+        inner = super().build_async_transport(pool_config, http2=http2) if self.passthrough else None
+        return _ReplayAsyncTransport(self, inner)
+
+    def close(self) -> None:
+        self.recording.close()
+
+
+def _replayed_headers(entry: Dict[str, Any]) -> List[Tuple[str, str]]:
+    return [(name, value) for name, value in entry["headers"]] + [("Content-Length", str(len(entry["body"])))]
+
+
+class _ReplayAdapter(BaseAdapter):
+    def __init__(self, transport: ReplayTransport, inner: Union[BaseAdapter, None]):
+        super().__init__()
+        self._transport: ReplayTransport = transport
+        self._inner: Union[BaseAdapter, None] = inner
+
+    @property
+    def poolmanager(self):
+        return self._inner.poolmanager if self._inner is not None else None
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        entry = self._transport.lookup(request.method, request.url)
+        if entry is None:
+            if self._inner is None:
+                raise ReplayMissError(self._transport.key(request.method, request.url))
+            return self._inner.send(request, **kwargs)
+        delay = self._transport.delay(entry)
+        if delay:
+            time.sleep(delay)
+        response = Response()
+        response.status_code = entry["status"]
+        response.reason = _reasons.get(entry["status"], "")
+        response.headers = CaseInsensitiveDict(_replayed_headers(entry))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = entry["body"]
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=entry["elapsed"])
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        if self._inner is not None:
+            self._inner.close()
+
+
+class _ReplayAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: ReplayTransport, inner: Union[httpx.AsyncBaseTransport, None]):
+        self._transport: ReplayTransport = transport
+        self._inner: Union[httpx.AsyncBaseTransport, None] = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self._transport.lookup(request.method, str(request.url))
+        if entry is None:
+            if self._inner is None:
+                raise ReplayMissError(self._transport.key(request.method, str(request.url)))
+            return await self._inner.handle_async_request(request)
+        delay = self._transport.delay(entry)
+        if delay:
+            await asyncio.sleep(delay)
+        return httpx.Response(status_code=entry["status"], headers=_replayed_headers(entry), content=entry["body"],
+                              request=request)
+
+    async def aclose(self) -> None:
+        if self._inner is not None:
+            await self._inner.aclose()
@@ -1,5 +1,9 @@
-from typing import List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Any, AsyncIterator, BinaryIO, Callable, Iterable, Iterator, List, Tuple, Union
 
+import httpx
 from objectrest import (
     Response,
     AsyncResponse
@@ -8,9 +12,104 @@ from objectrest import (
 from easyclient.client.base import (
     ApiClient,
     ApiAuth,
+    ConnectionPoolConfig,
+    PooledSession,
+    PooledAsyncSession,
+)
+from easyclient.client.base.batch import (
+    BatchResult,
+    merge_batch_kwargs,
+    prepare_batch,
+    resolve_batch_method,
+)
+from easyclient.client.base.cache import (
+    ResponseCache,
+    object_variant,
+)
+from easyclient.client.base.circuit import (
+    CircuitBreaker,
+)
+from easyclient.client.base.codec import (
+    JsonCodec,
+)
+from easyclient.client.base.concurrency import (
+    AdaptiveConcurrencyLimiter,
+)
+from easyclient.client.base.conditional import (
+    ValidatorStore,
+)
+from easyclient.client.base.download import (
+    INTERRUPTED_EXCEPTIONS,
+    BufferWriter,
+    Destination,
+    file_offset,
+    is_buffer,
+    is_encoded,
+    is_path,
+    range_headers,
+    range_start,
+    write_chunks,
+)
+from easyclient.client.base.encoding import (
+    ContentEncodingPolicy,
+)
+from easyclient.client.base.hedge import (
+    HedgePolicy,
+)
+from easyclient.client.base.metrics import (
+    Instrumentation,
+)
+from easyclient.client.base.models import (
+    model_adapter,
+)
+from easyclient.client.base.pagination import (
+    Page,
+    PageRequest,
+    PaginationStrategy,
+    page_target,
+)
+from easyclient.client.base.ratelimit import (
+    RateLimiter,
+)
+from easyclient.client.base.request_log import (
+    LoggingPolicy,
+)
+from easyclient.client.base.retry import (
+    RetryPolicy,
+)
+from easyclient.client.base.singleflight import (
+    AsyncSingleFlight,
+)
+from easyclient.client.base.streaming import (
+    JsonItemStream,
+)
+from easyclient.client.base.transport import (
+    Transport,
+)
+
+_BATCH_METHODS = (
+    "get", "get_text", "get_object",
+    "post", "post_blind", "post_text", "post_object",
+    "put", "put_blind", "put_text", "put_object",
+    "patch", "patch_blind", "patch_text", "patch_object",
+    "delete", "delete_blind", "delete_text", "delete_object",
+)
+
+_ASYNC_BATCH_METHODS = (
+    "get", "get_object",
+    "post", "post_blind", "post_object",
+    "put", "put_blind", "put_object",
+    "patch", "patch_blind", "patch_object",
+    "delete", "delete_blind", "delete_object",
 )
 
 
+def _logging_policy(log_requests: Union[bool, LoggingPolicy]) -> Union[LoggingPolicy, None]:
+    if isinstance(log_requests, LoggingPolicy):
+        return log_requests
+    return LoggingPolicy() if log_requests else None
+
+
 def _process_blind(response: Response) -> bool:
     if not response:  # utilize the truthiness of request.Response
         return False
@@ -21,11 +120,119 @@ def _async_process_blind(response: AsyncResponse) -> bool:
     return not response.is_error
 
 
-class RestApiClient(ApiClient):
-    def __init__(self, base_url: str, auth: ApiAuth, log_requests: bool = False):
-        super().__init__(auth._construct_handler(base_url=base_url, log_requests=log_requests))
+# headers describing the body as sent, which no longer apply once it has been decoded
+_ENCODED_BODY_HEADERS = frozenset(("content-encoding", "content-length", "transfer-encoding"))
+
+
+def _response_snapshot(response: AsyncResponse) -> Tuple[int, List[Tuple[str, str]], bytes, str]:
+    # cached and single-flight values are shared, so a plain copy is kept rather than the mutable response
+    headers = [(name, value) for name, value in response.headers.multi_items()
+               if name.lower() not in _ENCODED_BODY_HEADERS]
+    return response.status_code, headers, response.content, str(response.url)
+
+
+def _snapshot_response(snapshot: Tuple[int, List[Tuple[str, str]], bytes, str]) -> AsyncResponse:
+    status_code, headers, content, url = snapshot
+    return httpx.Response(status_code, headers=headers, content=content, request=httpx.Request("GET", url))
 
-    def get(self, endpoint: str, params: dict = None) -> dict:
+
+class RestApiClient(ApiClient):
+    def __init__(self,
+                 base_url: str,
+                 auth: ApiAuth,
+                 log_requests: Union[bool, LoggingPolicy] = False,
+                 pool_config: ConnectionPoolConfig = None,
+                 cache: ResponseCache = None,
+                 validators: ValidatorStore = None,
+                 json_backend: Union[str, JsonCodec] = None,
+                 rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None,
+                 single_flight: bool = False,
+                 hedge_policy: HedgePolicy = None,
+                 instrumentation: Instrumentation = None,
+                 transport: Transport = None,
+                 trusted_models: bool = False,
+                 encoding_policy: ContentEncodingPolicy = None):
+        # requests are logged by the session according to the logging policy, objectrest's unredacted logging stays off
+        super().__init__(auth._construct_handler(base_url=base_url, log_requests=False),
+                         pool_config=pool_config,
+                         auth=auth,
+                         cache=cache,
+                         validators=validators,
+                         json_backend=json_backend,
+                         rate_limiter=rate_limiter,
+                         retry_policy=retry_policy,
+                         circuit_breaker=circuit_breaker,
+                         single_flight=single_flight,
+                         hedge_policy=hedge_policy,
+                         instrumentation=instrumentation,
+                         logging_policy=_logging_policy(log_requests),
+                         transport=transport,
+                         trusted_models=trusted_models,
+                         encoding_policy=encoding_policy)
+        self._session: PooledSession = PooledSession(pool_config=self._pool_config,
+                                                     rate_limiter=self._rate_limiter,
+                                                     retry_policy=self._retry_policy,
+                                                     circuit_breaker=self._circuit_breaker,
+                                                     token_manager=self._token_manager,
+                                                     hedge_policy=self._hedge_policy,
+                                                     instrumentation=self._instrumentation,
+                                                     logging_policy=self._logging_policy,
+                                                     transport=self._transport,
+                                                     encoding_policy=self._encoding_policy,
+                                                     base_url=base_url)
+        self._request_handler._session = self._session
+
+    def __enter__(self) -> "RestApiClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close all pooled connections held by this client, flush its request log and stop refreshing its token in the
+        background, unless other open clients share it
+        """
+        self._session.close()
+        self._detach_token_manager()
+        if self._logging_policy:
+            self._logging_policy.close()
+
+    def _load_get(self,
+                  endpoint: str,
+                  params: dict,
+                  parse: Callable[[Response], Any],
+                  key: str = None) -> Tuple[Any, bool]:
+        record = self._validators.lookup(key) if self._validators and key else None
+        res: Response = self._request_handler.get(url=endpoint, params=params,
+                                                  headers=record.headers if record else None)
+        if record and res.status_code == 304:
+            return self._validators.revalidated(key=key, record=record), True
+        value = parse(res)
+        ok = bool(res) and value is not None
+        if ok and self._validators and key:
+            self._validators.store(key=key, headers=res.headers, value=value)
+        return value, ok
+
+    def _cached_get(self,
+                    endpoint: str,
+                    params: dict,
+                    cache_ttl: float,
+                    variant: str,
+                    parse: Callable[[Response], Any]) -> Any:
+        ttl = self._cache_ttl(endpoint=endpoint, cache_ttl=cache_ttl)
+        key = self._request_key(endpoint=endpoint, params=params, variant=variant) \
+            if ttl or self._validators or self._single_flight else None
+        load = partial(self._load_get, endpoint, params, parse, key)
+        if not ttl:
+            if self._single_flight:
+                return self._single_flight.do(key, load)[0]
+            return load()[0]
+        return self._cache.fetch(key=key, ttl=ttl, loader=load)
+
+    def get(self, endpoint: str, params: dict = None, cache_ttl: float = None) -> dict:
         """
         Make a GET request to the API
 
@@ -33,12 +240,15 @@ class RestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param cache_ttl: Seconds to cache the response for, overriding the cache's TTL (0 to bypass the cache)
+        :type cache_ttl: float, optional
         :return: JSON data from the API response
         :rtype: dict
         """
-        return self._request_handler.get_json(url=endpoint, params=params)
+        return self._cached_get(endpoint=endpoint, params=params, cache_ttl=cache_ttl, variant="json",
+                                parse=self._parse_json)
 
-    def get_text(self, endpoint: str, params: dict = None) -> str:
+    def get_text(self, endpoint: str, params: dict = None, cache_ttl: float = None) -> str:
         """
         Make a GET request to the API
 
@@ -46,18 +256,22 @@ class RestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param cache_ttl: Seconds to cache the response for, overriding the cache's TTL (0 to bypass the cache)
+        :type cache_ttl: float, optional
         :return: Text from the API response
         :rtype: str
         """
-        res: Response = self._request_handler.get(url=endpoint, params=params)
-        return res.text
+        return self._cached_get(endpoint=endpoint, params=params, cache_ttl=cache_ttl, variant="text",
+                                parse=lambda res: res.text)
 
     def get_object(self,
                    endpoint: str,
                    model: type,
                    params: dict = None,
                    sub_keys: List = None,
-                   extract_list: bool = False) -> object:
+                   extract_list: bool = False,
+                   cache_ttl: float = None,
+                   lazy: bool = False) -> object:
         """
         Make a GET request to the API
         Return an object of the specified type
@@ -72,13 +286,213 @@ class RestApiClient(ApiClient):
         :type sub_keys: list, optional
         :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
         :type extract_list: bool, optional
+        :param cache_ttl: Seconds to cache the response for, overriding the cache's TTL (0 to bypass the cache)
+        :type cache_ttl: float, optional
+        :param lazy: Whether to return a list of objects as a LazyModelList, building each object when it is accessed
+        :type lazy: bool, optional
         :return: Object from the API response
         :rtype: object
         """
-        return self._request_handler.get_object(url=endpoint, model=model, params=params, sub_keys=sub_keys,
-                                                extract_list=extract_list)
+        return self._cached_get(endpoint=endpoint, params=params, cache_ttl=cache_ttl,
+                                variant=object_variant(model=model, sub_keys=sub_keys, extract_list=extract_list,
+                                                       lazy=lazy),
+                                parse=partial(self._parse_object, model=model, sub_keys=sub_keys,
+                                              extract_list=extract_list, lazy=lazy))
+
+    def _fetch_page(self, request: PageRequest, sub_keys: List = None) -> Page:
+        endpoint, params = page_target(self._request_handler.base_url, request)
+        res: Response = self._request_handler.get(url=endpoint, params=params)
+        res.raise_for_status()
+        return Page(request=request, response=res, sub_keys=sub_keys, codec=self._codec)
+
+    def paginate(self,
+                 endpoint: str,
+                 strategy: PaginationStrategy,
+                 model: type = None,
+                 params: dict = None,
+                 sub_keys: List = None,
+                 max_pages: int = None,
+                 prefetch: bool = True) -> Iterator[Any]:
+        """
+        Make GET requests to the API for every page of a paginated endpoint
+        Yield an object of the specified type for each item, one page in memory at a time
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param strategy: How to request the next page (offset/limit, page number, cursor, Link header)
+        :type strategy: PaginationStrategy
+        :param model: a Pydantic model to generate from each item (JSON items are yielded as-is if None)
+        :type model: type, optional
+        :param params: Dictionary of parameters to add to url
+        :type params: dict, optional
+        :param sub_keys: A list of sub-keys to search for (in order) to find the list of items in each page
+        :type sub_keys: list, optional
+        :param max_pages: Maximum number of pages to fetch
+        :type max_pages: int, optional
+        :param prefetch: Whether to fetch the next page while the current one is being consumed
+        :type prefetch: bool, optional
+        :return: Objects from the API responses
+        :rtype: iterator
+        """
+        build = model_adapter(model, trusted=self._trusted_models).build
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self._fetch_page, strategy.first_request(endpoint=endpoint, params=params),
+                                      sub_keys)
+            pages = 0
+            while pending:
+                page = pending.result()
+                pending = None
+                pages += 1
+                next_request = strategy.next_request(page) if not max_pages or pages < max_pages else None
+                if next_request and prefetch:
+                    pending = executor.submit(self._fetch_page, next_request, sub_keys)
+                for item in page.items:
+                    yield build(item)
+                if next_request and not prefetch:
+                    pending = executor.submit(self._fetch_page, next_request, sub_keys)
+
+    def stream_objects(self,
+                       endpoint: str,
+                       model: type = None,
+                       params: dict = None,
+                       sub_keys: List = None,
+                       chunk_size: int = 64 * 1024) -> Iterator[Any]:
+        """
+        Make a GET request to the API
+        Parse the response incrementally, yielding an object of the specified type for each item of the list
+        found at sub_keys without loading the whole response into memory
 
-    def post(self, endpoint: str, params: dict = None) -> dict:
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param model: a Pydantic model to generate from each item (JSON items are yielded as-is if None)
+        :type model: type, optional
+        :param params: Dictionary of parameters to add to url
+        :type params: dict, optional
+        :param sub_keys: A list of sub-keys to search for (in order) to find the list of items
+        :type sub_keys: list, optional
+        :param chunk_size: Number of bytes to read from the response at a time
+        :type chunk_size: int, optional
+        :return: Objects from the API response
+        :rtype: iterator
+        """
+        build = model_adapter(model, trusted=self._trusted_models).build
+        policy = self._encoding_policy
+        res: Response = self._request_handler.get(url=endpoint, params=params, stream=True,
+                                                  headers=policy.headers() if policy else None)
+        try:
+            res.raise_for_status()
+            parser = JsonItemStream(sub_keys=sub_keys)
+            chunks = policy.iter_content(res, chunk_size) if policy else res.iter_content(chunk_size=chunk_size)
+            for chunk in chunks:
+                for item in parser.feed(chunk):
+                    yield build(item)
+                if parser.done:
+                    break
+            for item in parser.close():
+                yield build(item)
+        finally:
+            res.close()
+
+    def stream_bytes(self,
+                     endpoint: str,
+                     params: dict = None,
+                     chunk_size: int = 64 * 1024,
+                     offset: int = 0,
+                     max_resumes: int = 3) -> Iterator[bytes]:
+        """
+        Make a GET request to the API
+        Yield the response body in chunks without loading it into memory
+        If the transfer is interrupted, the rest of the body is requested with a Range header
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param params: Dictionary of parameters to add to url
+        :type params: dict, optional
+        :param chunk_size: Number of bytes to read from the response at a time
+        :type chunk_size: int, optional
+        :param offset: Number of bytes at the start of the body to skip (requested with a Range header)
+        :type offset: int, optional
+        :param max_resumes: Maximum number of times to resume an interrupted transfer
+        :type max_resumes: int, optional
+        :return: Chunks of the response body
+        :rtype: iterator
+        """
+        position = offset
+        resumes = 0
+        while True:
+            res: Response = self._request_handler.get(url=endpoint, params=params, stream=True,
+                                                      headers=range_headers(position))
+            try:
+                start = range_start(res.status_code, res.headers, position)
+                if start is None:
+                    return
+                res.raise_for_status()
+                # a server that ignores the Range header sends the body from the start again
+                skip = position - start
+                for chunk in res.iter_content(chunk_size=chunk_size):
+                    if skip:
+                        if len(chunk) <= skip:
+                            skip -= len(chunk)
+                            continue
+                        chunk = chunk[skip:]
+                        skip = 0
+                    yield chunk
+                    position += len(chunk)
+                return
+            except INTERRUPTED_EXCEPTIONS:
+                # positions count decoded bytes, so a server compressing the body anyway cannot be resumed from
+                if resumes >= max_resumes or is_encoded(res.headers):
+                    raise
+                resumes += 1
+            finally:
+                res.close()
+
+    def download(self,
+                 endpoint: str,
+                 destination: Destination,
+                 params: dict = None,
+                 chunk_size: int = 1024 * 1024,
+                 resume: bool = False,
+                 max_resumes: int = 3) -> int:
+        """
+        Make a GET request to the API
+        Write the response body to a file or buffer as it arrives, without loading it into memory
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param destination: Path or binary file object to write to, or a preallocated bytearray or memoryview to fill
+        :type destination: str, os.PathLike, file object, bytearray or memoryview
+        :param params: Dictionary of parameters to add to url
+        :type params: dict, optional
+        :param chunk_size: Number of bytes to read from the response at a time
+        :type chunk_size: int, optional
+        :param resume: Whether to continue a partial download, from the end of the file at the path or from the
+            current position of the file object
+        :type resume: bool, optional
+        :param max_resumes: Maximum number of times to resume an interrupted transfer
+        :type max_resumes: int, optional
+        :return: Number of bytes of the body in the destination, including any bytes resumed from
+        :rtype: int
+        :raises ValueError: If the body does not fit in the buffer
+        """
+        if is_buffer(destination):
+            return write_chunks(BufferWriter(destination).write,
+                                self.stream_bytes(endpoint=endpoint, params=params, chunk_size=chunk_size,
+                                                  max_resumes=max_resumes))
+        if is_path(destination):
+            offset = file_offset(destination, resume)
+            with open(destination, "r+b" if offset else "wb") as file:
+                file.seek(offset)
+                return offset + write_chunks(file.write,
+                                             self.stream_bytes(endpoint=endpoint, params=params,
+                                                               chunk_size=chunk_size, offset=offset,
+                                                               max_resumes=max_resumes))
+        offset = destination.tell() if resume else 0
+        return offset + write_chunks(destination.write,
+                                     self.stream_bytes(endpoint=endpoint, params=params, chunk_size=chunk_size,
+                                                       offset=offset, max_resumes=max_resumes))
+
+    def post(self, endpoint: str, params: dict = None, body: Any = None) -> dict:
         """
         Make a POST request to the API
 
@@ -86,12 +500,16 @@ class RestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: JSON data from the API response
         :rtype: dict
         """
-        return self._request_handler.post_json(url=endpoint, params=params)
+        res: Response = self._request_handler.post(url=endpoint, params=params, **self._body_kwargs(body))
+        return self._parse_json(res)
 
-    def post_blind(self, endpoint: str, params: dict = None) -> bool:
+    def post_blind(self, endpoint: str, params: dict = None, body: Any = None) -> bool:
         """
         Make a POST request to the API
         Return a boolean indicating if the request was successful
@@ -100,13 +518,16 @@ class RestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: True if the request was successful, False otherwise
         :rtype: bool
         """
-        res = self._request_handler.post(url=endpoint, params=params)
+        res = self._request_handler.post(url=endpoint, params=params, **self._body_kwargs(body))
         return _process_blind(res)
 
-    def post_text(self, endpoint: str, params: dict = None) -> str:
+    def post_text(self, endpoint: str, params: dict = None, body: Any = None) -> str:
         """
         Make a POST request to the API
 
@@ -114,10 +535,13 @@ class RestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: Text from the API response
         :rtype: str
         """
-        res: Response = self._request_handler.post(url=endpoint, params=params)
+        res: Response = self._request_handler.post(url=endpoint, params=params, **self._body_kwargs(body))
         return res.text
 
     def post_object(self,
@@ -125,7 +549,9 @@ class RestApiClient(ApiClient):
                     model: type,
                     params: dict = None,
                     sub_keys: List = None,
-                    extract_list: bool = False) -> object:
+                    extract_list: bool = False,
+                    body: Any = None,
+                    lazy: bool = False) -> object:
         """
         Make a POST request to the API
         Return an object of the specified type
@@ -140,13 +566,18 @@ class RestApiClient(ApiClient):
         :type sub_keys: list, optional
         :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
         :type extract_list: bool, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
+        :param lazy: Whether to return a list of objects as a LazyModelList, building each object when it is accessed
+        :type lazy: bool, optional
         :return: Object from the API response
         :rtype: object
         """
-        return self._request_handler.post_object(url=endpoint, model=model, params=params, sub_keys=sub_keys,
-                                                 extract_list=extract_list)
+        res: Response = self._request_handler.post(url=endpoint, params=params, **self._body_kwargs(body))
+        return self._parse_object(res, model=model, sub_keys=sub_keys, extract_list=extract_list, lazy=lazy)
 
-    def put(self, endpoint: str, params: dict = None) -> dict:
+    def put(self, endpoint: str, params: dict = None, body: Any = None) -> dict:
         """
         Make a PUT request to the API
 
@@ -154,12 +585,16 @@ class RestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: JSON data from the API response
         :rtype: dict
         """
-        return self._request_handler.put_json(url=endpoint, params=params)
+        res: Response = self._request_handler.put(url=endpoint, params=params, **self._body_kwargs(body))
+        return self._parse_json(res)
 
-    def put_blind(self, endpoint: str, params: dict = None) -> bool:
+    def put_blind(self, endpoint: str, params: dict = None, body: Any = None) -> bool:
         """
         Make a PUT request to the API
         Return a boolean indicating if the request was successful
@@ -168,13 +603,16 @@ class RestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: True if the request was successful, False otherwise
         :rtype: bool
         """
-        res = self._request_handler.put(url=endpoint, params=params)
+        res = self._request_handler.put(url=endpoint, params=params, **self._body_kwargs(body))
         return _process_blind(res)
 
-    def put_text(self, endpoint: str, params: dict = None) -> str:
+    def put_text(self, endpoint: str, params: dict = None, body: Any = None) -> str:
         """
         Make a PUT request to the API
 
@@ -182,10 +620,13 @@ class RestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: Text from the API response
         :rtype: str
         """
-        res: Response = self._request_handler.put(url=endpoint, params=params)
+        res: Response = self._request_handler.put(url=endpoint, params=params, **self._body_kwargs(body))
         return res.text
 
     def put_object(self,
@@ -193,7 +634,9 @@ class RestApiClient(ApiClient):
                    model: type,
                    params: dict = None,
                    sub_keys: List = None,
-                   extract_list: bool = False) -> object:
+                   extract_list: bool = False,
+                   body: Any = None,
+                   lazy: bool = False) -> object:
         """
         Make a PUT request to the API
         Return an object of the specified type
@@ -208,13 +651,18 @@ class RestApiClient(ApiClient):
         :type sub_keys: list, optional
         :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
         :type extract_list: bool, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
+        :param lazy: Whether to return a list of objects as a LazyModelList, building each object when it is accessed
+        :type lazy: bool, optional
         :return: Object from the API response
         :rtype: object
         """
-        return self._request_handler.put_object(url=endpoint, model=model, params=params, sub_keys=sub_keys,
-                                                extract_list=extract_list)
+        res: Response = self._request_handler.put(url=endpoint, params=params, **self._body_kwargs(body))
+        return self._parse_object(res, model=model, sub_keys=sub_keys, extract_list=extract_list, lazy=lazy)
 
-    def patch(self, endpoint: str, params: dict = None) -> dict:
+    def patch(self, endpoint: str, params: dict = None, body: Any = None) -> dict:
         """
         Make a PATCH request to the API
 
@@ -222,12 +670,16 @@ class RestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: JSON data from the API response
         :rtype: dict
         """
-        return self._request_handler.patch_json(url=endpoint, params=params)
+        res: Response = self._request_handler.patch(url=endpoint, params=params, **self._body_kwargs(body))
+        return self._parse_json(res)
 
-    def patch_blind(self, endpoint: str, params: dict = None) -> bool:
+    def patch_blind(self, endpoint: str, params: dict = None, body: Any = None) -> bool:
         """
         Make a PATCH request to the API
         Return a boolean indicating if the request was successful
@@ -236,13 +688,16 @@ class RestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: True if the request was successful, False otherwise
         :rtype: bool
         """
-        res = self._request_handler.patch(url=endpoint, params=params)
+        res = self._request_handler.patch(url=endpoint, params=params, **self._body_kwargs(body))
         return _process_blind(res)
 
-    def patch_text(self, endpoint: str, params: dict = None) -> str:
+    def patch_text(self, endpoint: str, params: dict = None, body: Any = None) -> str:
         """
         Make a PATCH request to the API
 
@@ -250,10 +705,13 @@ class RestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: Text from the API response
         :rtype: str
         """
-        res: Response = self._request_handler.patch(url=endpoint, params=params)
+        res: Response = self._request_handler.patch(url=endpoint, params=params, **self._body_kwargs(body))
         return res.text
 
     def patch_object(self,
@@ -261,7 +719,9 @@ class RestApiClient(ApiClient):
                      model: type,
                      params: dict = None,
                      sub_keys: List = None,
-                     extract_list: bool = False) -> object:
+                     extract_list: bool = False,
+                     body: Any = None,
+                     lazy: bool = False) -> object:
         """
         Make a PATCH request to the API
         Return an object of the specified type
@@ -276,11 +736,16 @@ class RestApiClient(ApiClient):
         :type sub_keys: list, optional
         :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
         :type extract_list: bool, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
+        :param lazy: Whether to return a list of objects as a LazyModelList, building each object when it is accessed
+        :type lazy: bool, optional
         :return: Object from the API response
         :rtype: object
         """
-        return self._request_handler.patch_object(url=endpoint, model=model, params=params, sub_keys=sub_keys,
-                                                  extract_list=extract_list)
+        res: Response = self._request_handler.patch(url=endpoint, params=params, **self._body_kwargs(body))
+        return self._parse_object(res, model=model, sub_keys=sub_keys, extract_list=extract_list, lazy=lazy)
 
     def delete(self, endpoint: str, params: dict = None) -> dict:
         """
@@ -293,7 +758,8 @@ class RestApiClient(ApiClient):
         :return: JSON data from the API response
         :rtype: dict
         """
-        return self._request_handler.delete_json(url=endpoint, params=params)
+        res: Response = self._request_handler.delete(url=endpoint, params=params)
+        return self._parse_json(res)
 
     def delete_blind(self, endpoint: str, params: dict = None) -> bool:
         """
@@ -329,7 +795,8 @@ class RestApiClient(ApiClient):
                       model: type,
                       params: dict = None,
                       sub_keys: List = None,
-                      extract_list: bool = False) -> object:
+                      extract_list: bool = False,
+                      lazy: bool = False) -> object:
         """
         Make a DELETE request to the API
         Return an object of the specified type
@@ -344,18 +811,233 @@ class RestApiClient(ApiClient):
         :type sub_keys: list, optional
         :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
         :type extract_list: bool, optional
+        :param lazy: Whether to return a list of objects as a LazyModelList, building each object when it is accessed
+        :type lazy: bool, optional
         :return: Object from the API response
         :rtype: object
         """
-        return self._request_handler.delete_object(url=endpoint, model=model, params=params, sub_keys=sub_keys,
-                                                   extract_list=extract_list)
+        res: Response = self._request_handler.delete(url=endpoint, params=params)
+        return self._parse_object(res, model=model, sub_keys=sub_keys, extract_list=extract_list, lazy=lazy)
+
+    def batch(self, method: str, requests: Iterable, max_workers: int = None, **kwargs) -> List[BatchResult]:
+        """
+        Make many requests concurrently using a bounded thread pool
+        Return one result per request, in the same order as the requests
+
+        :param method: Name of the client method to call for each request (e.g. "get", "get_object", "post_blind")
+        :type method: str
+        :param requests: Endpoint strings, (endpoint, params) tuples or BatchRequest objects
+        :type requests: iterable
+        :param max_workers: Maximum number of requests in flight (defaults to the per-host connection limit)
+        :type max_workers: int, optional
+        :param kwargs: Keyword arguments passed to every call (e.g. model, sub_keys, extract_list)
+        :type kwargs: dict, optional
+        :return: Results holding either the value or the error of each request
+        :rtype: list
+        """
+        results = list(self.batch_as_completed(method=method, requests=requests, max_workers=max_workers, **kwargs))
+        results.sort(key=lambda result: result.index)
+        return results
+
+    def batch_as_completed(self,
+                           method: str,
+                           requests: Iterable,
+                           max_workers: int = None,
+                           **kwargs) -> Iterator[BatchResult]:
+        """
+        Make many requests concurrently using a bounded thread pool
+        Yield one result per request as soon as it finishes
+
+        :param method: Name of the client method to call for each request (e.g. "get", "get_object", "post_blind")
+        :type method: str
+        :param requests: Endpoint strings, (endpoint, params) tuples or BatchRequest objects
+        :type requests: iterable
+        :param max_workers: Maximum number of requests in flight (defaults to the per-host connection limit)
+        :type max_workers: int, optional
+        :param kwargs: Keyword arguments passed to every call (e.g. model, sub_keys, extract_list)
+        :type kwargs: dict, optional
+        :return: Results holding either the value or the error of each request
+        :rtype: iterator
+        """
+        func = resolve_batch_method(client=self, method=method, allowed=_BATCH_METHODS)
+        batch = prepare_batch(requests)
+        if not batch:
+            return
+        workers = min(max_workers or self._pool_config.max_connections_per_host, len(batch))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(func, **merge_batch_kwargs(request, kwargs)): (index, request)
+                       for index, request in enumerate(batch)}
+            try:
+                for future in as_completed(futures):
+                    index, request = futures[future]
+                    error = future.exception()
+                    if error is not None:
+                        yield BatchResult(index=index, request=request, error=error)
+                    else:
+                        yield BatchResult(index=index, request=request, value=future.result())
+            finally:
+                # if the caller stops early, queued requests are dropped and only those already running are waited for
+                # (shutdown(cancel_futures=True) would need Python 3.9)
+                for future in futures:
+                    future.cancel()
+
+    def get_many(self, requests: Iterable, max_workers: int = None) -> List[BatchResult]:
+        """
+        Make many GET requests to the API concurrently
+
+        :param requests: Endpoint strings, (endpoint, params) tuples or BatchRequest objects
+        :type requests: iterable
+        :param max_workers: Maximum number of requests in flight (defaults to the per-host connection limit)
+        :type max_workers: int, optional
+        :return: Results holding either the JSON data or the error of each request, in request order
+        :rtype: list
+        """
+        return self.batch(method="get", requests=requests, max_workers=max_workers)
+
+    def get_object_many(self,
+                        requests: Iterable,
+                        model: type,
+                        sub_keys: List = None,
+                        extract_list: bool = False,
+                        max_workers: int = None) -> List[BatchResult]:
+        """
+        Make many GET requests to the API concurrently
+        Return an object of the specified type for each request
+
+        :param requests: Endpoint strings, (endpoint, params) tuples or BatchRequest objects
+        :type requests: iterable
+        :param model: a Pydantic model to generate from the response JSON data
+        :type model: type
+        :param sub_keys: A list of sub-keys to search for (in order) to find JSON data for model.
+        :type sub_keys: list, optional
+        :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
+        :type extract_list: bool, optional
+        :param max_workers: Maximum number of requests in flight (defaults to the per-host connection limit)
+        :type max_workers: int, optional
+        :return: Results holding either the object or the error of each request, in request order
+        :rtype: list
+        """
+        return self.batch(method="get_object", requests=requests, max_workers=max_workers, model=model,
+                          sub_keys=sub_keys, extract_list=extract_list)
 
 
 class AsyncRestApiClient(ApiClient):
-    def __init__(self, base_url: str, auth: ApiAuth, log_requests: bool = False):
-        super().__init__(auth._construct_handler(base_url=base_url, log_requests=log_requests))
-
-    async def get(self, endpoint: str, params: dict = None) -> AsyncResponse:
+    _body_argument: str = "content"
+    _async_bodies: bool = True
+    _flight_class: type = AsyncSingleFlight
+
+    def __init__(self,
+                 base_url: str,
+                 auth: ApiAuth,
+                 log_requests: Union[bool, LoggingPolicy] = False,
+                 pool_config: ConnectionPoolConfig = None,
+                 cache: ResponseCache = None,
+                 validators: ValidatorStore = None,
+                 json_backend: Union[str, JsonCodec] = None,
+                 rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None,
+                 single_flight: bool = False,
+                 hedge_policy: HedgePolicy = None,
+                 instrumentation: Instrumentation = None,
+                 transport: Transport = None,
+                 trusted_models: bool = False,
+                 encoding_policy: ContentEncodingPolicy = None,
+                 http2: bool = False,
+                 concurrency_limiter: AdaptiveConcurrencyLimiter = None):
+        # requests are logged by the session according to the logging policy, objectrest's unredacted logging stays off
+        super().__init__(auth._construct_handler(base_url=base_url, log_requests=False),
+                         pool_config=pool_config,
+                         auth=auth,
+                         cache=cache,
+                         validators=validators,
+                         json_backend=json_backend,
+                         rate_limiter=rate_limiter,
+                         retry_policy=retry_policy,
+                         circuit_breaker=circuit_breaker,
+                         single_flight=single_flight,
+                         hedge_policy=hedge_policy,
+                         instrumentation=instrumentation,
+                         logging_policy=_logging_policy(log_requests),
+                         transport=transport,
+                         trusted_models=trusted_models,
+                         encoding_policy=encoding_policy)
+        self._session: PooledAsyncSession = PooledAsyncSession(pool_config=self._pool_config,
+                                                               rate_limiter=self._rate_limiter,
+                                                               retry_policy=self._retry_policy,
+                                                               circuit_breaker=self._circuit_breaker,
+                                                               token_manager=self._token_manager,
+                                                               hedge_policy=self._hedge_policy,
+                                                               instrumentation=self._instrumentation,
+                                                               logging_policy=self._logging_policy,
+                                                               transport=self._transport,
+                                                               encoding_policy=self._encoding_policy,
+                                                               http2=http2,
+                                                               concurrency_limiter=concurrency_limiter,
+                                                               base_url=base_url)
+        self._request_handler._async_session = self._session
+        self._http2: bool = http2
+        self._concurrency_limiter: Union[AdaptiveConcurrencyLimiter, None] = concurrency_limiter
+
+    @property
+    def http2(self) -> bool:
+        return self._http2
+
+    @property
+    def concurrency_limiter(self) -> Union[AdaptiveConcurrencyLimiter, None]:
+        return self._concurrency_limiter
+
+    async def __aenter__(self) -> "AsyncRestApiClient":
+        if self._token_manager:
+            await self._token_manager.async_token()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Close all pooled connections held by this client, flush its request log and stop refreshing its token in the
+        background, unless other open clients share it
+        """
+        await self._session.close()
+        self._detach_token_manager()
+        if self._logging_policy:
+            self._logging_policy.close()
+
+    async def _load_get(self,
+                        endpoint: str,
+                        params: dict,
+                        parse: Callable[[AsyncResponse], Any],
+                        key: str = None) -> Tuple[Any, bool]:
+        record = self._validators.lookup(key) if self._validators and key else None
+        res: AsyncResponse = await self._request_handler.async_get(url=endpoint, params=params,
+                                                                   headers=record.headers if record else None)
+        if record and res.status_code == 304:
+            return self._validators.revalidated(key=key, record=record), True
+        value = parse(res)
+        ok = not res.is_error and value is not None
+        if ok and self._validators and key:
+            self._validators.store(key=key, headers=res.headers, value=value)
+        return value, ok
+
+    async def _cached_get(self,
+                          endpoint: str,
+                          params: dict,
+                          cache_ttl: float,
+                          variant: str,
+                          parse: Callable[[AsyncResponse], Any]) -> Any:
+        ttl = self._cache_ttl(endpoint=endpoint, cache_ttl=cache_ttl)
+        key = self._request_key(endpoint=endpoint, params=params, variant=variant) \
+            if ttl or self._validators or self._single_flight else None
+        load = partial(self._load_get, endpoint, params, parse, key)
+        if not ttl:
+            if self._single_flight:
+                return (await self._single_flight.do(key, load))[0]
+            return (await load())[0]
+        return await self._cache.async_fetch(key=key, ttl=ttl, loader=load)
+
+    async def get(self, endpoint: str, params: dict = None, cache_ttl: float = None) -> AsyncResponse:
         """
         Make a GET request to the API
 
@@ -363,17 +1045,23 @@ class AsyncRestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param cache_ttl: Seconds to cache the response for, overriding the cache's TTL (0 to bypass the cache)
+        :type cache_ttl: float, optional
         :return: JSON data from the API response
         :rtype: dict
         """
-        return await self._request_handler.async_get(url=endpoint, params=params)
+        snapshot = await self._cached_get(endpoint=endpoint, params=params, cache_ttl=cache_ttl,
+                                          variant="response_snapshot", parse=_response_snapshot)
+        return _snapshot_response(snapshot)
 
     async def get_object(self,
                          endpoint: str,
                          model: type,
                          params: dict = None,
                          sub_keys: List = None,
-                         extract_list: bool = False) -> object:
+                         extract_list: bool = False,
+                         cache_ttl: float = None,
+                         lazy: bool = False) -> object:
         """
         Make a GET request to the API
         Return an object of the specified type
@@ -388,13 +1076,243 @@ class AsyncRestApiClient(ApiClient):
         :type sub_keys: list, optional
         :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
         :type extract_list: bool, optional
+        :param cache_ttl: Seconds to cache the response for, overriding the cache's TTL (0 to bypass the cache)
+        :type cache_ttl: float, optional
+        :param lazy: Whether to return a list of objects as a LazyModelList, building each object when it is accessed
+        :type lazy: bool, optional
         :return: Object from the API response
         :rtype: object
         """
-        return await self._request_handler.async_get_object(url=endpoint, model=model, params=params, sub_keys=sub_keys,
-                                                            extract_list=extract_list)
+        return await self._cached_get(endpoint=endpoint, params=params, cache_ttl=cache_ttl,
+                                      variant=object_variant(model=model, sub_keys=sub_keys,
+                                                             extract_list=extract_list, lazy=lazy),
+                                      parse=partial(self._parse_object, model=model, sub_keys=sub_keys,
+                                                    extract_list=extract_list, lazy=lazy))
+
+    async def _fetch_page(self, request: PageRequest, sub_keys: List = None) -> Page:
+        endpoint, params = page_target(self._request_handler.base_url, request)
+        res: AsyncResponse = await self._request_handler.async_get(url=endpoint, params=params)
+        res.raise_for_status()
+        return Page(request=request, response=res, sub_keys=sub_keys, codec=self._codec)
+
+    async def paginate(self,
+                       endpoint: str,
+                       strategy: PaginationStrategy,
+                       model: type = None,
+                       params: dict = None,
+                       sub_keys: List = None,
+                       max_pages: int = None,
+                       prefetch: bool = True) -> AsyncIterator[Any]:
+        """
+        Make GET requests to the API for every page of a paginated endpoint
+        Yield an object of the specified type for each item, one page in memory at a time
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param strategy: How to request the next page (offset/limit, page number, cursor, Link header)
+        :type strategy: PaginationStrategy
+        :param model: a Pydantic model to generate from each item (JSON items are yielded as-is if None)
+        :type model: type, optional
+        :param params: Dictionary of parameters to add to url
+        :type params: dict, optional
+        :param sub_keys: A list of sub-keys to search for (in order) to find the list of items in each page
+        :type sub_keys: list, optional
+        :param max_pages: Maximum number of pages to fetch
+        :type max_pages: int, optional
+        :param prefetch: Whether to fetch the next page while the current one is being consumed
+        :type prefetch: bool, optional
+        :return: Objects from the API responses
+        :rtype: async iterator
+        """
+        build = model_adapter(model, trusted=self._trusted_models).build
+        pending = asyncio.ensure_future(
+            self._fetch_page(strategy.first_request(endpoint=endpoint, params=params), sub_keys))
+        pages = 0
+        try:
+            while pending:
+                page = await pending
+                pending = None
+                pages += 1
+                next_request = strategy.next_request(page) if not max_pages or pages < max_pages else None
+                if next_request and prefetch:
+                    pending = asyncio.ensure_future(self._fetch_page(next_request, sub_keys))
+                for item in page.items:
+                    yield build(item)
+                if next_request and not prefetch:
+                    pending = asyncio.ensure_future(self._fetch_page(next_request, sub_keys))
+        finally:
+            if pending:
+                pending.cancel()
+
+    async def stream_objects(self,
+                             endpoint: str,
+                             model: type = None,
+                             params: dict = None,
+                             sub_keys: List = None,
+                             chunk_size: int = 64 * 1024) -> AsyncIterator[Any]:
+        """
+        Make a GET request to the API
+        Parse the response incrementally, yielding an object of the specified type for each item of the list
+        found at sub_keys without loading the whole response into memory
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param model: a Pydantic model to generate from each item (JSON items are yielded as-is if None)
+        :type model: type, optional
+        :param params: Dictionary of parameters to add to url
+        :type params: dict, optional
+        :param sub_keys: A list of sub-keys to search for (in order) to find the list of items
+        :type sub_keys: list, optional
+        :param chunk_size: Number of bytes to read from the response at a time
+        :type chunk_size: int, optional
+        :return: Objects from the API response
+        :rtype: async iterator
+        """
+        build = model_adapter(model, trusted=self._trusted_models).build
+        policy = self._encoding_policy
+        res: AsyncResponse = await self._request_handler.async_get(url=endpoint, params=params, stream=True,
+                                                                   headers=policy.headers() if policy else None)
+        chunks = policy.aiter_content(res, chunk_size) if policy else res.aiter_bytes(chunk_size=chunk_size)
+        try:
+            res.raise_for_status()
+            parser = JsonItemStream(sub_keys=sub_keys)
+            async for chunk in chunks:
+                for item in parser.feed(chunk):
+                    yield build(item)
+                if parser.done:
+                    break
+            for item in parser.close():
+                yield build(item)
+        finally:
+            # closed here rather than whenever it is garbage collected, so the body is counted now
+            await chunks.aclose()
+            await res.aclose()
+
+    async def stream_bytes(self,
+                           endpoint: str,
+                           params: dict = None,
+                           chunk_size: int = 64 * 1024,
+                           offset: int = 0,
+                           max_resumes: int = 3) -> AsyncIterator[bytes]:
+        """
+        Make a GET request to the API
+        Yield the response body in chunks without loading it into memory
+        If the transfer is interrupted, the rest of the body is requested with a Range header
+
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param params: Dictionary of parameters to add to url
+        :type params: dict, optional
+        :param chunk_size: Number of bytes to read from the response at a time
+        :type chunk_size: int, optional
+        :param offset: Number of bytes at the start of the body to skip (requested with a Range header)
+        :type offset: int, optional
+        :param max_resumes: Maximum number of times to resume an interrupted transfer
+        :type max_resumes: int, optional
+        :return: Chunks of the response body
+        :rtype: async iterator
+        """
+        position = offset
+        resumes = 0
+        while True:
+            res: AsyncResponse = await self._request_handler.async_get(url=endpoint, params=params, stream=True,
+                                                                       headers=range_headers(position))
+            try:
+                start = range_start(res.status_code, res.headers, position)
+                if start is None:
+                    return
+                res.raise_for_status()
+                # a server that ignores the Range header sends the body from the start again
+                skip = position - start
+                async for chunk in res.aiter_bytes(chunk_size=chunk_size):
+                    if skip:
+                        if len(chunk) <= skip:
+                            skip -= len(chunk)
+                            continue
+                        chunk = chunk[skip:]
+                        skip = 0
+                    yield chunk
+                    position += len(chunk)
+                return
+            except INTERRUPTED_EXCEPTIONS:
+                if resumes >= max_resumes or is_encoded(res.headers):
+                    raise
+                resumes += 1
+            finally:
+                await res.aclose()
+
+    async def download(self,
+                       endpoint: str,
+                       destination: Destination,
+                       params: dict = None,
+                       chunk_size: int = 1024 * 1024,
+                       resume: bool = False,
+                       max_resumes: int = 3) -> int:
+        """
+        Make a GET request to the API
+        Write the response body to a file or buffer as it arrives, without loading it into memory
+        Files are written in a thread, so the event loop keeps running (and receiving the next chunk) during writes
 
-    async def post(self, endpoint: str, params: dict = None) -> AsyncResponse:
+        :param endpoint: URL endpoint
+        :type endpoint: str
+        :param destination: Path or binary file object to write to, or a preallocated bytearray or memoryview to fill
+        :type destination: str, os.PathLike, file object, bytearray or memoryview
+        :param params: Dictionary of parameters to add to url
+        :type params: dict, optional
+        :param chunk_size: Number of bytes to read from the response at a time
+        :type chunk_size: int, optional
+        :param resume: Whether to continue a partial download, from the end of the file at the path or from the
+            current position of the file object
+        :type resume: bool, optional
+        :param max_resumes: Maximum number of times to resume an interrupted transfer
+        :type max_resumes: int, optional
+        :return: Number of bytes of the body in the destination, including any bytes resumed from
+        :rtype: int
+        :raises ValueError: If the body does not fit in the buffer
+        """
+        if is_buffer(destination):
+            writer = BufferWriter(destination)
+            async for chunk in self.stream_bytes(endpoint=endpoint, params=params, chunk_size=chunk_size,
+                                                 max_resumes=max_resumes):
+                writer.write(chunk)
+            return writer.position
+        loop = asyncio.get_running_loop()
+        if is_path(destination):
+            offset = await loop.run_in_executor(None, file_offset, destination, resume)
+            file = await loop.run_in_executor(None, open, destination, "r+b" if offset else "wb")
+            try:
+                await loop.run_in_executor(None, file.seek, offset)
+                return offset + await self._write_chunks(file, endpoint, params, chunk_size, offset, max_resumes)
+            finally:
+                await loop.run_in_executor(None, file.close)
+        offset = destination.tell() if resume else 0
+        return offset + await self._write_chunks(destination, endpoint, params, chunk_size, offset, max_resumes)
+
+    async def _write_chunks(self, file: BinaryIO, endpoint: str, params: dict, chunk_size: int, offset: int,
+                            max_resumes: int) -> int:
+        loop = asyncio.get_running_loop()
+        chunks = self.stream_bytes(endpoint=endpoint, params=params, chunk_size=chunk_size, offset=offset,
+                                   max_resumes=max_resumes)
+        written = 0
+        pending = None
+        try:
+            async for chunk in chunks:
+                if pending is not None:
+                    await pending
+                # the next chunk is received while this one is written
+                pending = loop.run_in_executor(None, file.write, chunk)
+                written += len(chunk)
+            if pending is not None:
+                await pending
+                pending = None
+        finally:
+            if pending is not None:
+                # never leave a write running on a file the caller is about to close
+                await asyncio.gather(pending, return_exceptions=True)
+            await chunks.aclose()
+        return written
+
+    async def post(self, endpoint: str, params: dict = None, body: Any = None) -> AsyncResponse:
         """
         Make a POST request to the API
 
@@ -402,12 +1320,15 @@ class AsyncRestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: JSON data from the API response
         :rtype: dict
         """
-        return await self._request_handler.async_post(url=endpoint, params=params)
+        return await self._request_handler.async_post(url=endpoint, params=params, **self._body_kwargs(body))
 
-    async def post_blind(self, endpoint: str, params: dict = None) -> bool:
+    async def post_blind(self, endpoint: str, params: dict = None, body: Any = None) -> bool:
         """
         Make a POST request to the API
         Return a boolean indicating if the request was successful
@@ -416,10 +1337,13 @@ class AsyncRestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: True if the request was successful, False otherwise
         :rtype: bool
         """
-        res = await self._request_handler.async_post(url=endpoint, params=params)
+        res = await self._request_handler.async_post(url=endpoint, params=params, **self._body_kwargs(body))
         return _async_process_blind(res)
 
     async def post_object(self,
@@ -427,7 +1351,9 @@ class AsyncRestApiClient(ApiClient):
                           model: type,
                           params: dict = None,
                           sub_keys: List = None,
-                          extract_list: bool = False) -> object:
+                          extract_list: bool = False,
+                          body: Any = None,
+                          lazy: bool = False) -> object:
         """
         Make a POST request to the API
         Return an object of the specified type
@@ -442,14 +1368,19 @@ class AsyncRestApiClient(ApiClient):
         :type sub_keys: list, optional
         :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
         :type extract_list: bool, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
+        :param lazy: Whether to return a list of objects as a LazyModelList, building each object when it is accessed
+        :type lazy: bool, optional
         :return: Object from the API response
         :rtype: object
         """
-        return await self._request_handler.async_post_object(url=endpoint, model=model, params=params,
-                                                             sub_keys=sub_keys,
-                                                             extract_list=extract_list)
+        res: AsyncResponse = await self._request_handler.async_post(url=endpoint, params=params,
+                                                                    **self._body_kwargs(body))
+        return self._parse_object(res, model=model, sub_keys=sub_keys, extract_list=extract_list, lazy=lazy)
 
-    async def put(self, endpoint: str, params: dict = None) -> AsyncResponse:
+    async def put(self, endpoint: str, params: dict = None, body: Any = None) -> AsyncResponse:
         """
         Make a PUT request to the API
 
@@ -457,12 +1388,15 @@ class AsyncRestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: JSON data from the API response
         :rtype: dict
         """
-        return await self._request_handler.async_put(url=endpoint, params=params)
+        return await self._request_handler.async_put(url=endpoint, params=params, **self._body_kwargs(body))
 
-    async def put_blind(self, endpoint: str, params: dict = None) -> bool:
+    async def put_blind(self, endpoint: str, params: dict = None, body: Any = None) -> bool:
         """
         Make a PUT request to the API
         Return a boolean indicating if the request was successful
@@ -471,10 +1405,13 @@ class AsyncRestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: True if the request was successful, False otherwise
         :rtype: bool
         """
-        res = await self._request_handler.async_put(url=endpoint, params=params)
+        res = await self._request_handler.async_put(url=endpoint, params=params, **self._body_kwargs(body))
         return _async_process_blind(res)
 
     async def put_object(self,
@@ -482,7 +1419,9 @@ class AsyncRestApiClient(ApiClient):
                          model: type,
                          params: dict = None,
                          sub_keys: List = None,
-                         extract_list: bool = False) -> object:
+                         extract_list: bool = False,
+                         body: Any = None,
+                         lazy: bool = False) -> object:
         """
         Make a PUT request to the API
         Return an object of the specified type
@@ -497,13 +1436,19 @@ class AsyncRestApiClient(ApiClient):
         :type sub_keys: list, optional
         :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
         :type extract_list: bool, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
+        :param lazy: Whether to return a list of objects as a LazyModelList, building each object when it is accessed
+        :type lazy: bool, optional
         :return: Object from the API response
         :rtype: object
         """
-        return await self._request_handler.async_put_object(url=endpoint, model=model, params=params, sub_keys=sub_keys,
-                                                            extract_list=extract_list)
+        res: AsyncResponse = await self._request_handler.async_put(url=endpoint, params=params,
+                                                                   **self._body_kwargs(body))
+        return self._parse_object(res, model=model, sub_keys=sub_keys, extract_list=extract_list, lazy=lazy)
 
-    async def patch(self, endpoint: str, params: dict = None) -> AsyncResponse:
+    async def patch(self, endpoint: str, params: dict = None, body: Any = None) -> AsyncResponse:
         """
         Make a PATCH request to the API
 
@@ -511,12 +1456,15 @@ class AsyncRestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: JSON data from the API response
         :rtype: dict
         """
-        return await self._request_handler.async_patch(url=endpoint, params=params)
+        return await self._request_handler.async_patch(url=endpoint, params=params, **self._body_kwargs(body))
 
-    async def patch_blind(self, endpoint: str, params: dict = None) -> bool:
+    async def patch_blind(self, endpoint: str, params: dict = None, body: Any = None) -> bool:
         """
         Make a PATCH request to the API
         Return a boolean indicating if the request was successful
@@ -525,10 +1473,13 @@ class AsyncRestApiClient(ApiClient):
         :type endpoint: str
         :param params: Dictionary of parameters to add to url
         :type params: dict, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
         :return: True if the request was successful, False otherwise
         :rtype: bool
         """
-        res = await self._request_handler.async_patch(url=endpoint, params=params)
+        res = await self._request_handler.async_patch(url=endpoint, params=params, **self._body_kwargs(body))
         return _async_process_blind(res)
 
     async def patch_object(self,
@@ -536,7 +1487,9 @@ class AsyncRestApiClient(ApiClient):
                            model: type,
                            params: dict = None,
                            sub_keys: List = None,
-                           extract_list: bool = False) -> object:
+                           extract_list: bool = False,
+                           body: Any = None,
+                           lazy: bool = False) -> object:
         """
         Make a PATCH request to the API
         Return an object of the specified type
@@ -551,12 +1504,17 @@ class AsyncRestApiClient(ApiClient):
         :type sub_keys: list, optional
         :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
         :type extract_list: bool, optional
+        :param body: JSON-serializable request body, encoded with the client's JSON backend, or a body to stream
+            (StreamingBody, MultipartBody, file object, memory-mapped file, generator or async iterable)
+        :type body: object, optional
+        :param lazy: Whether to return a list of objects as a LazyModelList, building each object when it is accessed
+        :type lazy: bool, optional
         :return: Object from the API response
         :rtype: object
         """
-        return await self._request_handler.async_patch_object(url=endpoint, model=model, params=params,
-                                                              sub_keys=sub_keys,
-                                                              extract_list=extract_list)
+        res: AsyncResponse = await self._request_handler.async_patch(url=endpoint, params=params,
+                                                                     **self._body_kwargs(body))
+        return self._parse_object(res, model=model, sub_keys=sub_keys, extract_list=extract_list, lazy=lazy)
 
     async def delete(self, endpoint: str, params: dict = None) -> AsyncResponse:
         """
@@ -591,7 +1549,8 @@ class AsyncRestApiClient(ApiClient):
                             model: type,
                             params: dict = None,
                             sub_keys: List = None,
-                            extract_list: bool = False) -> object:
+                            extract_list: bool = False,
+                            lazy: bool = False) -> object:
         """
         Make a DELETE request to the API
         Return an object of the specified type
@@ -606,9 +1565,108 @@ class AsyncRestApiClient(ApiClient):
         :type sub_keys: list, optional
         :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
         :type extract_list: bool, optional
+        :param lazy: Whether to return a list of objects as a LazyModelList, building each object when it is accessed
+        :type lazy: bool, optional
         :return: Object from the API response
         :rtype: object
         """
-        return await self._request_handler.async_delete_object(url=endpoint, model=model, params=params,
-                                                               sub_keys=sub_keys,
-                                                               extract_list=extract_list)
+        res: AsyncResponse = await self._request_handler.async_delete(url=endpoint, params=params)
+        return self._parse_object(res, model=model, sub_keys=sub_keys, extract_list=extract_list, lazy=lazy)
+
+    def _batch_tasks(self, method: str, requests: Iterable, concurrency: int = None, **kwargs) -> List[asyncio.Task]:
+        func = resolve_batch_method(client=self, method=method, allowed=_ASYNC_BATCH_METHODS)
+        if not concurrency:
+            # with a concurrency limiter every request is started and the limiter decides how many are in flight
+            concurrency = self._concurrency_limiter.max_limit if self._concurrency_limiter \
+                else self._pool_config.max_connections_per_host
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(index: int, request) -> BatchResult:
+            async with semaphore:
+                try:
+                    value = await func(**merge_batch_kwargs(request, kwargs))
+                except Exception as error:
+                    return BatchResult(index=index, request=request, error=error)
+                return BatchResult(index=index, request=request, value=value)
+
+        return [asyncio.ensure_future(run(index, request)) for index, request in enumerate(prepare_batch(requests))]
+
+    async def gather(self, method: str, requests: Iterable, concurrency: int = None, **kwargs) -> List[BatchResult]:
+        """
+        Make many requests concurrently, limited by a semaphore
+        Return one result per request, in the same order as the requests
+
+        :param method: Name of the client method to call for each request (e.g. "get", "get_object", "post_blind")
+        :type method: str
+        :param requests: Endpoint strings, (endpoint, params) tuples or BatchRequest objects
+        :type requests: iterable
+        :param concurrency: Maximum number of requests in flight (defaults to the per-host connection limit,
+            or to the concurrency limiter's max_limit, which then adapts the number in flight)
+        :type concurrency: int, optional
+        :param kwargs: Keyword arguments passed to every call (e.g. model, sub_keys, extract_list)
+        :type kwargs: dict, optional
+        :return: Results holding either the value or the error of each request
+        :rtype: list
+        """
+        tasks = self._batch_tasks(method, requests, concurrency=concurrency, **kwargs)
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def gather_as_completed(self,
+                                  method: str,
+                                  requests: Iterable,
+                                  concurrency: int = None,
+                                  **kwargs) -> AsyncIterator[BatchResult]:
+        """
+        Make many requests concurrently, limited by a semaphore
+        Yield one result per request as soon as it finishes
+
+        :param method: Name of the client method to call for each request (e.g. "get", "get_object", "post_blind")
+        :type method: str
+        :param requests: Endpoint strings, (endpoint, params) tuples or BatchRequest objects
+        :type requests: iterable
+        :param concurrency: Maximum number of requests in flight (defaults to the per-host connection limit,
+            or to the concurrency limiter's max_limit, which then adapts the number in flight)
+        :type concurrency: int, optional
+        :param kwargs: Keyword arguments passed to every call (e.g. model, sub_keys, extract_list)
+        :type kwargs: dict, optional
+        :return: Results holding either the value or the error of each request
+        :rtype: async iterator
+        """
+        tasks = self._batch_tasks(method, requests, concurrency=concurrency, **kwargs)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def gather_objects(self,
+                             requests: Iterable,
+                             model: type,
+                             sub_keys: List = None,
+                             extract_list: bool = False,
+                             concurrency: int = None) -> List[BatchResult]:
+        """
+        Make many GET requests to the API concurrently
+        Return an object of the specified type for each request
+
+        :param requests: Endpoint strings, (endpoint, params) tuples or BatchRequest objects
+        :type requests: iterable
+        :param model: a Pydantic model to generate from the response JSON data
+        :type model: type
+        :param sub_keys: A list of sub-keys to search for (in order) to find JSON data for model.
+        :type sub_keys: list, optional
+        :param extract_list: If top-level of JSON is a list, whether to convert each list item into model or treat entire JSON as a whole object
+        :type extract_list: bool, optional
+        :param concurrency: Maximum number of requests in flight (defaults to the per-host connection limit,
+            or to the concurrency limiter's max_limit, which then adapts the number in flight)
+        :type concurrency: int, optional
+        :return: Results holding either the object or the error of each request, in request order
+        :rtype: list
+        """
+        return await self.gather(method="get_object", requests=requests, concurrency=concurrency, model=model,
+                                 sub_keys=sub_keys, extract_list=extract_list)
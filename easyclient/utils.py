@@ -1,8 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Union, List, Iterable
 
-from pytz import timezone
-
 
 def make_plural(word, count: int, suffix_override: str = 's') -> str:
     if count > 1:
@@ -39,6 +37,8 @@ def milliseconds_to_minutes_seconds(milliseconds: int) -> str:
 
 def now_plus_milliseconds(milliseconds: int, timezone_code: str = None) -> datetime:
     if timezone_code:
+        from pytz import timezone  # pytz is slow to import and only needed here
+
         now = datetime.now(timezone(timezone_code))  # will raise exception if invalid timezone_code
     else:
         now = datetime.now()
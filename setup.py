@@ -50,6 +50,7 @@ setuptools.setup(
     install_requires=REQUIREMENTS,
     extras_require={
         "dev": DEV_REQUIREMENTS,
+        "http2": ["h2>=3,<5"],
     },
     test_suite="test",
     classifiers=[
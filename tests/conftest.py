@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Union
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from benchmarks.server import StubServer, _StubHandler
+
+
+class Request:
+    def __init__(self, method: str, path: str, headers: Dict[str, str], body: bytes):
+        """
+        A request received by the scripted server
+
+        :param method: HTTP method
+        :type method: str
+        :param path: Path and query string
+        :type path: str
+        :param headers: Request headers
+        :type headers: dict
+        :param body: Request body, with chunked transfer encoding undone
+        :type body: bytes
+        """
+        self.method: str = method
+        self.path: str = path
+        self.headers: Dict[str, str] = headers
+        self.body: bytes = body
+
+    @property
+    def endpoint(self) -> str:
+        return urlsplit(self.path).path
+
+    @property
+    def query(self) -> Dict[str, List[str]]:
+        return parse_qs(urlsplit(self.path).query)
+
+    def header(self, name: str) -> Union[str, None]:
+        return next((value for key, value in self.headers.items() if key.lower() == name.lower()), None)
+
+
+class Reply:
+    def __init__(self,
+                 status: int = 200,
+                 body: Union[bytes, object] = b"",
+                 headers: Dict[str, str] = None,
+                 delay: float = 0.0,
+                 truncate: int = None):
+        """
+        A response for the scripted server to send
+
+        :param status: Status code
+        :type status: int, optional
+        :param body: Body, JSON-encoded unless it is bytes
+        :type body: bytes or object, optional
+        :param headers: Response headers
+        :type headers: dict, optional
+        :param delay: Seconds to wait before responding
+        :type delay: float, optional
+        :param truncate: Number of body bytes to send before dropping the connection (None to send it all)
+        :type truncate: int, optional
+        """
+        self.status: int = status
+        self.headers: Dict[str, str] = dict(headers or {})
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+            self.headers.setdefault("Content-Type", "application/json")
+        self.body: bytes = body
+        self.delay: float = delay
+        self.truncate: Union[int, None] = truncate
+
+
+class _ScriptedHandler(_StubHandler):
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b";", 1)[0], 16)
+            if not size:
+                self.rfile.readline()
+                return b"".join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    def _respond(self) -> None:
+        request = Request(self.command, self.path, dict(self.headers.items()), self._read_body())
+        reply = self.server.reply(request)
+        if reply.delay:
+            time.sleep(reply.delay)
+        self.send_response(reply.status)
+        for name, value in reply.headers.items():
+            self.send_header(name, value)
+        if "Content-Length" not in reply.headers:
+            self.send_header("Content-Length", str(len(reply.body)))
+        self.end_headers()
+        if self.command == "HEAD" or reply.status == 304:
+            return
+        if reply.truncate is None:
+            self.wfile.write(reply.body)
+            return
+        self.wfile.write(reply.body[:reply.truncate])
+        self.wfile.flush()
+        self.close_connection = True
+
+    do_GET = _respond
+    do_POST = _respond
+    do_PUT = _respond
+    do_PATCH = _respond
+    do_DELETE = _respond
+    do_HEAD = _respond
+
+
+class ScriptedServer(StubServer):
+    handler_class = _ScriptedHandler
+
+    def __init__(self, handler: Callable[[Request], Reply] = None):
+        """
+        A local stub server answering each request with whatever its handler returns, and keeping every request
+
+        :param handler: Function building the reply to a request (the default answers {"ok": true})
+        :type handler: callable, optional
+        """
+        super().__init__()
+        self.handler: Callable[[Request], Reply] = handler or (lambda request: Reply(body={"ok": True}))
+        self.received: List[Request] = []
+        self._received_lock: threading.Lock = threading.Lock()
+
+    def reply(self, request: Request) -> Reply:
+        with self._received_lock:
+            self.received.append(request)
+        return self.handler(request)
+
+    def script(self, *replies: Reply) -> None:
+        """
+        Answer the next requests with the given replies in order, then with the last one
+        """
+        queue = list(replies)
+        lock = threading.Lock()
+
+        def handler(request: Request) -> Reply:
+            with lock:
+                return queue.pop(0) if len(queue) > 1 else queue[0]
+
+        self.handler = handler
+
+
+@pytest.fixture
+def server() -> ScriptedServer:
+    with ScriptedServer() as stub:
+        yield stub
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+
+from conftest import Reply
+from easyclient import ApiAuthNone, AsyncRestApiClient, BatchRequest, RestApiClient
+
+
+class _Tracker:
+    def __init__(self, delay: float = 0.05):
+        """
+        Answer each request with its endpoint after a delay, keeping track of how many are in flight
+        """
+        self.delay: float = delay
+        self.in_flight: int = 0
+        self.peak: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def __call__(self, request) -> Reply:
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if request.endpoint == "/broken":
+            return Reply(body={"cut": "off"}, truncate=2)
+        return Reply(body={"endpoint": request.endpoint, "a": request.query.get("a")})
+
+
+@pytest.fixture
+def client(server):
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+        yield client
+
+
+def test_results_are_in_request_order(server, client):
+    # later requests answer first
+    server.handler = lambda request: Reply(body={"endpoint": request.endpoint},
+                                           delay=0.1 if request.endpoint == "/first" else 0)
+    batch = ["/first", ("/second", {"a": 1}), BatchRequest("/third")]
+    assert [result.index for result in client.batch_as_completed("get", batch)][-1] == 0
+    results = client.batch("get", batch)
+    assert [result.index for result in results] == [0, 1, 2]
+    assert [result.unwrap()["endpoint"] for result in results] == ["/first", "/second", "/third"]
+    assert [request.query for request in server.received if request.endpoint == "/second"] == [{"a": ["1"]}] * 2
+
+
+def test_a_failed_request_only_fails_its_own_result(server, client):
+    server.handler = _Tracker(delay=0)
+    results = client.batch("get", ["/item", "/broken", "/other"])
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, requests.exceptions.RequestException)
+    with pytest.raises(requests.exceptions.RequestException):
+        results[1].unwrap()
+    assert results[2].value["endpoint"] == "/other"
+
+
+def test_requests_in_flight_are_bounded_by_max_workers(server, client):
+    server.handler = tracker = _Tracker()
+    results = client.batch("get", [f"/item/{index}" for index in range(12)], max_workers=3)
+    assert all(result.ok for result in results)
+    assert tracker.peak == 3
+
+
+def test_unknown_methods_are_refused(client):
+    with pytest.raises(ValueError):
+        client.batch("download", ["/item"])
+
+
+def test_stopping_early_drops_queued_requests(server, client):
+    server.handler = _Tracker(delay=0.2)
+    started = time.perf_counter()
+    for result in client.batch_as_completed("get", [f"/item/{index}" for index in range(20)], max_workers=2):
+        assert result.ok
+        break
+    # only the requests already running are waited for
+    assert time.perf_counter() - started < 1
+    assert len(server.received) <= 4
+
+
+def test_gather_orders_results_and_bounds_concurrency(server):
+    server.handler = tracker = _Tracker()
+
+    async def run() -> list:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+            return await client.gather("get", [f"/item/{index}" for index in range(10)], concurrency=4)
+
+    results = asyncio.run(run())
+    assert [result.value.json()["endpoint"] for result in results] == [f"/item/{index}" for index in range(10)]
+    assert tracker.peak == 4
+
+
+def test_gather_as_completed_cancels_the_rest_when_stopped(server):
+    server.handler = _Tracker(delay=0.2)
+
+    async def run() -> int:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+            results = client.gather_as_completed("get", [f"/item/{index}" for index in range(20)], concurrency=2)
+            async for result in results:
+                await results.aclose()
+                return result.index
+
+    started = time.perf_counter()
+    assert asyncio.run(run()) in (0, 1)
+    assert time.perf_counter() - started < 1
+    assert len(server.received) <= 4
@@ -0,0 +1,78 @@
+import asyncio
+import gzip
+import io
+from email.parser import BytesParser
+
+import pytest
+
+from conftest import Reply
+from easyclient import ApiAuthNone, AsyncRestApiClient, MultipartBody, RestApiClient, RetryPolicy, StreamingBody
+
+
+def _parts(request) -> list:
+    message = BytesParser().parsebytes(b"Content-Type: " + request.header("Content-Type").encode() + b"\r\n\r\n"
+                                       + request.body)
+    return [(part.get_param("name", header="Content-Disposition"), part.get_filename(), part.get_content_type(),
+             part.get_payload(decode=True)) for part in message.get_payload()]
+
+
+def test_multipart_framing(server):
+    body = MultipartBody(fields={"title": "Q3 \"report\"", "odd\"name": "x"},
+                         files={"upload": ("report.csv", io.BytesIO(b"a,b\n1,2\n")),
+                                "raw": ("data", b"\x00\x01", "application/x-raw")},
+                         boundary="boundary42", chunk_size=4)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+        client.post(endpoint="/upload", body=body)
+    request = server.received[0]
+    assert request.header("Content-Type") == "multipart/form-data; boundary=boundary42"
+    assert int(request.header("Content-Length")) == len(request.body) == body.length
+    assert request.body.endswith(b"--boundary42--\r\n")
+    assert _parts(request) == [
+        ("title", None, "text/plain", b"Q3 \"report\""),
+        ("odd%22name", None, "text/plain", b"x"),
+        ("upload", "report.csv", "text/csv", b"a,b\n1,2\n"),
+        ("raw", "data", "application/x-raw", b"\x00\x01"),
+    ]
+
+
+def test_generator_body_is_sent_chunked_and_gzipped(server):
+    body = StreamingBody((chunk for chunk in (b"hello ", b"world")), content_type="text/plain", gzip=True)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+        client.put(endpoint="/item", body=body)
+    request = server.received[0]
+    assert request.header("Transfer-Encoding") == "chunked"
+    assert request.header("Content-Encoding") == "gzip"
+    assert gzip.decompress(request.body) == b"hello world"
+
+
+def test_file_body_is_sent_again_on_retry_but_generator_body_is_not(server):
+    server.script(Reply(status=503), Reply(body={"ok": True}))
+    policy = RetryPolicy(max_attempts=3, backoff_base=0.01)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), retry_policy=policy) as client:
+        client.put(endpoint="/file", body=io.BytesIO(b"payload"))
+        server.script(Reply(status=503), Reply(body={"ok": True}))
+        client.put(endpoint="/generator", body=iter([b"payload"]))
+    assert [(request.endpoint, request.body) for request in server.received] == [
+        ("/file", b"payload"), ("/file", b"payload"), ("/generator", b"payload"),
+    ]
+
+
+def test_iterator_body_can_only_be_sent_once():
+    body = StreamingBody(iter([b"a"]))
+    assert not body.replayable
+    assert list(body.chunks()) == [b"a"]
+    with pytest.raises(ValueError):
+        body.chunks()
+
+
+def test_async_multipart_from_an_async_iterable(server):
+    async def source():
+        for chunk in (b"first ", b"second"):
+            yield chunk
+
+    async def run() -> None:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+            await client.post(endpoint="/upload", body=MultipartBody(files={"log": ("log.txt", source())}))
+
+    asyncio.run(run())
+    assert _parts(server.received[0]) == [("log", "log.txt", "text/plain", b"first second")]
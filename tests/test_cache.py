@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+from conftest import Reply
+from easyclient import ApiAuthNone, AsyncRestApiClient, RestApiClient
+from easyclient.client.base.cache import MemoryCache, ResponseCache, SQLiteCache
+from easyclient.client.base.conditional import ValidatorStore
+
+
+class Item:
+    built = 0
+
+    def __init__(self, id: int, tags: list = None):
+        self.id = id
+        self.tags = tags
+        Item.built += 1
+
+
+def test_get_is_served_from_cache(server):
+    cache = ResponseCache(ttl=60)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), cache=cache) as client:
+        first = client.get(endpoint="/item", params={"a": 1})
+        second = client.get(endpoint="/item", params={"a": 1})
+        client.get(endpoint="/item", params={"a": 2})
+    assert first == second == {"ok": True}
+    assert len(server.received) == 2
+    assert cache.stats.hits == 1
+
+
+def test_cache_ttl_zero_bypasses_cache(server):
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), cache=ResponseCache(ttl=60)) as client:
+        client.get(endpoint="/item")
+        client.get(endpoint="/item", cache_ttl=0)
+    assert len(server.received) == 2
+
+
+def test_entries_expire(server):
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), cache=ResponseCache(ttl=0.05)) as client:
+        client.get(endpoint="/item")
+        time.sleep(0.1)
+        client.get(endpoint="/item")
+    assert len(server.received) == 2
+
+
+def test_endpoint_ttls_override_default(server):
+    cache = ResponseCache(ttl=60, endpoint_ttls={"/live/*": 0})
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), cache=cache) as client:
+        for _ in range(2):
+            client.get(endpoint="/live/score")
+            client.get(endpoint="/static/rules")
+    assert [request.endpoint for request in server.received] == ["/live/score", "/static/rules", "/live/score"]
+
+
+def test_error_responses_are_not_cached(server):
+    server.script(Reply(status=500, body={"error": True}), Reply(body={"ok": True}))
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), cache=ResponseCache(ttl=60)) as client:
+        client.get(endpoint="/item")
+        assert client.get(endpoint="/item") == {"ok": True}
+        assert client.get(endpoint="/item") == {"ok": True}
+    assert len(server.received) == 2
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a").value == 1
+    assert cache.stats.evictions == 1
+
+
+def test_sqlite_cache_keeps_objects(server, tmp_path):
+    server.handler = lambda request: Reply(body={"id": 7})
+    cache = ResponseCache(backend=SQLiteCache(str(tmp_path / "cache.db")), ttl=60)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), cache=cache) as client:
+        client.get_object(endpoint="/item", model=Item)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), cache=cache) as client:
+        item = client.get_object(endpoint="/item", model=Item)
+    assert item.id == 7
+    assert len(server.received) == 1
+
+
+def test_async_get_hits_return_separate_responses(server, tmp_path):
+    server.handler = lambda request: Reply(body={"id": 7}, headers={"ETag": '"v1"'})
+
+    async def run(cache: ResponseCache) -> list:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone(), cache=cache) as client:
+            return [await client.get(endpoint="/item") for _ in range(3)]
+
+    for backend in (MemoryCache(), SQLiteCache(str(tmp_path / "cache.db"))):
+        server.received.clear()
+        responses = asyncio.run(run(ResponseCache(backend=backend, ttl=60)))
+        assert len(server.received) == 1
+        assert len({id(response) for response in responses}) == 3
+        responses[0].headers["ETag"] = '"changed"'
+        assert [response.json() for response in responses] == [{"id": 7}] * 3
+        assert [response.headers["ETag"] for response in responses[1:]] == ['"v1"', '"v1"']
+        assert all(response.status_code == 200 for response in responses)
+
+
+def test_mutating_a_cached_value_does_not_change_later_hits(server):
+    server.handler = lambda request: Reply(body={"id": 7, "tags": ["a"]})
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), cache=ResponseCache(ttl=60)) as client:
+        first = client.get(endpoint="/item")
+        first["tags"].append("changed")
+        second = client.get(endpoint="/item")
+        second["id"] = 8
+        item = client.get_object(endpoint="/item", model=Item)
+        item.tags.append("changed")
+        assert client.get(endpoint="/item") == {"id": 7, "tags": ["a"]}
+        assert client.get_object(endpoint="/item", model=Item).tags == ["a"]
+    assert len(server.received) == 2
+
+
+def test_memory_cache_copies_values_unless_told_not_to():
+    cache = MemoryCache()
+    value = {"nested": [1]}
+    cache.set("a", value, ttl=60)
+    value["nested"].append(2)
+    assert cache.get("a").value == {"nested": [1]}
+    assert cache.get("a").value is not cache.get("a").value
+    shared = MemoryCache(copy_values=False)
+    shared.set("a", value, ttl=60)
+    assert shared.get("a").value is value
+
+
+def test_memory_cache_deep_copies_values_it_cannot_pickle():
+    cache = MemoryCache()
+    value = {"parse": lambda text: text}
+    cache.set("a", value, ttl=60)
+    assert cache.get("a").value is not value
+    assert cache.get("a").value["parse"]("x") == "x"
+
+
+def test_not_modified_returns_the_stored_object_without_parsing_it_again(server):
+    server.handler = lambda request: Reply(status=304) if request.header("If-None-Match") == '"v1"' \
+        else Reply(body={"id": 7}, headers={"ETag": '"v1"'})
+    validators = ValidatorStore()
+    Item.built = 0
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), validators=validators) as client:
+        first = client.get_object(endpoint="/item", model=Item)
+        first.id = 8
+        second = client.get_object(endpoint="/item", model=Item)
+        data = client.get(endpoint="/item")
+        data["id"] = 8
+        assert client.get(endpoint="/item") == {"id": 7}
+    assert second.id == 7 and second is not first
+    assert Item.built == 1
+    assert (validators.modified, validators.not_modified) == (2, 2)
+    assert [request.header("If-None-Match") for request in server.received] == [None, '"v1"', None, '"v1"']
@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+import pytest
+
+from conftest import Reply
+from easyclient import CircuitBreaker, CircuitOpenError, TokenManager
+from easyclient.client.base.ratelimit import RateLimiter, TokenBucket
+from easyclient.client.base.session import PooledAsyncSession, PooledSession
+
+
+@pytest.fixture
+def sessions():
+    opened = []
+
+    def open_session(**kwargs) -> PooledSession:
+        opened.append(PooledSession(**kwargs))
+        return opened[-1]
+
+    yield open_session
+    for session in opened:
+        session.close()
+
+
+def _half_open(breaker: CircuitBreaker, name: str) -> None:
+    circuit = breaker.circuit(name)
+    circuit.record_failure()
+    time.sleep(breaker.recovery_timeout)
+    assert circuit.state == "half_open"
+
+
+def test_circuit_opens_after_consecutive_failures_and_fails_fast(server, sessions):
+    server.script(Reply(status=503))
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    session = sessions(circuit_breaker=breaker, base_url=server.base_url)
+    for _ in range(2):
+        assert session.request("GET", f"{server.base_url}/item").status_code == 503
+    with pytest.raises(CircuitOpenError) as error:
+        session.request("GET", f"{server.base_url}/item")
+    assert error.value.retry_after > 0
+    assert len(server.received) == 2
+    assert breaker.states() == {server.base_url: "open"}
+
+
+def test_half_open_trial_closes_the_circuit_on_success(server, sessions):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    _half_open(breaker, server.base_url)
+    session = sessions(circuit_breaker=breaker, base_url=server.base_url)
+    assert session.request("GET", f"{server.base_url}/item").status_code == 200
+    assert breaker.states() == {server.base_url: "closed"}
+
+
+def test_half_open_trial_reopens_the_circuit_on_failure(server, sessions):
+    server.script(Reply(status=503))
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    _half_open(breaker, server.base_url)
+    session = sessions(circuit_breaker=breaker, base_url=server.base_url)
+    session.request("GET", f"{server.base_url}/item")
+    assert breaker.states() == {server.base_url: "open"}
+
+
+def test_endpoint_patterns_get_their_own_circuit(server, sessions):
+    server.handler = lambda request: Reply(status=503 if request.endpoint.startswith("/search") else 200)
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60, endpoint_patterns=["/search*"])
+    session = sessions(circuit_breaker=breaker, base_url=server.base_url)
+    session.request("GET", f"{server.base_url}/search")
+    with pytest.raises(CircuitOpenError):
+        session.request("GET", f"{server.base_url}/search")
+    assert session.request("GET", f"{server.base_url}/item").status_code == 200
+    assert breaker.states()[f"{server.base_url}/search*"] == "open"
+
+
+def test_failure_before_sending_gives_back_the_trial_slot(server, sessions):
+    responses = [RuntimeError("token endpoint down"), {"access_token": "abc", "expires_in": 3600}]
+
+    def fetch_token() -> dict:
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    token_manager = TokenManager("id", "secret", f"{server.base_url}/token", fetch_token=fetch_token,
+                                 auto_refresh=False)
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    _half_open(breaker, server.base_url)
+    session = sessions(circuit_breaker=breaker, token_manager=token_manager, base_url=server.base_url)
+    with pytest.raises(RuntimeError):
+        session.request("GET", f"{server.base_url}/item")
+    assert breaker.states() == {server.base_url: "half_open"}
+    assert session.request("GET", f"{server.base_url}/item").status_code == 200
+    assert breaker.states() == {server.base_url: "closed"}
+    assert server.received[0].header("Authorization") == "Bearer abc"
+
+
+def test_cancelled_request_gives_back_the_trial_slot(server):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    _half_open(breaker, server.base_url)
+    # the bucket starts empty, so the first request waits on the rate limiter until it is cancelled
+    limiter = RateLimiter(limit=TokenBucket(rate=1, capacity=1))
+    limiter.acquire("/item")
+
+    async def run() -> int:
+        session = PooledAsyncSession(circuit_breaker=breaker, rate_limiter=limiter, base_url=server.base_url)
+        waiting = asyncio.ensure_future(session.request("GET", f"{server.base_url}/item"))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        try:
+            return (await session.request("GET", f"{server.base_url}/item")).status_code
+        finally:
+            await session.close()
+
+    assert asyncio.run(run()) == 200
+    assert breaker.states() == {server.base_url: "closed"}
@@ -0,0 +1,65 @@
+import json
+import sys
+
+import pytest
+
+from conftest import Reply
+from easyclient import ApiAuthNone, RestApiClient
+from easyclient.client.base.codec import JsonCodec, get_codec
+
+DATA = {"name": "café", "values": [1, 2.5, None, True], "nested": {"empty": []}}
+
+
+class CountingCodec(JsonCodec):
+    name = "counting"
+
+    def __init__(self):
+        self.loaded = 0
+        self.dumped = 0
+
+    def loads(self, data):
+        self.loaded += 1
+        return super().loads(data)
+
+    def dumps(self, obj) -> bytes:
+        self.dumped += 1
+        return super().dumps(obj)
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson", "ujson"])
+def test_backends_round_trip(backend):
+    if backend != "json":
+        pytest.importorskip(backend)
+    codec = get_codec(backend)
+    assert codec.name == backend
+    assert codec.loads(codec.dumps(DATA)) == DATA
+    assert codec.loads(json.dumps(DATA).encode()) == DATA
+    assert isinstance(codec.dumps(DATA), bytes)
+
+
+@pytest.mark.parametrize("backend", ["orjson", "ujson"])
+def test_missing_backend_falls_back_to_the_standard_library(monkeypatch, backend):
+    monkeypatch.setitem(sys.modules, backend, None)
+    codec = get_codec(backend)
+    assert type(codec) is JsonCodec
+    assert codec.loads(codec.dumps(DATA)) == DATA
+
+
+def test_codecs_are_resolved_by_name_or_passed_through():
+    codec = CountingCodec()
+    assert get_codec(codec) is codec
+    assert type(get_codec()) is JsonCodec
+    with pytest.raises(ValueError):
+        get_codec("simplejson")
+
+
+def test_each_client_uses_its_own_codec(server):
+    server.handler = lambda request: Reply(body={"echo": json.loads(request.body or b"null")})
+    codec = CountingCodec()
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), json_backend=codec) as counted, \
+            RestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as default:
+        assert counted.codec is codec and type(default.codec) is JsonCodec
+        assert counted.post(endpoint="/echo", body=DATA) == {"echo": DATA}
+        assert default.post(endpoint="/echo", body=DATA) == {"echo": DATA}
+        assert default.get(endpoint="/echo") == {"echo": None}
+    assert (codec.loaded, codec.dumped) == (1, 1)
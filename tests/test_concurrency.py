@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from benchmarks.server import StubServer
+from easyclient import AdaptiveConcurrencyLimiter, ApiAuthNone, AsyncRestApiClient
+
+
+async def _hold(limit, slots: int) -> None:
+    for _ in range(slots):
+        await limit.acquire()
+
+
+async def _drive(limit, latency: float, count: int) -> None:
+    # keeps the limit fully used, releasing one request with the given latency and sending another
+    await _hold(limit, limit.limit - limit.in_flight)
+    for _ in range(count):
+        limit.release(time.monotonic() - latency, overloaded=False)
+        await _hold(limit, limit.limit - limit.in_flight)
+
+
+def test_configuration_is_validated():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(algorithm="vegas")
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(min_limit=10, max_limit=5)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(backoff_ratio=1)
+
+
+def test_overload_signals():
+    limiter = AdaptiveConcurrencyLimiter()
+    assert limiter.is_overload(status_code=503) is True
+    assert limiter.is_overload(status_code=404) is False
+    assert limiter.is_overload(error=requests.exceptions.ConnectionError()) is True
+    assert limiter.is_overload(error=ValueError()) is None
+
+
+def test_aimd_grows_additively_while_the_limit_is_used():
+    limit = AdaptiveConcurrencyLimiter(initial_limit=4).limit("api")
+    asyncio.run(_drive(limit, latency=0.01, count=40))
+    assert limit.limit >= 8
+    assert {reason for _, _, reason in limit.history} == {"initial", "increase"}
+
+
+def test_aimd_backs_off_once_per_overloaded_batch():
+    limit = AdaptiveConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5).limit("api")
+
+    async def run() -> None:
+        started = [await limit.acquire() for _ in range(3)]
+        # requests sent before the first overload was seen do not lower the limit again
+        for value in started:
+            limit.release(value, overloaded=True)
+        assert limit.limit == 5
+        limit.release(await limit.acquire(), overloaded=True)
+
+    asyncio.run(run())
+    assert (limit.limit, limit.overloads, limit.decreases) == (2, 4, 2)
+
+
+def test_aimd_treats_slow_responses_as_overload():
+    limit = AdaptiveConcurrencyLimiter(initial_limit=10, latency_threshold=0.05, backoff_ratio=0.5).limit("api")
+
+    async def run() -> None:
+        limit.release(await limit.acquire() - 0.1, overloaded=False)
+
+    asyncio.run(run())
+    assert limit.limit == 5
+    assert limit.history[-1][2] == "latency"
+
+
+def test_gradient_grows_while_latency_is_flat_and_shrinks_when_it_rises():
+    limit = AdaptiveConcurrencyLimiter(algorithm="gradient", initial_limit=10, window=5).limit("api")
+
+    async def run() -> tuple:
+        await _drive(limit, latency=0.01, count=50)
+        grown = limit.limit
+        await _drive(limit, latency=0.1, count=50)
+        return grown, limit.limit
+
+    grown, shrunk = asyncio.run(run())
+    assert grown > 10
+    assert shrunk < grown
+
+
+def test_waiters_get_slots_in_order_and_cancelled_ones_are_skipped():
+    limit = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1).limit("api")
+
+    async def run() -> list:
+        started = await limit.acquire()
+        cancelled = asyncio.ensure_future(limit.acquire())
+        waiting = asyncio.ensure_future(limit.acquire())
+        await asyncio.sleep(0)
+        assert limit.waiting == 2
+        cancelled.cancel()
+        limit.release(started, overloaded=False)
+        await waiting
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return [limit.in_flight, limit.waiting]
+
+    assert asyncio.run(run()) == [1, 0]
+
+
+def test_client_adapts_to_an_upstream_shedding_load():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=20, max_limit=40)
+
+    async def run(base_url: str) -> list:
+        async with AsyncRestApiClient(base_url=base_url, auth=ApiAuthNone(), concurrency_limiter=limiter) as client:
+            return await client.gather("get", [f"/item/{index}" for index in range(200)])
+
+    with StubServer(latency=0.01, capacity=4) as server:
+        results = asyncio.run(run(server.base_url))
+        limit = limiter.limits()[server.base_url]
+    assert all(result.error is None for result in results)
+    assert limit < 20
+    assert limiter.snapshot()[server.base_url]["overloads"] > 0
@@ -0,0 +1,137 @@
+import asyncio
+import gzip
+import io
+import random
+
+import pytest
+import requests
+
+from conftest import Reply
+from easyclient import ApiAuthNone, AsyncRestApiClient, RestApiClient
+
+BODY = bytes(range(256)) * 400
+# does not compress, so a cut-off gzip body stops about as far into the body as an identity one
+NOISE = random.Random(0).randbytes(40000)
+
+
+def _resumed_from(request) -> int:
+    # chunks cut off part way are requested again, so the transfer resumes from a chunk boundary
+    return int(request.header("Range")[len("bytes="):-1])
+
+
+def _ranged(cut_at: int = None, honour_range: bool = True, body: bytes = BODY, compress: bool = False):
+    """
+    Serve a body honouring Range headers, dropping the connection after cut_at bytes of the first response
+    If compress is set, the body is gzipped for clients accepting it, and ranges address the gzipped body
+    """
+    calls = []
+
+    def handler(request) -> Reply:
+        calls.append(request)
+        truncate = cut_at if len(calls) == 1 else None
+        encoded = compress and "gzip" in (request.header("Accept-Encoding") or "")
+        sent = gzip.compress(body, mtime=0) if encoded else body
+        headers = {"Content-Encoding": "gzip"} if encoded else {}
+        header = request.header("Range")
+        start = int(header[len("bytes="):-1]) if header and honour_range else 0
+        if start >= len(sent):
+            return Reply(status=416, headers={"Content-Range": f"bytes */{len(sent)}"})
+        if not start:
+            return Reply(body=sent, truncate=truncate, headers=headers)
+        headers["Content-Range"] = f"bytes {start}-{len(sent) - 1}/{len(sent)}"
+        return Reply(status=206, body=sent[start:], truncate=truncate, headers=headers)
+
+    return handler
+
+
+@pytest.fixture
+def client(server):
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+        yield client
+
+
+def test_interrupted_download_resumes_with_a_range_request(server, client):
+    server.handler = _ranged(cut_at=10000)
+    buffer = bytearray(len(BODY))
+    assert client.download(endpoint="/file", destination=buffer, chunk_size=4096) == len(BODY)
+    assert bytes(buffer) == BODY
+    assert len(server.received) == 2 and server.received[0].header("Range") is None
+    assert 0 < _resumed_from(server.received[1]) <= 10000
+
+
+def test_compressible_body_is_requested_unencoded_so_it_resumes_at_the_right_offset(server, client):
+    server.handler = _ranged(cut_at=10000, body=NOISE, compress=True)
+    file = io.BytesIO()
+    assert client.download(endpoint="/file", destination=file, chunk_size=4096) == len(NOISE)
+    assert file.getvalue() == NOISE
+    assert [request.header("Accept-Encoding") for request in server.received] == ["identity", "identity"]
+
+
+def test_body_compressed_anyway_is_not_resumed(server, client):
+    server.script(Reply(body=gzip.compress(NOISE), headers={"Content-Encoding": "gzip"}, truncate=10000))
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client.download(endpoint="/file", destination=io.BytesIO(), chunk_size=4096)
+    assert len(server.received) == 1
+
+
+def test_resume_skips_what_a_server_ignoring_ranges_sends_again(server, client):
+    server.handler = _ranged(cut_at=10000, honour_range=False)
+    file = io.BytesIO()
+    assert client.download(endpoint="/file", destination=file, chunk_size=4096) == len(BODY)
+    assert file.getvalue() == BODY
+
+
+def test_partial_file_is_resumed_from_its_size(server, client, tmp_path):
+    server.handler = _ranged()
+    path = tmp_path / "file.bin"
+    path.write_bytes(BODY[:5000])
+    assert client.download(endpoint="/file", destination=str(path), resume=True) == len(BODY)
+    assert path.read_bytes() == BODY
+    assert server.received[0].header("Range") == "bytes=5000-"
+
+
+def test_complete_file_is_left_as_it_is(server, client, tmp_path):
+    server.handler = _ranged()
+    path = tmp_path / "file.bin"
+    path.write_bytes(BODY)
+    assert client.download(endpoint="/file", destination=str(path), resume=True) == len(BODY)
+    assert path.read_bytes() == BODY
+
+
+def test_resumes_are_limited(server, client):
+    server.script(Reply(body=BODY, truncate=1000))
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client.download(endpoint="/file", destination=io.BytesIO(), max_resumes=2)
+    assert len(server.received) == 3
+
+
+def test_buffer_must_fit_the_body(server, client):
+    server.script(Reply(body=BODY))
+    with pytest.raises(ValueError):
+        client.download(endpoint="/file", destination=bytearray(100))
+
+
+def test_async_interrupted_download_resumes(server):
+    server.handler = _ranged(cut_at=10000)
+
+    async def run() -> int:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+            return await client.download(endpoint="/file", destination=buffer, chunk_size=4096)
+
+    buffer = bytearray(len(BODY))
+    assert asyncio.run(run()) == len(BODY)
+    assert bytes(buffer) == BODY
+    assert 0 < _resumed_from(server.received[1]) <= 10000
+
+
+def test_async_compressible_body_resumes_at_the_right_offset(server):
+    server.handler = _ranged(cut_at=10000, body=NOISE, compress=True)
+
+    async def run() -> int:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+            return await client.download(endpoint="/file", destination=buffer, chunk_size=4096)
+
+    buffer = bytearray(len(NOISE))
+    assert asyncio.run(run()) == len(NOISE)
+    assert bytes(buffer) == NOISE
+    assert server.received[1].header("Accept-Encoding") == "identity"
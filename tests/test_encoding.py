@@ -0,0 +1,84 @@
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+
+from conftest import Reply
+from easyclient import ApiAuthNone, AsyncRestApiClient, ContentEncodingPolicy, RestApiClient
+
+DATA = json.dumps([{"id": index, "name": f"item {index}"} for index in range(500)]).encode()
+
+
+def _decode(content_encoding: str, body: bytes, chunk_size: int = 7) -> bytes:
+    decoder = ContentEncodingPolicy().decoder(content_encoding)
+    chunks = [decoder.decompress(body[start:start + chunk_size]) for start in range(0, len(body), chunk_size)]
+    return b"".join(chunks) + decoder.flush()
+
+
+def _raw_deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def test_gzip_with_several_members():
+    assert _decode("gzip", gzip.compress(DATA[:1000]) + gzip.compress(DATA[1000:])) == DATA
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_deflate_zlib_wrapped_or_raw(chunk_size):
+    assert _decode("deflate", zlib.compress(DATA), chunk_size) == DATA
+    assert _decode("deflate", _raw_deflate(DATA), chunk_size) == DATA
+
+
+def test_stacked_encodings_are_undone_last_to_first():
+    assert _decode("deflate, gzip", gzip.compress(zlib.compress(DATA))) == DATA
+
+
+def test_brotli():
+    brotli = pytest.importorskip("brotli")
+    assert _decode("br", brotli.compress(DATA)) == DATA
+
+
+def test_zstd_with_several_frames():
+    zstandard = pytest.importorskip("zstandard")
+    compressor = zstandard.ZstdCompressor()
+    assert _decode("zstd", compressor.compress(DATA[:1000]) + compressor.compress(DATA[1000:])) == DATA
+
+
+def test_negotiation():
+    policy = ContentEncodingPolicy(encodings=["gzip", "deflate"])
+    assert policy.accept_encoding == "gzip, deflate"
+    assert policy.headers({"X-Test": "1"}) == {"X-Test": "1", "Accept-Encoding": "gzip, deflate"}
+    assert policy.headers({"accept-encoding": "identity"}) == {"accept-encoding": "identity"}
+    assert policy.decoder("identity") is None
+    assert policy.decoder("compress") is None
+    with pytest.raises(ValueError):
+        ContentEncodingPolicy(encodings=["compress"])
+
+
+def test_client_decodes_compressed_responses(server):
+    server.script(Reply(body=gzip.compress(DATA), headers={"Content-Encoding": "gzip",
+                                                           "Content-Type": "application/json"}))
+    policy = ContentEncodingPolicy(encodings=["gzip"])
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), encoding_policy=policy) as client:
+        assert client.get(endpoint="/items") == json.loads(DATA)
+    assert server.received[0].header("Accept-Encoding") == "gzip"
+    assert policy.stats.compressed_responses == 1
+    assert policy.stats.bytes_decoded == len(DATA)
+    assert policy.stats.bytes_saved == len(DATA) - len(gzip.compress(DATA))
+
+
+def test_async_client_decodes_encodings_httpx_cannot(server):
+    zstandard = pytest.importorskip("zstandard")
+    server.script(Reply(body=zstandard.ZstdCompressor().compress(DATA),
+                        headers={"Content-Encoding": "zstd", "Content-Type": "application/json"}))
+    policy = ContentEncodingPolicy()
+
+    async def run() -> list:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone(), encoding_policy=policy) as client:
+            return (await client.get(endpoint="/items")).json()
+
+    assert asyncio.run(run()) == json.loads(DATA)
+    assert policy.stats.encodings == {"zstd": 1}
@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+from conftest import Reply
+from easyclient import ApiAuthNone, AsyncRestApiClient, HedgePolicy, RestApiClient
+
+
+def test_delay_follows_the_latency_percentile():
+    policy = HedgePolicy(percentile=90, initial_delay=0.5, min_delay=0.001)
+    assert policy.hedge_delay() == 0.5
+    for index in range(32):
+        policy.record_latency((index + 1) / 100)
+    assert policy.hedge_delay() == 0.29
+    assert HedgePolicy(delay=0).hedge_delay() == HedgePolicy().min_delay
+
+
+def test_hedges_are_limited_by_the_extra_load_budget():
+    policy = HedgePolicy(max_extra_load=0.5)
+    assert policy.try_hedge()
+    policy.start_request()
+    assert not policy.try_hedge()
+    policy.start_request()
+    assert policy.try_hedge()
+    assert policy.stats.budget_denied == 1
+
+
+def test_slow_get_is_answered_by_the_hedge(server):
+    server.script(Reply(body={"from": "primary"}, delay=0.5), Reply(body={"from": "hedge"}))
+    policy = HedgePolicy(delay=0.05)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), hedge_policy=policy) as client:
+        start = time.perf_counter()
+        assert client.get(endpoint="/item") == {"from": "hedge"}
+        assert time.perf_counter() - start < 0.4
+    assert (policy.stats.hedges, policy.stats.hedge_wins) == (1, 1)
+
+
+def test_post_is_not_hedged(server):
+    server.script(Reply(body={"ok": True}, delay=0.1))
+    policy = HedgePolicy(delay=0.05)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), hedge_policy=policy) as client:
+        client.post(endpoint="/item", body={"a": 1})
+    assert len(server.received) == 1
+    assert policy.stats.hedges == 0
+
+
+def test_async_slow_get_is_answered_by_the_hedge(server):
+    server.script(Reply(body={"from": "primary"}, delay=0.5), Reply(body={"from": "hedge"}))
+    policy = HedgePolicy(delay=0.05)
+
+    async def run() -> dict:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone(), hedge_policy=policy) as client:
+            return (await client.get(endpoint="/item")).json()
+
+    start = time.perf_counter()
+    assert asyncio.run(run()) == {"from": "hedge"}
+    assert time.perf_counter() - start < 0.4
+    assert policy.stats.hedge_wins == 1
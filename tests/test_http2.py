@@ -0,0 +1,65 @@
+import asyncio
+import sys
+
+import httpx
+import pytest
+
+from easyclient import ApiAuthNone, AsyncRestApiClient, ConnectionPoolConfig, ReplayTransport
+from easyclient.client.base.session import PooledAsyncSession
+from easyclient.client.base.transport import Transport
+
+
+class _PlainTransport(Transport):
+    # sends HTTP/1.1 whatever is asked, so stream limits can be checked without the h2 package
+    def build_async_transport(self, pool_config: ConnectionPoolConfig, http2: bool = False) -> httpx.AsyncBaseTransport:
+        return httpx.AsyncHTTPTransport(limits=pool_config.build_limits())
+
+
+@pytest.fixture
+def without_h2(monkeypatch):
+    monkeypatch.setitem(sys.modules, "h2", None)
+
+
+def _client(**kwargs) -> AsyncRestApiClient:
+    async def build() -> AsyncRestApiClient:
+        client = AsyncRestApiClient(base_url="https://api.example.com", auth=ApiAuthNone(), **kwargs)
+        await client.close()
+        return client
+
+    return asyncio.run(build())
+
+
+def test_http2_without_h2_raises_when_the_client_is_created(without_h2):
+    with pytest.raises(ImportError, match=r"pip install easyclient\[http2\]"):
+        _client(http2=True)
+    with pytest.raises(ImportError):
+        Transport().build_async_transport(ConnectionPoolConfig(), http2=True)
+
+
+def test_http1_does_not_need_h2(without_h2):
+    assert _client().http2 is False
+
+
+def test_replaying_does_not_need_h2(without_h2, tmp_path):
+    path = tmp_path / "recording.jsonl"
+    path.write_text("")
+    assert _client(http2=True, transport=ReplayTransport(str(path))).http2 is True
+
+
+def test_http2_client_is_created_when_h2_is_installed():
+    pytest.importorskip("h2")
+    assert _client(http2=True).http2 is True
+
+
+def test_only_https_hosts_are_multiplexed():
+    pool_config = ConnectionPoolConfig(max_connections_per_host=4, max_concurrent_streams=64)
+
+    async def limits(http2: bool) -> list:
+        session = PooledAsyncSession(pool_config=pool_config, transport=_PlainTransport(), http2=http2)
+        try:
+            return [session._host_semaphore(url)._value for url in ("https://a.example.com/x", "http://b.example.com")]
+        finally:
+            await session.close()
+
+    assert asyncio.run(limits(http2=True)) == [64, 4]
+    assert asyncio.run(limits(http2=False)) == [4, 4]
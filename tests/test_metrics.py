@@ -0,0 +1,88 @@
+import pytest
+
+from conftest import Reply
+from easyclient import ApiAuthNone, Instrumentation, RestApiClient
+from easyclient.client.base.metrics import PROMETHEUS_BUCKETS, LatencyHistogram
+
+
+def _samples(text: str, name: str) -> list:
+    return [line for line in text.splitlines() if line.startswith(f"{name}{{")]
+
+
+def test_buckets_hold_their_values_within_three_percent():
+    for micros in list(range(0, 5000)) + [10 ** power + offset for power in range(4, 10) for offset in (-1, 0, 1)]:
+        lower, upper = LatencyHistogram._bounds(LatencyHistogram._index(micros))
+        assert lower <= micros <= upper
+        assert upper - lower <= max(micros / 32, 0)
+
+
+def test_percentiles_mean_and_extremes():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0.0
+    for millis in range(1, 1001):
+        histogram.record(millis / 1000)
+    assert (histogram.count, histogram.min, histogram.max) == (1000, 0.001, 1.0)
+    assert histogram.mean == pytest.approx(0.5005)
+    for percentile, expected in ((50, 0.5), (90, 0.9), (99, 0.99), (100, 1.0)):
+        assert histogram.percentile(percentile) == pytest.approx(expected, rel=0.03)
+    assert histogram.percentile(0) == 0.001
+
+
+def test_cumulative_counts_per_prometheus_bucket():
+    histogram = LatencyHistogram()
+    for seconds in (0.0007, 0.003, 0.003, 0.2, 20):
+        histogram.record(seconds)
+    counts = dict(zip(PROMETHEUS_BUCKETS, histogram.cumulative_counts()))
+    assert (counts[0.001], counts[0.0025], counts[0.005], counts[0.1], counts[0.25], counts[10.0]) == (1, 1, 3, 3, 4, 4)
+    assert histogram.cumulative_counts((0.01, 100)) == [3, 5]
+
+
+def test_endpoints_are_aggregated_under_templates():
+    instrumentation = Instrumentation(endpoint_templates=["/search/*"])
+    assert instrumentation.template("/users/42/orders") == "/users/{id}/orders"
+    assert instrumentation.template("users/0c6e3a2e-6f4b-4a43-9a8a-0d3c2a1b9f10?full=1") == "/users/{id}"
+    assert instrumentation.template("/blobs/deadbeefdeadbeef") == "/blobs/{id}"
+    assert instrumentation.template("/search/42") == "/search/*"
+    assert instrumentation.template("/v2/users") == "/v2/users"
+
+
+def test_client_records_metrics_and_calls_hooks(server):
+    server.handler = lambda request: Reply(status=404 if request.endpoint.endswith("/3") else 200,
+                                           body={"trace": request.header("X-Trace")})
+    instrumentation = Instrumentation()
+    finished = []
+    instrumentation.add_pre_request_hook(lambda event: event.headers.update({"X-Trace": "abc"}))
+    instrumentation.add_post_request_hook(finished.append)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), instrumentation=instrumentation) as client:
+        assert [client.get(endpoint=f"/users/{user}") for user in (1, 2, 3)] == [{"trace": "abc"}] * 2 + [{}]
+        client.post(endpoint="/users", body={"name": "x"})
+    metrics = instrumentation.snapshot()
+    assert set(metrics) == {"GET /users/{id}", "POST /users"}
+    assert metrics["GET /users/{id}"]["network"]["count"] == 3
+    assert metrics["GET /users/{id}"]["statuses"] == {200: 2, 404: 1}
+    assert metrics["GET /users/{id}"]["deserialize"]["count"] == 3
+    assert metrics["POST /users"]["bytes_sent"] == len(b'{"name":"x"}')
+    assert [(event.method, event.template, event.status_code) for event in finished][-1] == ("POST", "/users", 200)
+    assert all(event.elapsed > 0 for event in finished)
+
+
+def test_prometheus_export():
+    instrumentation = Instrumentation()
+    event = instrumentation.start("get", "http://api/a\"b", endpoint="/a\"b", headers=None)
+    instrumentation.finish(event, error=ConnectionError())
+    instrumentation.record_deserialize("GET", "/a\"b", 0.003)
+    text = instrumentation.to_prometheus(prefix="api")
+    assert "# TYPE api_request_duration_seconds histogram" in text
+    buckets = _samples(text, "api_request_duration_seconds_bucket")
+    assert len(buckets) == len(PROMETHEUS_BUCKETS) + 1
+    assert buckets[0].startswith('api_request_duration_seconds_bucket{method="GET",endpoint="/a\\"b",le="0.001"}')
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts) and counts[-1] == 1
+    assert _samples(text, "api_request_duration_seconds_count") == [
+        'api_request_duration_seconds_count{method="GET",endpoint="/a\\"b"} 1']
+    assert _samples(text, "api_deserialize_duration_seconds_bucket")[3].endswith('le="0.01"} 1')
+    assert _samples(text, "api_request_errors_total") == [
+        'api_request_errors_total{method="GET",endpoint="/a\\"b",error="ConnectionError"} 1']
+    assert _samples(text, "api_responses_total") == []
+    instrumentation.reset()
+    assert instrumentation.snapshot() == {}
@@ -0,0 +1,120 @@
+import dataclasses
+import gc
+import pickle
+
+import pytest
+
+from conftest import Reply
+from easyclient import ApiAuthNone, LazyModelList, RestApiClient
+from easyclient.client.base.models import ModelAdapter, model_adapter
+
+
+@dataclasses.dataclass
+class Item:
+    id: int
+    name: str
+
+
+class PlainItem:
+    def __init__(self, id: int, name: str):
+        self.id = id
+        self.name = name
+
+
+class CountedItem:
+    built = 0
+
+    def __init__(self, id: int):
+        self.id = id
+        CountedItem.built += 1
+
+
+def _lazy(count: int = 10) -> LazyModelList:
+    CountedItem.built = 0
+    return LazyModelList([{"id": index} for index in range(count)], model=CountedItem)
+
+
+def test_adapters_are_cached_per_model_and_mode():
+    assert model_adapter(Item) is model_adapter(Item)
+    assert model_adapter(Item) is not model_adapter(Item, trusted=True)
+    assert model_adapter(None).build_list([{"id": 1}]) == [{"id": 1}]
+
+
+@pytest.mark.parametrize("model, kind", [(Item, "dataclass"), (PlainItem, "class")])
+def test_classes_are_called_with_the_item_keys(model, kind):
+    adapter = ModelAdapter(model)
+    assert adapter.kind == kind
+    built = adapter.build_list([{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+    assert [(item.id, item.name) for item in built] == [(1, "a"), (2, "b")]
+
+
+def test_large_lists_leave_the_garbage_collector_alone():
+    seen = set()
+
+    class Tracked:
+        def __init__(self, **item):
+            seen.add(gc.isenabled())
+
+    ModelAdapter(Tracked).build_list([{"id": index} for index in range(5000)])
+    assert seen == {True}
+
+
+def test_pydantic_lists_are_validated():
+    pydantic = pytest.importorskip("pydantic")
+
+    class Model(pydantic.BaseModel):
+        id: int
+
+    adapter = ModelAdapter(Model)
+    assert adapter.kind == "pydantic"
+    assert [item.id for item in adapter.build_list([{"id": "1"}, {"id": 2}])] == [1, 2]
+    with pytest.raises(pydantic.ValidationError):
+        adapter.build_list([{"id": "not a number"}])
+
+
+def test_lazy_list_builds_each_item_once_on_access():
+    items = _lazy()
+    assert len(items) == 10 and items.built == 0
+    first = items[3]
+    assert first.id == 3 and items[3] is first
+    assert (items.built, CountedItem.built) == (1, 1)
+    assert items.raw(4) == {"id": 4} and items.built == 1
+
+
+def test_lazy_list_negative_indexes_and_bounds():
+    items = _lazy()
+    assert items[-1].id == 9 and items[-10].id == 0
+    with pytest.raises(IndexError):
+        items[10]
+    with pytest.raises(IndexError):
+        items[-11]
+
+
+def test_lazy_list_slices_share_built_items():
+    items = _lazy()
+    view = items[2:8:2]
+    assert len(view) == 3 and isinstance(view, LazyModelList)
+    assert [item.id for item in view] == [2, 4, 6]
+    assert items[4] is view[1]
+    assert view[-1].id == 6 and view[::-1][0] is view[-1]
+    assert items[20:] == [] and len(items[20:]) == 0
+    assert (items.built, view.built, CountedItem.built) == (3, 3, 3)
+
+
+def test_lazy_list_materializes_compares_and_pickles():
+    items = _lazy(3)
+    items[0]
+    assert [item.id for item in items.materialize()] == [0, 1, 2] and CountedItem.built == 3
+    assert _lazy(3) != [1, 2] and LazyModelList([1, 2], model=None) == [1, 2]
+    restored = pickle.loads(pickle.dumps(items[1:]))
+    assert restored.built == 0 and [item.id for item in restored] == [1, 2]
+
+
+def test_client_returns_lazy_lists(server):
+    server.handler = lambda request: Reply(body={"data": [{"id": index} for index in range(5)]})
+    CountedItem.built = 0
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+        items = client.get_object(endpoint="/items", model=CountedItem, sub_keys=["data"], extract_list=True,
+                                  lazy=True)
+    assert isinstance(items, LazyModelList) and len(items) == 5
+    assert items[-2].id == 3 and CountedItem.built == 1
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+
+from conftest import Reply
+from easyclient import (
+    ApiAuthNone,
+    AsyncRestApiClient,
+    CursorPagination,
+    LinkHeaderPagination,
+    OffsetPagination,
+    PageNumberPagination,
+    RestApiClient,
+)
+from easyclient.client.base.pagination import PageRequest, page_target, relative_endpoint
+
+ITEMS = list(range(25))
+
+
+def _query(request, name: str, default: int) -> int:
+    return int(request.query.get(name, [default])[0])
+
+
+def _offset_pages(request) -> Reply:
+    offset, limit = _query(request, "offset", 0), _query(request, "limit", 10)
+    return Reply(body={"data": ITEMS[offset:offset + limit]})
+
+
+def _numbered_pages(request) -> Reply:
+    page, size = _query(request, "page", 1), _query(request, "per_page", 10)
+    return Reply(body={"data": ITEMS[(page - 1) * size:page * size]})
+
+
+def _cursor_pages(request) -> Reply:
+    start = _query(request, "cursor", 0)
+    following = str(start + 10) if start + 10 < len(ITEMS) else None
+    return Reply(body={"data": ITEMS[start:start + 10], "meta": {"next": following}})
+
+
+def _linked_pages(request) -> Reply:
+    # the second page is linked root-relative, the third relative to the second
+    links = {1: '</api/v1/items?page=2&tag=a&tag=b>; rel="next"', 2: '<items?page=3&tag=a&tag=b>; rel="next"'}
+    page = _query(request, "page", 1)
+    headers = {"Link": links[page]} if page in links else {}
+    return Reply(body={"data": ITEMS[(page - 1) * 10:page * 10]}, headers=headers)
+
+
+@pytest.fixture
+def client(server):
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+        yield client
+
+
+@pytest.mark.parametrize("handler, strategy", [
+    (_offset_pages, OffsetPagination(limit=10)),
+    (_numbered_pages, PageNumberPagination(page_size=10)),
+    (_cursor_pages, CursorPagination(cursor_keys=["meta", "next"])),
+])
+def test_every_page_is_fetched(server, client, handler, strategy):
+    server.handler = handler
+    assert list(client.paginate(endpoint="/items", strategy=strategy, sub_keys=["data"])) == ITEMS
+    assert len(server.received) == 3
+
+
+def test_page_numbers_stop_on_an_empty_page_without_a_page_size(server, client):
+    server.handler = _numbered_pages
+    assert list(client.paginate(endpoint="/items", strategy=PageNumberPagination(), sub_keys=["data"])) == ITEMS
+    assert [request.query["page"] for request in server.received] == [["1"], ["2"], ["3"], ["4"]]
+
+
+def test_links_are_resolved_against_the_page_they_are_on(server):
+    server.handler = _linked_pages
+    with RestApiClient(base_url=f"{server.base_url}/api/v1", auth=ApiAuthNone()) as client:
+        items = list(client.paginate(endpoint="/items", strategy=LinkHeaderPagination(), sub_keys=["data"]))
+    assert items == ITEMS
+    assert [request.endpoint for request in server.received] == ["/api/v1/items"] * 3
+    assert [request.query.get("tag") for request in server.received] == [None, ["a", "b"], ["a", "b"]]
+
+
+def test_max_pages(server, client):
+    server.handler = _offset_pages
+    items = list(client.paginate(endpoint="/items", strategy=OffsetPagination(limit=10), sub_keys=["data"],
+                                 max_pages=2))
+    assert items == ITEMS[:20]
+    assert len(server.received) == 2
+
+
+@pytest.mark.parametrize("prefetch, requests", [(True, 2), (False, 1)])
+def test_next_page_is_prefetched_while_the_current_one_is_consumed(server, client, prefetch, requests):
+    server.handler = _offset_pages
+    items = client.paginate(endpoint="/items", strategy=OffsetPagination(limit=10), sub_keys=["data"],
+                            prefetch=prefetch)
+    assert next(items) == 0
+    time.sleep(0.2)
+    assert len(server.received) == requests
+    items.close()
+
+
+def test_next_page_outside_the_base_url_is_refused():
+    assert relative_endpoint("http://api/v1", "http://api/v1/items") == "/items"
+    with pytest.raises(ValueError):
+        relative_endpoint("http://api/v1", "http://other/v1/items")
+
+
+def test_repeated_parameters_are_kept_in_the_endpoint():
+    request = PageRequest(endpoint="http://api/v1/items", params=[("tag", "a"), ("tag", "b")])
+    assert page_target("http://api/v1", request) == ("/items?tag=a&tag=b", None)
+    assert page_target("http://api/v1", PageRequest(endpoint="/items", params={"a": 1})) == ("/items", {"a": 1})
+
+
+def test_async_links_and_max_pages(server):
+    server.handler = _linked_pages
+
+    async def run(max_pages: int = None) -> list:
+        async with AsyncRestApiClient(base_url=f"{server.base_url}/api/v1", auth=ApiAuthNone()) as client:
+            return [item async for item in client.paginate(endpoint="/items", strategy=LinkHeaderPagination(),
+                                                           sub_keys=["data"], max_pages=max_pages)]
+
+    assert asyncio.run(run()) == ITEMS
+    assert [request.query.get("tag") for request in server.received] == [None, ["a", "b"], ["a", "b"]]
+    assert asyncio.run(run(max_pages=2)) == ITEMS[:20]
+    assert [request.endpoint for request in server.received] == ["/api/v1/items"] * 5
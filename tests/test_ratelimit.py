@@ -0,0 +1,91 @@
+import time
+from email.utils import formatdate
+
+import pytest
+
+from conftest import Reply
+from easyclient import ApiAuthNone, RestApiClient
+from easyclient.client.base.ratelimit import RateLimiter, SlidingWindow, TokenBucket, parse_retry_after
+
+
+def test_token_bucket_allows_a_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=10, capacity=2)
+    now = time.monotonic()
+    waits = [bucket.reserve(now) for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2:] == pytest.approx([0.1, 0.2])
+    assert bucket.reserve(now + 1.0) == 0.0
+
+
+def test_sliding_window_caps_requests_per_window():
+    window = SlidingWindow(limit=2, window=1.0)
+    now = time.monotonic()
+    waits = [window.reserve(now) for _ in range(3)]
+    assert waits == pytest.approx([0.0, 0.0, 1.0])
+    assert window.reserve(now + 2.5) == 0.0
+
+
+def test_invalid_limits_are_rejected():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        SlidingWindow(limit=0)
+
+
+def test_first_matching_endpoint_limit_applies_with_the_global_limit():
+    search, items, everything = TokenBucket(1), TokenBucket(2), TokenBucket(3)
+    limiter = RateLimiter(limit=everything, endpoint_limits={"/search*": search, "/items/*": items})
+    assert limiter.limits_for("search/users") == [search, everything]
+    assert limiter.limits_for("/items/1") == [items, everything]
+    assert limiter.limits_for("/other") == [everything]
+
+
+def test_retry_after_pauses_the_limit():
+    bucket = TokenBucket(rate=100)
+    limiter = RateLimiter(limit=bucket)
+    limiter.update("/item", status_code=429, headers={"Retry-After": "2"})
+    assert limiter.throttled == 1
+    assert bucket.reserve() == pytest.approx(2.0, abs=0.1)
+
+
+def test_exhausted_quota_header_pauses_until_reset():
+    bucket = TokenBucket(rate=100)
+    limiter = RateLimiter(limit=bucket)
+    limiter.update("/item", status_code=200, headers={"X-RateLimit-Remaining": "0",
+                                                      "X-RateLimit-Reset": str(time.time() + 3)})
+    assert bucket.reserve() == pytest.approx(3.0, abs=0.1)
+
+
+def test_headers_are_ignored_when_not_respected():
+    bucket = TokenBucket(rate=100)
+    RateLimiter(limit=bucket, respect_headers=False).update("/item", status_code=429, headers={"Retry-After": "5"})
+    assert bucket.reserve() == 0.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after(formatdate(time.time() + 60, usegmt=True)) == pytest.approx(60, abs=2)
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_client_requests_are_throttled(server):
+    limiter = RateLimiter(limit=TokenBucket(rate=20, capacity=1))
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), rate_limiter=limiter) as client:
+        start = time.monotonic()
+        for _ in range(5):
+            client.get(endpoint="/item")
+        elapsed = time.monotonic() - start
+    assert elapsed >= 0.19
+    assert limiter.waits == 4
+
+
+def test_client_waits_out_a_429(server):
+    server.script(Reply(status=429, headers={"Retry-After": "0.3"}), Reply(body={"ok": True}))
+    limiter = RateLimiter(limit=TokenBucket(rate=1000))
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), rate_limiter=limiter) as client:
+        client.get(endpoint="/item")
+        start = time.monotonic()
+        assert client.get(endpoint="/item") == {"ok": True}
+        assert time.monotonic() - start >= 0.25
@@ -0,0 +1,95 @@
+import json
+import logging
+
+import pytest
+
+from conftest import Reply
+from easyclient import ApiAuthNone, LoggingPolicy, RestApiClient
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(json.loads(self.format(record)))
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("easyclient.tests.requests")
+    yield logger
+    logger.handlers.clear()
+    logger.setLevel(logging.NOTSET)
+
+
+def test_should_log_failures_slow_and_sampled_requests():
+    assert LoggingPolicy(errors_only=True).should_log(0.1, status_code=500)
+    assert not LoggingPolicy(errors_only=True).should_log(0.1, status_code=200)
+    assert LoggingPolicy(slow_threshold_ms=100).should_log(0.2, status_code=200)
+    assert not LoggingPolicy(slow_threshold_ms=100).should_log(0.05, status_code=200)
+    assert not LoggingPolicy(sample_rate=0).should_log(0.1, status_code=200)
+    assert LoggingPolicy(sample_rate=0).should_log(0.1, error=ValueError())
+
+
+def test_secrets_are_redacted():
+    capture = _Capture()
+    policy = LoggingPolicy(handler=capture, asynchronous=False, include_headers=True)
+    policy.log("get", "https://api.example.com/item", 0.01, params={"api_key": "secret", "page": 2},
+               headers={"Authorization": "Bearer secret"}, error=ValueError("bad url ?token=secret&page=2"))
+    policy.close()
+    line = capture.lines[0]
+    assert line["params"] == {"api_key": "[REDACTED]", "page": 2}
+    assert line["headers"] == {"Authorization": "[REDACTED]"}
+    assert "secret" not in line["error"]
+    assert line["level"] == "ERROR"
+
+
+def test_policies_sharing_a_logger_only_write_their_own_requests(logger):
+    first, second = _Capture(), _Capture()
+    policies = [LoggingPolicy(handler=handler, logger_name=logger.name, asynchronous=asynchronous)
+                for handler, asynchronous in ((first, True), (second, False))]
+    policies[0].log("GET", "/first", 0.01, status_code=200)
+    policies[1].log("GET", "/second", 0.01, status_code=200)
+    for policy in policies:
+        policy.close()
+    assert [line["url"] for line in first.lines] == ["/first"]
+    assert [line["url"] for line in second.lines] == ["/second"]
+
+
+def test_logger_level_and_propagation_are_left_to_the_application(logger):
+    logger.setLevel(logging.ERROR)
+    capture = _Capture()
+    policy = LoggingPolicy(handler=capture, logger_name=logger.name, asynchronous=False)
+    policy.log("GET", "/ok", 0.01, status_code=200)
+    policy.log("GET", "/missing", 0.01, status_code=404)
+    assert [line["url"] for line in capture.lines] == ["/missing"]
+    assert (logger.level, logger.propagate) == (logging.ERROR, True)
+
+
+def test_close_detaches_the_handler(logger):
+    policy = LoggingPolicy(handler=_Capture(), logger_name=logger.name)
+    policy.log("GET", "/item", 0.01, status_code=200)
+    assert len(logger.handlers) == 1
+    policy.close()
+    assert logger.handlers == []
+    # a closed policy attaches its handler again when it is used
+    policy.log("GET", "/item", 0.01, status_code=200)
+    assert len(logger.handlers) == 1
+    policy.close()
+
+
+def test_client_logs_requests_and_detaches_on_close(server, logger):
+    server.handler = lambda request: Reply(status=500 if request.endpoint == "/broken" else 200, body={})
+    capture = _Capture()
+    policy = LoggingPolicy(handler=capture, logger_name=logger.name)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), log_requests=policy) as client:
+        client.get(endpoint="/item", params={"token": "secret"})
+        client.get(endpoint="/broken")
+    assert [(line["url"], line["status"], line["level"]) for line in capture.lines] == [
+        (f"{server.base_url}/item", 200, "INFO"),
+        (f"{server.base_url}/broken", 500, "ERROR"),
+    ]
+    assert capture.lines[0]["params"] == {"token": "[REDACTED]"}
+    assert logger.handlers == []
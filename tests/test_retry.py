@@ -0,0 +1,89 @@
+import asyncio
+import socket
+
+import pytest
+import requests
+
+from conftest import Reply
+from easyclient import ApiAuthNone, AsyncRestApiClient, RestApiClient
+from easyclient.client.base.retry import RetryBudget, RetryPolicy
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_backoff_is_jittered_below_an_exponential_ceiling():
+    policy = RetryPolicy(backoff_base=0.1, backoff_max=0.3)
+    for attempt, ceiling in ((1, 0.1), (2, 0.2), (3, 0.3), (10, 0.3)):
+        assert all(0 <= policy.backoff(attempt) <= ceiling for _ in range(50))
+
+
+def test_retry_delay_decisions():
+    policy = RetryPolicy(max_attempts=3, backoff_base=0.01)
+    assert policy.retry_delay("GET", 1, status_code=503) is not None
+    assert policy.retry_delay("GET", 1, status_code=404) is None
+    assert policy.retry_delay("POST", 1, status_code=503) is None
+    assert policy.retry_delay("GET", 3, status_code=503) is None
+    assert policy.retry_delay("GET", 1, error=requests.exceptions.ConnectionError()) is not None
+    assert policy.retry_delay("GET", 1, error=ValueError()) is None
+    assert policy.stats.exhausted == 1
+
+
+def test_retry_after_stretches_or_cancels_the_retry():
+    policy = RetryPolicy(backoff_base=0.01, max_retry_after=5)
+    assert policy.retry_delay("GET", 1, status_code=429, headers={"Retry-After": "2"}) == 2.0
+    assert policy.retry_delay("GET", 1, status_code=429, headers={"Retry-After": "30"}) is None
+
+
+def test_budget_caps_retries_to_a_share_of_calls():
+    budget = RetryBudget(ratio=0.5, min_retries_per_second=0, window=10)
+    for _ in range(4):
+        budget.record_call()
+    assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+
+
+def test_policy_stops_retrying_when_the_budget_is_spent():
+    policy = RetryPolicy(backoff_base=0.01, budget=RetryBudget(ratio=0, min_retries_per_second=0))
+    assert policy.retry_delay("GET", 1, status_code=503) is None
+    assert policy.stats.budget_exhausted == 1
+
+
+def test_client_retries_until_success(server):
+    server.script(Reply(status=503), Reply(status=502), Reply(body={"ok": True}))
+    policy = RetryPolicy(max_attempts=3, backoff_base=0.01)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), retry_policy=policy) as client:
+        assert client.get(endpoint="/item") == {"ok": True}
+    assert len(server.received) == 3
+    assert policy.stats.attempts_per_call == {3: 1}
+
+
+def test_client_does_not_retry_post_by_default(server):
+    server.script(Reply(status=503))
+    policy = RetryPolicy(max_attempts=3, backoff_base=0.01)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), retry_policy=policy) as client:
+        client.post(endpoint="/item", body={"a": 1})
+    assert len(server.received) == 1
+
+
+def test_client_retries_connection_errors_then_raises():
+    policy = RetryPolicy(max_attempts=2, backoff_base=0.01)
+    with RestApiClient(base_url=f"http://127.0.0.1:{_unused_port()}", auth=ApiAuthNone(),
+                       retry_policy=policy) as client:
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.get(endpoint="/item")
+    assert policy.stats.attempts == 2
+
+
+def test_async_client_retries_until_success(server):
+    server.script(Reply(status=503), Reply(body={"ok": True}))
+    policy = RetryPolicy(max_attempts=3, backoff_base=0.01)
+
+    async def run() -> dict:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone(), retry_policy=policy) as client:
+            return (await client.get(endpoint="/item")).json()
+
+    assert asyncio.run(run()) == {"ok": True}
+    assert len(server.received) == 2
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+import pytest
+
+from easyclient import ApiAuthNone, AsyncRestApiClient, ConnectionPoolConfig, RestApiClient
+
+
+def test_requests_reuse_one_connection(server):
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+        for _ in range(5):
+            assert client.get(endpoint="/item") == {"ok": True}
+    assert server.connections == 1
+    assert len(server.received) == 5
+
+
+def test_idle_connections_are_evicted(server):
+    pool_config = ConnectionPoolConfig(keepalive_timeout=0.05)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), pool_config=pool_config) as client:
+        client.get(endpoint="/item")
+        time.sleep(0.1)
+        client.get(endpoint="/item")
+    assert server.connections == 2
+
+
+def test_close_closes_pooled_connections(server):
+    client = RestApiClient(base_url=server.base_url, auth=ApiAuthNone())
+    client.get(endpoint="/item")
+    client.close()
+    client.get(endpoint="/item")
+    client.close()
+    assert server.connections == 2
+
+
+def test_async_requests_reuse_one_connection(server):
+    async def run() -> bool:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+            for _ in range(5):
+                assert (await client.get(endpoint="/item")).json() == {"ok": True}
+            session = client._session
+        return session.is_closed
+
+    assert asyncio.run(run())
+    assert server.connections == 1
+
+
+def test_pool_config_rejects_empty_pools():
+    with pytest.raises(ValueError):
+        ConnectionPoolConfig(max_connections=0)
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import Reply
+from easyclient import ApiAuthNone, AsyncRestApiClient, RestApiClient
+from easyclient.client.base.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_share_one_call():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow() -> int:
+        started.set()
+        release.wait()
+        return 42
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(flight.do, "key", slow)
+        started.wait()
+        followers = [executor.submit(flight.do, "key", slow) for _ in range(3)]
+        while flight.shared < 3:
+            time.sleep(0.001)
+        release.set()
+        assert [future.result() for future in [leader] + followers] == [42] * 4
+    assert (flight.calls, flight.shared) == (1, 3)
+
+
+def test_errors_are_raised_and_not_remembered():
+    flight = SingleFlight()
+
+    def failing() -> int:
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        flight.do("key", failing)
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    async def run() -> int:
+        flight = AsyncSingleFlight()
+
+        async def slow() -> int:
+            await asyncio.sleep(0.05)
+            return 42
+
+        first = asyncio.ensure_future(flight.do("key", slow))
+        second = asyncio.ensure_future(flight.do("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == 42
+
+
+def test_client_collapses_identical_gets(server):
+    server.script(Reply(body={"ok": True}, delay=0.2))
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), single_flight=True) as client:
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(lambda _: client.get(endpoint="/item"), range(5)))
+        assert results == [{"ok": True}] * 5
+        client.get(endpoint="/other")
+    assert [request.endpoint for request in server.received] == ["/item", "/other"]
+
+
+def test_async_client_collapses_identical_gets(server):
+    server.script(Reply(body={"ok": True}, delay=0.1))
+
+    async def run() -> list:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone(), single_flight=True) as client:
+            responses = await asyncio.gather(*(client.get(endpoint="/item", params={"a": 1}) for _ in range(5)))
+            await client.get(endpoint="/item", params={"a": 2})
+        return [response.json() for response in responses]
+
+    assert asyncio.run(run()) == [{"ok": True}] * 5
+    assert len(server.received) == 2
@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import Reply
+from easyclient import ApiAuthNone, AsyncRestApiClient, RestApiClient
+from easyclient.client.base.streaming import JsonItemStream
+
+
+class Item:
+    def __init__(self, id: int, name: str):
+        self.id = id
+        self.name = name
+
+
+def _feed_bytewise(parser: JsonItemStream, document: bytes) -> list:
+    items = []
+    for index in range(len(document)):
+        items.extend(parser.feed(document[index:index + 1]))
+    return items + parser.close()
+
+
+def test_items_split_across_every_byte():
+    items = [{"id": 1, "name": "café ☃"}, {"id": 2, "name": 'a "quoted" ] }'}, [1, [2]], "x", 3.5, None]
+    document = json.dumps({"meta": {"items": "not these"}, "data": {"items": items}}).encode()
+    assert _feed_bytewise(JsonItemStream(sub_keys=["data", "items"]), document) == items
+
+
+def test_top_level_array():
+    assert _feed_bytewise(JsonItemStream(), b' [1, {"a": []}, "two"] ') == [1, {"a": []}, "two"]
+
+
+def test_empty_document_and_empty_array():
+    assert _feed_bytewise(JsonItemStream(), b"") == []
+    assert _feed_bytewise(JsonItemStream(sub_keys=["items"]), b'{"items": []}') == []
+
+
+def test_missing_sub_key_yields_nothing():
+    assert _feed_bytewise(JsonItemStream(sub_keys=["items"]), b'{"other": [1, 2]}') == []
+
+
+def test_truncated_document_raises():
+    parser = JsonItemStream(sub_keys=["items"])
+    assert parser.feed(b'{"items": [1, 2, {"a"') == [1, 2]
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_stops_once_the_array_is_complete():
+    parser = JsonItemStream(sub_keys=["items"])
+    assert parser.feed(b'{"items": [1]') == [1]
+    assert parser.done
+    assert parser.feed(b', "trailing": "ignored"}') == []
+
+
+def test_stream_objects_builds_models(server):
+    items = [{"id": index, "name": f"item {index}"} for index in range(500)]
+    server.handler = lambda request: Reply(body={"results": items})
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+        streamed = list(client.stream_objects(endpoint="/items", model=Item, sub_keys=["results"], chunk_size=100))
+    assert [(item.id, item.name) for item in streamed] == [(item["id"], item["name"]) for item in items]
+
+
+def test_async_stream_objects_yields_json_items(server):
+    items = [{"id": index} for index in range(100)]
+    server.handler = lambda request: Reply(body=items)
+
+    async def run() -> list:
+        async with AsyncRestApiClient(base_url=server.base_url, auth=ApiAuthNone()) as client:
+            return [item async for item in client.stream_objects(endpoint="/items", chunk_size=64)]
+
+    assert asyncio.run(run()) == items
@@ -0,0 +1,164 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import Reply
+from easyclient import ApiAuthOAuth2, AsyncRestApiClient, RestApiClient, TokenManager
+from easyclient.client.base.token import FileTokenStore, MemoryTokenStore, OAuth2Token
+
+
+@pytest.fixture
+def token_server(server, monkeypatch):
+    # the client credentials grant refuses plain HTTP token endpoints otherwise
+    monkeypatch.setenv("OAUTHLIB_INSECURE_TRANSPORT", "1")
+    issued = []
+
+    def handler(request) -> Reply:
+        if request.endpoint == "/token":
+            issued.append(f"token-{len(issued) + 1}")
+            # oauthlib keeps whole seconds, so the token is refreshed on a timer 0.75-1.25s after it is issued
+            return Reply(body={"access_token": issued[-1], "token_type": "bearer", "expires_in": 2})
+        return Reply(body={"authorization": request.header("Authorization")})
+
+    server.handler = handler
+    return server
+
+
+def _token_requests(server) -> int:
+    return sum(1 for request in server.received if request.endpoint == "/token")
+
+
+def _manager(responses: list, **kwargs) -> TokenManager:
+    return TokenManager("id", "secret", "https://auth.example.com/token", store=MemoryTokenStore(),
+                        fetch_token=lambda: responses.pop(0), **kwargs)
+
+
+def test_refresh_is_scheduled_before_expiry_and_capped_at_half_the_lifetime():
+    now = time.time()
+    token = OAuth2Token.from_response({"access_token": "abc", "expires_in": 100})
+    assert token.authorization == "Bearer abc"
+    assert 89 <= token.refresh_in(margin=10) <= 91
+    assert 49 <= token.refresh_in(margin=60) <= 51
+    assert OAuth2Token("abc", expires_at=now - 1).expired
+    assert OAuth2Token("abc").refresh_in(margin=60) is None
+
+
+def test_token_is_cached_until_it_expires():
+    manager = _manager([{"access_token": "a", "expires_in": 0.2}, {"access_token": "b", "expires_in": 3600}],
+                       auto_refresh=False, refresh_margin=0)
+    assert manager.token().access_token == "a"
+    assert manager.token().access_token == "a"
+    time.sleep(0.25)
+    assert manager.token().access_token == "b"
+    assert manager.refreshes == 2
+
+
+def test_token_near_expiry_is_refreshed_in_the_background():
+    manager = _manager([{"access_token": "b", "expires_in": 3600}], auto_refresh=False, refresh_margin=60)
+    manager.store.set(manager.key, OAuth2Token("a", expires_at=time.time() + 30))
+    # past the refresh margin, the current token is still handed out while a new one is fetched
+    assert manager.token().access_token == "a"
+    manager._background.join()
+    assert manager.token().access_token == "b"
+    assert manager.background_refreshes == 1
+
+
+def test_concurrent_refreshes_share_one_token_request():
+    release = threading.Event()
+    calls = []
+
+    def fetch_token() -> dict:
+        calls.append(1)
+        release.wait()
+        return {"access_token": "abc", "expires_in": 3600}
+
+    manager = TokenManager("id", "secret", "https://auth.example.com/token", store=MemoryTokenStore(),
+                           fetch_token=fetch_token, auto_refresh=False)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(manager.token) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        assert {future.result().access_token for future in futures} == {"abc"}
+    assert len(calls) == 1
+
+
+def test_file_store_shares_tokens_across_managers(tmp_path):
+    path = str(tmp_path / "tokens.json")
+    first = TokenManager("id", "secret", "https://auth.example.com/token", store=FileTokenStore(path),
+                         fetch_token=lambda: {"access_token": "abc", "expires_in": 3600}, auto_refresh=False)
+    first.token()
+    second = TokenManager("id", "secret", "https://auth.example.com/token", store=FileTokenStore(path),
+                          fetch_token=lambda: pytest.fail("the stored token should be reused"), auto_refresh=False)
+    assert second.token().access_token == "abc"
+
+
+def test_token_in_use_is_refreshed_on_a_timer():
+    manager = _manager([{"access_token": "a", "expires_in": 0.2}, {"access_token": "b", "expires_in": 3600}])
+    assert manager.token().access_token == "a"
+    time.sleep(0.3)
+    assert manager.background_refreshes == 1
+    manager.close()
+
+
+def test_background_refreshes_stop_with_the_last_client_and_resume_with_a_new_one():
+    manager = _manager([{"access_token": "a", "expires_in": 3600}, {"access_token": "b", "expires_in": 3600}])
+    manager.attach()
+    manager.attach()
+    manager.token()
+    manager.detach()
+    assert manager._timer is not None
+    manager.detach()
+    assert manager._timer is None
+    manager.attach()
+    manager.refresh()
+    assert manager._timer is not None
+    manager.close()
+    assert manager._timer is None
+
+
+def test_client_authorizes_requests_with_the_token(token_server):
+    auth = ApiAuthOAuth2("id", "secret", f"{token_server.base_url}/token", token_store=MemoryTokenStore())
+    with RestApiClient(base_url=token_server.base_url, auth=auth) as client:
+        assert client.get(endpoint="/item") == {"authorization": "Bearer token-1"}
+        assert client.get(endpoint="/item") == {"authorization": "Bearer token-1"}
+    assert _token_requests(token_server) == 1
+
+
+def test_closing_the_client_stops_refreshing_its_token(token_server):
+    auth = ApiAuthOAuth2("id", "secret", f"{token_server.base_url}/token", token_store=MemoryTokenStore())
+    with RestApiClient(base_url=token_server.base_url, auth=auth) as client:
+        client.get(endpoint="/item")
+    # the token was in use, so without closing, its timer would refresh it
+    time.sleep(1.5)
+    assert _token_requests(token_server) == 1
+    assert auth.token_manager._timer is None
+
+
+def test_closing_one_client_keeps_refreshing_the_token_of_another_sharing_its_auth(token_server):
+    auth = ApiAuthOAuth2("id", "secret", f"{token_server.base_url}/token", token_store=MemoryTokenStore())
+    first = RestApiClient(base_url=token_server.base_url, auth=auth)
+    second = RestApiClient(base_url=token_server.base_url, auth=auth)
+    first.get(endpoint="/item")
+    first.close()
+    first.close()
+    time.sleep(1.5)
+    assert _token_requests(token_server) == 2
+    assert second.get(endpoint="/item") == {"authorization": "Bearer token-2"}
+    second.close()
+    time.sleep(1.5)
+    assert _token_requests(token_server) == 2
+
+
+def test_closing_the_async_client_stops_refreshing_its_token(token_server):
+    auth = ApiAuthOAuth2("id", "secret", f"{token_server.base_url}/token", token_store=MemoryTokenStore())
+
+    async def run() -> dict:
+        async with AsyncRestApiClient(base_url=token_server.base_url, auth=auth) as client:
+            return (await client.get(endpoint="/item")).json()
+
+    assert asyncio.run(run()) == {"authorization": "Bearer token-1"}
+    time.sleep(1.5)
+    assert _token_requests(token_server) == 1
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from conftest import Reply, ScriptedServer
+from easyclient import (
+    ApiAuthKey,
+    ApiAuthNone,
+    AsyncRestApiClient,
+    RecordingTransport,
+    ReplayMissError,
+    ReplayTransport,
+    RestApiClient,
+)
+from easyclient.client.base.transport import Recording, request_key, strip_params
+
+
+@pytest.fixture
+def recording(tmp_path, server) -> str:
+    path = str(tmp_path / "recording.jsonl")
+    counter = iter(range(1, 100))
+    server.handler = lambda request: Reply(body={"endpoint": request.endpoint, "call": next(counter)})
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), transport=RecordingTransport(path)) as client:
+        client.get(endpoint="/item", params={"b": 2, "a": 1})
+        client.get(endpoint="/item", params={"a": 1, "b": 2})
+        client.get(endpoint="/other")
+    return path
+
+
+def test_request_key_sorts_parameters():
+    assert request_key("get", "http://api/item?b=2&a=1") == request_key("GET", "http://api/item?a=1&b=2")
+
+
+def test_strip_params_keeps_other_parameters():
+    assert strip_params("http://api/item?Key=s3cret&a=1&a=2", ["key"]) == "http://api/item?a=1&a=2"
+    assert strip_params("http://api/item?a=1", []) == "http://api/item?a=1"
+
+
+def test_api_key_is_left_out_of_the_recording_and_replays_with_another_key(tmp_path, server):
+    path = str(tmp_path / "recording.jsonl")
+    server.handler = lambda request: Reply(body={"ok": True})
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthKey("s3cret-key", key_keyword="api_key"),
+                       transport=RecordingTransport(path)) as client:
+        client.get(endpoint="/item", params={"a": 1})
+    assert server.received[0].query["api_key"] == ["s3cret-key"]
+    for recorded in (path, f"{path}.index"):
+        with open(recorded) as file:
+            assert "s3cret-key" not in file.read()
+    server.handler = lambda request: pytest.fail("replayed requests must not reach the API")
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthKey("other-key", key_keyword="api_key"),
+                       transport=ReplayTransport(path)) as client:
+        assert client.get(endpoint="/item", params={"a": 1}) == {"ok": True}
+
+
+def test_closing_the_client_flushes_and_indexes_the_recording(recording, server):
+    assert os.path.exists(f"{recording}.index")
+    with open(recording) as file:
+        entries = [json.loads(line) for line in file]
+    assert [entry["status"] for entry in entries] == [200, 200, 200]
+    assert "offset" not in entries[0]
+    assert len(Recording(recording)) == 3
+
+
+def test_replay_answers_from_the_recording_in_order(recording, server):
+    server.handler = lambda request: pytest.fail("replayed requests must not reach the API")
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), transport=ReplayTransport(recording)) as client:
+        calls = [client.get(endpoint="/item", params={"a": 1, "b": 2})["call"] for _ in range(3)]
+        assert client.get(endpoint="/other") == {"endpoint": "/other", "call": 3}
+        with pytest.raises(ReplayMissError):
+            client.get(endpoint="/missing")
+    # a request recorded twice is answered with both responses, then starts over
+    assert calls == [1, 2, 1]
+
+
+def test_replay_passes_missing_requests_through(recording, server):
+    server.handler = lambda request: Reply(body={"live": True})
+    transport = ReplayTransport(recording, passthrough=True)
+    with RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), transport=transport) as client:
+        assert client.get(endpoint="/missing") == {"live": True}
+    assert (transport.replayed, transport.missed) == (0, 1)
+
+
+def test_replay_speed_scales_recorded_response_times(recording):
+    entry = {"elapsed": 0.2}
+    assert ReplayTransport(recording).delay(entry) == 0
+    assert ReplayTransport(recording, speed=1).delay(entry) == 0.2
+    assert ReplayTransport(recording, speed=10).delay(entry) == pytest.approx(0.02)
+    with pytest.raises(ValueError):
+        ReplayTransport(recording, speed=0)
+
+
+def test_client_keeps_recording_after_close(tmp_path, server):
+    path = str(tmp_path / "recording.jsonl")
+    client = RestApiClient(base_url=server.base_url, auth=ApiAuthNone(), transport=RecordingTransport(path))
+    client.get(endpoint="/first")
+    client.close()
+    client.get(endpoint="/second")
+    client.close()
+    assert len(Recording(path)) == 2
+
+
+def test_async_record_then_replay(tmp_path):
+    path = str(tmp_path / "recording.jsonl")
+
+    async def fetch(base_url: str, transport) -> dict:
+        async with AsyncRestApiClient(base_url=base_url, auth=ApiAuthNone(), transport=transport) as client:
+            return (await client.get(endpoint="/item")).json()
+
+    with ScriptedServer(lambda request: Reply(body={"recorded": True})) as stub:
+        base_url = stub.base_url
+        assert asyncio.run(fetch(base_url, RecordingTransport(path))) == {"recorded": True}
+    # the server is gone, so the response can only come from the recording
+    assert asyncio.run(fetch(base_url, ReplayTransport(path))) == {"recorded": True}